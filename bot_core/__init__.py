@@ -1,3 +1,22 @@
-from .engine import BotEngine, EngineConfig, RunResult
+from __future__ import annotations
+
+from importlib import import_module
+
+# The engine is imported on first use; short-lived workers that only load a
+# config or a simulator should not pay for it.
+_EXPORTS = {
+    "BotEngine": ".engine",
+    "EngineConfig": ".engine",
+    "RunResult": ".engine",
+}
 
 __all__ = ["BotEngine", "EngineConfig", "RunResult"]
+
+
+def __getattr__(name: str) -> object:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
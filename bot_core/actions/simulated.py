@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from ..simulator.grid_world import GridWorldEnv
-from ..types import ActionResult, BotAction
+from ..types import ActionResult, BotAction, Coord
 
 
 class SimulatedActionRunner:
@@ -10,3 +12,6 @@ class SimulatedActionRunner:
 
     def execute(self, action: BotAction) -> ActionResult:
         return self.env.step(action)
+
+    def fast_forward(self, path: Sequence[Coord]) -> int:
+        return self.env.fast_forward(path)
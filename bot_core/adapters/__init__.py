@@ -1,17 +1,25 @@
-from .real_stub import RealActionRunnerStub, RealClientBridgeStub, RealPerceptionStub
-from .runelite_http import (
-    RuneLiteHttpActionRunner,
-    RuneLiteHttpAdapterConfig,
-    RuneLiteNoopActionRunner,
-    RuneLitePerception,
-)
+from __future__ import annotations
 
-__all__ = [
-    "RealClientBridgeStub",
-    "RealPerceptionStub",
-    "RealActionRunnerStub",
-    "RuneLiteHttpAdapterConfig",
-    "RuneLitePerception",
-    "RuneLiteHttpActionRunner",
-    "RuneLiteNoopActionRunner",
-]
+from importlib import import_module
+
+# Resolved on first attribute access so importing the package stays cheap.
+_EXPORTS = {
+    "RealClientBridgeStub": ".real_stub",
+    "RealPerceptionStub": ".real_stub",
+    "RealActionRunnerStub": ".real_stub",
+    "RuneLiteHttpAdapterConfig": ".runelite_config",
+    "RuneLitePerception": ".runelite_http",
+    "RuneLiteHttpActionRunner": ".runelite_http",
+    "RuneLiteNoopActionRunner": ".runelite_http",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 from ..simulator.grid_world import GridWorldEnv
 from ..types import ActionResult, BotAction, Coord
-from ..world_model import WorldModel
+from ..world_model import WorldView
+
+if TYPE_CHECKING:
+    from ..interfaces import IActionRunner, IPerception
+    from ..runtime import AppConfig
 
 
 @dataclass
@@ -31,7 +36,7 @@ class RealClientBridgeStub:
             obstacles=config.obstacles,
         )
 
-    def poll_world(self) -> WorldModel:
+    def poll_world(self) -> WorldView:
         return self.env.snapshot()
 
     def send_action(self, action: BotAction) -> ActionResult:
@@ -42,7 +47,7 @@ class RealPerceptionStub:
     def __init__(self, bridge: RealClientBridgeStub) -> None:
         self.bridge = bridge
 
-    def observe(self) -> WorldModel:
+    def observe(self) -> WorldView:
         return self.bridge.poll_world()
 
 
@@ -52,3 +57,17 @@ class RealActionRunnerStub:
 
     def execute(self, action: BotAction) -> ActionResult:
         return self.bridge.send_action(action)
+
+
+def build_real_stub_adapters(config: AppConfig) -> tuple[IPerception, IActionRunner]:
+    world = config.real_stub_world
+    bridge = RealClientBridgeStub(
+        RealStubWorldConfig(
+            width=world.width,
+            height=world.height,
+            bot_pos=world.bot_pos,
+            target_pos=world.target_pos,
+            obstacles=world.obstacles,
+        )
+    )
+    return RealPerceptionStub(bridge), RealActionRunnerStub(bridge)
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Callable, Union
+
+if TYPE_CHECKING:
+    from ..interfaces import IActionRunner, IPerception
+    from ..runtime import AppConfig
+
+AdapterFactory = Callable[["AppConfig"], "tuple[IPerception, IActionRunner]"]
+
+# Third-party packages can add adapter modes with an entry point in this
+# group whose value is "package.module:factory".
+ENTRY_POINT_GROUP = "bot_core.adapters"
+
+# Factories are "module:attribute" strings until first use, so picking one
+# mode never imports the others (runelite_http pulls in http.server, ssl, ...).
+_BUILTIN_FACTORIES: dict[str, str] = {
+    "sim": "bot_core.adapters.sim:build_sim_adapters",
+    "real_stub": "bot_core.adapters.real_stub:build_real_stub_adapters",
+    "runelite_http": "bot_core.adapters.runelite_http:build_runelite_http_adapters",
+}
+
+_factories: dict[str, Union[str, AdapterFactory]] = dict(_BUILTIN_FACTORIES)
+_entry_points_loaded = False
+
+
+def register_adapter(mode: str, factory: Union[str, AdapterFactory]) -> None:
+    """Register a factory, or a lazy "module:attribute" reference, for a mode."""
+    if isinstance(factory, str) and ":" not in factory:
+        raise ValueError(f"Factory reference must be 'module:attribute', got: {factory}")
+    _factories[mode] = factory
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    from importlib.metadata import entry_points
+
+    for entry in entry_points(group=ENTRY_POINT_GROUP):
+        _factories.setdefault(entry.name, entry.value)
+
+
+def is_registered(mode: str) -> bool:
+    if mode in _factories:
+        return True
+    _load_entry_points()
+    return mode in _factories
+
+
+def adapter_modes() -> list[str]:
+    _load_entry_points()
+    return sorted(_factories)
+
+
+def get_adapter_factory(mode: str) -> AdapterFactory:
+    if not is_registered(mode):
+        raise ValueError(f"Unknown adapter_mode: {mode}")
+
+    factory = _factories[mode]
+    if isinstance(factory, str):
+        module_name, _, attr = factory.partition(":")
+        factory = getattr(import_module(module_name), attr)
+        _factories[mode] = factory
+    return factory
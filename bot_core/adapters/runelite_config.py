@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..types import Coord
+
+# Kept apart from runelite_http so loading a config does not pull in the
+# HTTP server stack.
+
+
+@dataclass(frozen=True)
+class RuneLiteHttpAdapterConfig:
+    host: str = "127.0.0.1"
+    port: int = 8765
+    observe_timeout_s: float = 10.0
+    world_width: int = 10000
+    world_height: int = 10000
+    target_pos: Coord = (0, 0)
+    obstacles: set[Coord] | None = None
+    enable_action_runner: bool = False
+    action_url: str | None = None
+    action_timeout_s: float = 0.8
+    action_auth_token: str | None = None
+    transport: str = "http"
+    shm_path: str | None = None
+    shm_poll_interval_ms: float = 2.0
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import struct
+import time
+from collections import deque
+from dataclasses import dataclass, replace
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from threading import Condition, Lock, Thread
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Union
 from urllib import error, request
 
 from ..types import ActionResult, BotAction, Coord
-from ..world_model import Npc, NpcType, WorldModel
+from ..world_model import Npc, NpcSpatialIndex, NpcType, WorldModel
+from .telemetry_binary import (
+    ACCEPT_HEADER,
+    BINARY_CONTENT_TYPE,
+    NpcRecord,
+    TelemetryFrame,
+    decode_frame,
+)
+from .runelite_config import RuneLiteHttpAdapterConfig
+from .telemetry_delta import KEYFRAME_HEADER, TelemetryDeltaDecoder
+from .telemetry_shm import ShmTelemetryReader
+
+if TYPE_CHECKING:
+    from ..interfaces import IActionRunner, IPerception
+    from ..runtime import AppConfig
 
 
 def _coerce_int(value: object, field_name: str) -> int:
@@ -32,60 +51,271 @@ def _risk_level(nearest_distance: int | None) -> str:
     return "low"
 
 
-@dataclass(frozen=True)
-class RuneLiteHttpAdapterConfig:
-    host: str = "127.0.0.1"
-    port: int = 8765
-    observe_timeout_s: float = 10.0
-    world_width: int = 10000
-    world_height: int = 10000
-    target_pos: Coord = (0, 0)
-    obstacles: set[Coord] | None = None
-    enable_action_runner: bool = False
-    action_url: str | None = None
-    action_timeout_s: float = 0.8
-    action_auth_token: str | None = None
+# JSON payloads are dicts; binary payloads decode straight to frames.
+Snapshot = Union[dict[str, object], TelemetryFrame]
+
+
+def _copy_snapshot(snapshot: Snapshot) -> Snapshot:
+    if isinstance(snapshot, dict):
+        return dict(snapshot)
+    return snapshot
 
 
 class _SnapshotStore:
     def __init__(self) -> None:
         self._lock = Lock()
         self._condition = Condition(self._lock)
-        self._latest: dict[str, object] | None = None
+        self._latest: Snapshot | None = None
+        self._version = 0
 
-    def put(self, payload: dict[str, object]) -> None:
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def put(self, payload: Snapshot) -> None:
         with self._condition:
             self._latest = payload
+            self._version += 1
             self._condition.notify_all()
 
-    def wait_for_latest(self, timeout_s: float) -> dict[str, object] | None:
+    def wait_for_latest(self, timeout_s: float) -> Snapshot | None:
         with self._condition:
             if self._latest is not None:
-                return dict(self._latest)
+                return _copy_snapshot(self._latest)
             self._condition.wait(timeout=timeout_s)
             if self._latest is None:
                 return None
-            return dict(self._latest)
+            return _copy_snapshot(self._latest)
+
+    def wait_for_newer(
+        self, version: int, timeout_s: float
+    ) -> tuple[int, Snapshot] | None:
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._version > version, timeout=timeout_s
+            ):
+                return None
+            assert self._latest is not None
+            return self._version, _copy_snapshot(self._latest)
+
+
+STREAM_PATH = "/stream"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+_STREAM_READ_SIZE = 64 * 1024
+
+
+@dataclass
+class StreamStats:
+    connection_id: int
+    peer: str
+    opened_at: float
+    closed_at: float | None = None
+    snapshots: int = 0
+    dropped: int = 0
+    parse_errors: int = 0
+    bytes_read: int = 0
+    max_line_bytes: int = 0
+    keyframe_requests: int = 0
+    # Lines longer than the handler's max_stream_line_bytes; each ends the stream.
+    overflows: int = 0
+    close_reason: str | None = None
+
+
+class _StreamRegistry:
+    """Per-connection stats for streaming ingest, including recently closed ones."""
+
+    def __init__(self, history: int = 32) -> None:
+        self._lock = Lock()
+        self._next_id = 0
+        self._open: dict[int, StreamStats] = {}
+        self._closed: deque[StreamStats] = deque(maxlen=history)
+
+    def open(self, peer: str) -> StreamStats:
+        with self._lock:
+            self._next_id += 1
+            stats = StreamStats(connection_id=self._next_id, peer=peer, opened_at=time.time())
+            self._open[stats.connection_id] = stats
+            return stats
+
+    def close(self, stats: StreamStats, reason: str) -> None:
+        with self._lock:
+            stats.closed_at = time.time()
+            stats.close_reason = reason
+            self._open.pop(stats.connection_id, None)
+            self._closed.append(stats)
+
+    @property
+    def connections_total(self) -> int:
+        with self._lock:
+            return self._next_id
+
+    def snapshot(self) -> list[StreamStats]:
+        with self._lock:
+            return [replace(item) for item in (*self._closed, *self._open.values())]
+
+
+def _iter_chunks(rfile: BinaryIO) -> Iterator[bytes]:
+    """Yield chunk payloads from a chunked transfer-encoded body."""
+    while True:
+        size_line = rfile.readline(1024)
+        if not size_line:
+            raise ConnectionError("stream closed mid-chunk")
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            # Drain optional trailers up to the terminating blank line.
+            while rfile.readline(1024) not in (b"\r\n", b"\n", b""):
+                pass
+            return
+        data = rfile.read(size)
+        if len(data) != size:
+            raise ConnectionError("stream closed mid-chunk")
+        rfile.readline(1024)
+        yield data
+
+
+def _iter_raw(rfile: BinaryIO, remaining: int | None) -> Iterator[bytes]:
+    while remaining is None or remaining > 0:
+        size = _STREAM_READ_SIZE if remaining is None else min(remaining, _STREAM_READ_SIZE)
+        data = rfile.read1(size) if hasattr(rfile, "read1") else rfile.read(size)
+        if not data:
+            if remaining:
+                raise ConnectionError("stream closed before Content-Length")
+            return
+        if remaining is not None:
+            remaining -= len(data)
+        yield data
+
+
+class _LineTooLong(Exception):
+    pass
 
 
 class _TelemetryHandler(BaseHTTPRequestHandler):
     store: _SnapshotStore
+    decoder: TelemetryDeltaDecoder
+    streams: _StreamRegistry
+    # The plugin writes every game tick, so a silent stream this long is dead.
+    stream_idle_timeout_s = 30.0
+    # Snapshots are a few KB; a line past this is garbage or a client that
+    # never sends a newline, and buffering it would grow without bound.
+    max_stream_line_bytes = 1 << 20
+
+    def _decode_json(self, body: bytes) -> Snapshot | None:
+        payload = json.loads(body)
+        if not isinstance(payload, dict):
+            raise ValueError("payload must be object")
+        return self.decoder.decode(payload)
+
+    def _ingest_line(self, line: bytes, stats: StreamStats) -> None:
+        stats.max_line_bytes = max(stats.max_line_bytes, len(line))
+        if not line.strip():
+            return
+        try:
+            snapshot = self._decode_json(line)
+        except (json.JSONDecodeError, ValueError):
+            stats.parse_errors += 1
+            return
+        if snapshot is None:
+            stats.dropped += 1
+            self._request_keyframe(stats)
+            return
+        self._keyframe_signalled = False
+        self.store.put(snapshot)
+        stats.snapshots += 1
+
+    def _request_keyframe(self, stats: StreamStats) -> None:
+        """Ask the plugin for a keyframe without ending the stream.
+
+        A 103 (Early Hints) response is interim, so the final 204 still
+        follows the body. Sent once per gap.
+        """
+        if self._keyframe_signalled or not self.decoder.keyframe_requested:
+            return
+        self.send_response_only(103)
+        self.send_header(KEYFRAME_HEADER, "1")
+        self.end_headers()
+        self._keyframe_signalled = True
+        stats.keyframe_requests += 1
+
+    def _handle_stream(self) -> None:
+        # Each line is handled as soon as its newline arrives, so a burst after
+        # a client stall lands in the store without per-request round trips.
+        stats = self.streams.open(f"{self.client_address[0]}:{self.client_address[1]}")
+        self._keyframe_signalled = False
+        self.connection.settimeout(self.stream_idle_timeout_s)
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = _iter_chunks(self.rfile)
+        else:
+            length = self.headers.get("Content-Length")
+            chunks = _iter_raw(self.rfile, int(length) if length is not None else None)
+
+        pending = bytearray()
+        max_line = self.max_stream_line_bytes
+        reason = "eof"
+        try:
+            for chunk in chunks:
+                stats.bytes_read += len(chunk)
+                pending += chunk
+                start = 0
+                while True:
+                    end = pending.find(b"\n", start)
+                    if end < 0:
+                        break
+                    if end - start > max_line:
+                        raise _LineTooLong
+                    self._ingest_line(bytes(pending[start:end]), stats)
+                    start = end + 1
+                del pending[:start]
+                if len(pending) > max_line:
+                    raise _LineTooLong
+            if pending:
+                self._ingest_line(bytes(pending), stats)
+        except _LineTooLong:
+            reason = "overflow"
+            self.close_connection = True
+            stats.overflows += 1
+        except (ConnectionError, OSError, ValueError) as exc:
+            # A half-written trailing line is discarded; the plugin reconnects.
+            reason = f"error: {exc}"
+            self.close_connection = True
+            if pending.strip():
+                stats.dropped += 1
+        finally:
+            self.streams.close(stats, reason)
+
+        if reason != "eof":
+            return
+        self.send_response(204)
+        self.send_header(ACCEPT_HEADER, BINARY_CONTENT_TYPE)
+        self.end_headers()
 
     def do_POST(self) -> None:  # noqa: N802
+        if self.path.split("?", 1)[0] == STREAM_PATH:
+            self._handle_stream()
+            return
+
         content_len = int(self.headers.get("Content-Length", "0"))
         body = self.rfile.read(content_len)
+        content_type = self.headers.get("Content-Type", "").split(";", 1)[0].strip()
 
+        snapshot: Snapshot | None
         try:
-            payload = json.loads(body)
-            if not isinstance(payload, dict):
-                raise ValueError("payload must be object")
-        except (json.JSONDecodeError, ValueError):
+            if content_type == BINARY_CONTENT_TYPE:
+                snapshot = decode_frame(body)
+            else:
+                snapshot = self._decode_json(body)
+        except (json.JSONDecodeError, ValueError, struct.error):
             self.send_response(400)
             self.end_headers()
             return
 
-        self.store.put(payload)
+        if snapshot is not None:
+            self.store.put(snapshot)
         self.send_response(204)
+        self.send_header(ACCEPT_HEADER, BINARY_CONTENT_TYPE)
+        if self.decoder.keyframe_requested:
+            self.send_header(KEYFRAME_HEADER, "1")
         self.end_headers()
 
     def log_message(self, format: str, *args: object) -> None:
@@ -95,9 +325,13 @@ class _TelemetryHandler(BaseHTTPRequestHandler):
 class RuneLiteTelemetryServer:
     def __init__(self, host: str, port: int) -> None:
         self.store = _SnapshotStore()
+        self.decoder = TelemetryDeltaDecoder()
+        self.streams = _StreamRegistry()
 
         handler_cls = type("RuneLiteTelemetryHandler", (_TelemetryHandler,), {})
         handler_cls.store = self.store
+        handler_cls.decoder = self.decoder
+        handler_cls.streams = self.streams
 
         self._server = ThreadingHTTPServer((host, port), handler_cls)
         self._server.daemon_threads = True
@@ -108,18 +342,83 @@ class RuneLiteTelemetryServer:
     def port(self) -> int:
         return int(self._server.server_port)
 
+    def stream_stats(self) -> list[StreamStats]:
+        return self.streams.snapshot()
+
     def stop(self) -> None:
         self._server.shutdown()
         self._server.server_close()
 
 
+def _records_from_json(payload: dict[str, object]) -> tuple[int, Coord, list[NpcRecord]]:
+    tick = _coerce_int(payload.get("tick", 0), "tick")
+    pos_raw = payload.get("player_pos", [0, 0])
+    if not isinstance(pos_raw, list) or len(pos_raw) != 2:
+        raise RuntimeError(f"Invalid player_pos payload: {pos_raw}")
+
+    bot_pos: Coord = (
+        _coerce_int(pos_raw[0], "player_pos[0]"),
+        _coerce_int(pos_raw[1], "player_pos[1]"),
+    )
+
+    records: list[NpcRecord] = []
+    nearby_scorpions_raw = payload.get("nearby_scorpions", [])
+    if isinstance(nearby_scorpions_raw, list):
+        for item in nearby_scorpions_raw:
+            if not isinstance(item, dict):
+                continue
+            distance = item.get("distance")
+            if not isinstance(distance, int):
+                continue
+
+            npc_id = item.get("id", -1)
+            if not isinstance(npc_id, int):
+                npc_id = -1
+
+            name = item.get("name", "Unknown")
+            if not isinstance(name, str):
+                name = "Unknown"
+
+            pos = item.get("pos", [0, 0])
+            if (
+                not isinstance(pos, list)
+                or len(pos) != 2
+                or not isinstance(pos[0], int)
+                or not isinstance(pos[1], int)
+            ):
+                pos = [0, 0]
+
+            npc_idx = item.get("idx", -1)
+            if not isinstance(npc_idx, int):
+                npc_idx = -1
+
+            records.append(NpcRecord(npc_idx, npc_id, name, pos[0], pos[1], distance))
+
+    return tick, bot_pos, records
+
+
 class RuneLitePerception:
     def __init__(self, config: RuneLiteHttpAdapterConfig) -> None:
         self.config = config
-        self.server = RuneLiteTelemetryServer(host=config.host, port=config.port)
+        self.server: RuneLiteTelemetryServer | ShmTelemetryReader
+        if config.transport == "shm":
+            if not config.shm_path:
+                raise ValueError("transport 'shm' requires shm_path")
+            self.server = ShmTelemetryReader(
+                path=Path(config.shm_path),
+                store=_SnapshotStore(),
+                poll_interval_s=config.shm_poll_interval_ms / 1000.0,
+            )
+        elif config.transport == "http":
+            self.server = RuneLiteTelemetryServer(host=config.host, port=config.port)
+        else:
+            raise ValueError(f"Unknown telemetry transport: {config.transport}")
+        self._observed_version = 0
 
     @property
     def listen_port(self) -> int:
+        if not isinstance(self.server, RuneLiteTelemetryServer):
+            raise AttributeError("listen_port is only available for the http transport")
         return self.server.port
 
     def observe(self) -> WorldModel:
@@ -128,91 +427,61 @@ class RuneLitePerception:
             raise RuntimeError(
                 "Timed out waiting for RuneLite telemetry. Check plugin endpoint and mode."
             )
+        return self._build_world(payload)
+
+    def observe_next(self, timeout_s: float) -> WorldModel | None:
+        """Block until a snapshot newer than the last one returned here arrives.
+
+        Snapshots that land while the caller is busy are coalesced: only the
+        newest is returned. Returns None on timeout.
+        """
+        update = self.server.store.wait_for_newer(self._observed_version, timeout_s)
+        if update is None:
+            return None
+        self._observed_version, payload = update
+        return self._build_world(payload)
+
+    def _build_world(self, payload: Snapshot) -> WorldModel:
+        if isinstance(payload, TelemetryFrame):
+            tick = payload.tick
+            bot_pos: Coord = payload.player_pos
+            records = list(payload.npcs)
+        else:
+            tick, bot_pos, records = _records_from_json(payload)
 
-        tick = _coerce_int(payload.get("tick", 0), "tick")
-        pos_raw = payload.get("player_pos", [0, 0])
-        if not isinstance(pos_raw, list) or len(pos_raw) != 2:
-            raise RuntimeError(f"Invalid player_pos payload: {pos_raw}")
-
-        bot_pos: Coord = (
-            _coerce_int(pos_raw[0], "player_pos[0]"),
-            _coerce_int(pos_raw[1], "player_pos[1]"),
-        )
         obstacles = set(self.config.obstacles or set())
         task_complete = bot_pos == self.config.target_pos
-        nearby_scorpions_raw = payload.get("nearby_scorpions", [])
-
-        nearby_scorpions: list[dict[str, object]] = []
-        if isinstance(nearby_scorpions_raw, list):
-            for item in nearby_scorpions_raw:
-                if isinstance(item, dict):
-                    distance = item.get("distance")
-                    if not isinstance(distance, int):
-                        continue
-
-                    npc_id = item.get("id", -1)
-                    if not isinstance(npc_id, int):
-                        npc_id = -1
-
-                    name = item.get("name", "Unknown")
-                    if not isinstance(name, str):
-                        name = "Unknown"
-
-                    pos = item.get("pos", [0, 0])
-                    if (
-                        not isinstance(pos, list)
-                        or len(pos) != 2
-                        or not isinstance(pos[0], int)
-                        or not isinstance(pos[1], int)
-                    ):
-                        pos = [0, 0]
-
-                    nearby_scorpions.append(
-                        {
-                            "id": npc_id,
-                            "name": name,
-                            "pos": pos,
-                            "distance": distance,
-                        }
-                    )
-
-        nearest_scorpion_distance: int | None = None
-        distances: list[int] = []
-        for npc in nearby_scorpions:
-            distance = npc.get("distance")
-            if isinstance(distance, int):
-                distances.append(distance)
-        if distances:
-            nearest_scorpion_distance = min(distances)
-
-        def _npc_sort_key(npc: dict[str, object]) -> tuple[int, int]:
-            distance = npc.get("distance")
-            npc_id = npc.get("id")
-            safe_distance = distance if isinstance(distance, int) else 10**6
-            safe_npc_id = npc_id if isinstance(npc_id, int) else -1
-            return safe_distance, safe_npc_id
-
-        nearby_scorpions.sort(key=_npc_sort_key)
-        best_target: dict[str, object] | None = nearby_scorpions[0] if nearby_scorpions else None
 
         npcs: dict[str, Npc] = {}
-        for idx, npc in enumerate(nearby_scorpions):
-            npc_id = npc.get("id", -1)
-            pos = npc.get("pos", [0, 0])
-            if not isinstance(pos, list) or len(pos) != 2:
-                continue
-            if not isinstance(pos[0], int) or not isinstance(pos[1], int):
-                continue
-
-            npc_key = f"scorpion_{npc_id}_{idx}"
+        npc_index = NpcSpatialIndex(metric="chebyshev")
+        entries_by_key: dict[str, dict[str, object]] = {}
+        for idx, record in enumerate(records):
+            entry: dict[str, object] = {
+                "id": record.id,
+                "name": record.name,
+                "pos": [record.x, record.y],
+                "distance": record.distance,
+            }
+            npc_key = f"scorpion_{record.id}_{idx}"
+            entries_by_key[npc_key] = entry
             npcs[npc_key] = Npc(
-                id=str(npc_id),
+                id=str(record.id),
                 npc_type=NpcType.SCORPION,
-                pos=(pos[0], pos[1]),
+                pos=(record.x, record.y),
                 hp=1,
                 max_hp=1,
                 alive=True,
             )
+            npc_index.insert(npc_key, (record.x, record.y), rank=record.id)
+
+        # Nearest first, ties by NPC id; the plugin's distance is Chebyshev too.
+        ranked = npc_index.nearest_k(bot_pos, len(records))
+        nearby_scorpions = [entries_by_key[npc_key] for _, npc_key in ranked]
+        nearest_scorpion_distance: int | None = None
+        best_target: dict[str, object] | None = None
+        if ranked:
+            nearest_scorpion_distance = ranked[0][0]
+            best_target = nearby_scorpions[0]
 
         risk_level = _risk_level(nearest_scorpion_distance)
         if best_target is None:
@@ -293,3 +562,17 @@ class RuneLiteHttpActionRunner:
             return ActionResult(success=False, message=f"action_http_error:{exc.code}")
         except Exception as exc:
             return ActionResult(success=False, message=f"action_send_failed:{exc}")
+
+
+def build_runelite_http_adapters(config: AppConfig) -> tuple[IPerception, IActionRunner]:
+    rl_config = config.runelite_http
+    perception = RuneLitePerception(rl_config)
+    if rl_config.enable_action_runner and rl_config.action_url:
+        runner = RuneLiteHttpActionRunner(
+            action_url=rl_config.action_url,
+            timeout_s=rl_config.action_timeout_s,
+            auth_token=rl_config.action_auth_token,
+        )
+        return perception, runner
+
+    return perception, RuneLiteNoopActionRunner()
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from ..actions.simulated import SimulatedActionRunner
+from ..perception.simulated import SimulatedPerception
+from ..simulator.grid_world import GridWorldEnv
+
+if TYPE_CHECKING:
+    from ..interfaces import IActionRunner, IPerception
+    from ..runtime import AppConfig
+
+
+def build_sim_adapters(config: AppConfig) -> tuple[IPerception, IActionRunner]:
+    env = GridWorldEnv(
+        width=config.sim_world.width,
+        height=config.sim_world.height,
+        bot_pos=config.sim_world.bot_pos,
+        target_pos=config.sim_world.target_pos,
+        obstacles=config.sim_world.obstacles,
+    )
+    return SimulatedPerception(env), SimulatedActionRunner(env)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass
+from typing import NamedTuple
+
+# Compact binary TickSnapshot, big-endian (Java ByteBuffer default):
+#   header: magic "TB", version u8, flags u8, tick i32, x i32, y i32,
+#           plane u8, pad, animation i16, pose_animation i16,
+#           health_ratio i16, health_scale i16, npc_count u16, name_count u8
+#   names:  name_count x (len u8, utf-8 bytes)
+#   npcs:   npc_count x (idx u16, id u16, dx i16, dy i16, distance u8, name_ref u8)
+# NPC positions are relative to the player tile.
+
+BINARY_CONTENT_TYPE = "application/vnd.osrs-telemetry.v1"
+ACCEPT_HEADER = "X-Telemetry-Accept"
+BINARY_MAGIC = b"TB"
+BINARY_VERSION = 1
+
+_HEADER = struct.Struct(">2sBBiiiBxhhhhHB")
+_NPC = struct.Struct(">HHhhBB")
+
+
+class NpcRecord(NamedTuple):
+    idx: int
+    id: int
+    name: str
+    x: int
+    y: int
+    distance: int
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetryFrame:
+    tick: int
+    player_pos: tuple[int, int]
+    plane: int = 0
+    animation: int = -1
+    pose_animation: int = -1
+    health_ratio: int = -1
+    health_scale: int = -1
+    npcs: tuple[NpcRecord, ...] = ()
+
+
+def decode_frame(body: bytes | bytearray | memoryview) -> TelemetryFrame:
+    view = memoryview(body)
+    if len(view) < _HEADER.size:
+        raise ValueError(f"Binary telemetry too short: {len(view)} bytes")
+
+    (
+        magic,
+        version,
+        _flags,
+        tick,
+        x,
+        y,
+        plane,
+        animation,
+        pose_animation,
+        health_ratio,
+        health_scale,
+        npc_count,
+        name_count,
+    ) = _HEADER.unpack_from(view, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"Bad binary telemetry magic: {bytes(magic)!r}")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary telemetry version: {version}")
+
+    offset = _HEADER.size
+    names: list[str] = []
+    for _ in range(name_count):
+        if offset >= len(view):
+            raise ValueError("Truncated binary telemetry name table")
+        length = view[offset]
+        offset += 1
+        end = offset + length
+        if end > len(view):
+            raise ValueError("Truncated binary telemetry name table")
+        names.append(str(view[offset:end], "utf-8"))
+        offset = end
+
+    if offset + npc_count * _NPC.size != len(view):
+        raise ValueError("Binary telemetry NPC block size mismatch")
+
+    npcs: list[NpcRecord] = []
+    for idx, npc_id, dx, dy, distance, name_ref in _NPC.iter_unpack(view[offset:]):
+        name = names[name_ref] if name_ref < len(names) else "Unknown"
+        npcs.append(NpcRecord(idx, npc_id, name, x + dx, y + dy, distance))
+
+    return TelemetryFrame(
+        tick=tick,
+        player_pos=(x, y),
+        plane=plane,
+        animation=animation,
+        pose_animation=pose_animation,
+        health_ratio=health_ratio,
+        health_scale=health_scale,
+        npcs=tuple(npcs),
+    )
+
+
+def encode_frame(frame: TelemetryFrame) -> bytes:
+    name_refs: dict[str, int] = {}
+    for npc in frame.npcs:
+        name_refs.setdefault(npc.name, len(name_refs))
+    if len(name_refs) > 255:
+        raise ValueError("Too many distinct NPC names for binary telemetry")
+
+    x, y = frame.player_pos
+    parts = [
+        _HEADER.pack(
+            BINARY_MAGIC,
+            BINARY_VERSION,
+            0,
+            frame.tick,
+            x,
+            y,
+            frame.plane,
+            frame.animation,
+            frame.pose_animation,
+            frame.health_ratio,
+            frame.health_scale,
+            len(frame.npcs),
+            len(name_refs),
+        )
+    ]
+    for name in name_refs:
+        raw = name.encode("utf-8")[:255]
+        parts.append(bytes((len(raw),)) + raw)
+    for npc in frame.npcs:
+        parts.append(
+            _NPC.pack(npc.idx, npc.id, npc.x - x, npc.y - y, npc.distance, name_refs[npc.name])
+        )
+    return b"".join(parts)
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from threading import Lock
+
+# Delta protocol (see runelite_telemetry_plugin/README.md):
+#   keyframe: full TickSnapshot fields + {"type": "keyframe", "seq": N}; NPC
+#             entries carry a per-instance "idx".
+#   delta:    {"type": "delta", "seq": N, "base_seq": N - 1, "tick": T}
+#             + any changed player fields
+#             + "npcs_added" [{"idx", "id", "name", "pos"}]
+#             + "npcs_moved" [{"idx", "pos"}]
+#             + "npcs_removed" [idx, ...]
+# Payloads without "type" are legacy full snapshots and pass through untouched.
+
+KEYFRAME_HEADER = "X-Telemetry-Keyframe"
+
+PLAYER_FIELDS = (
+    "tick",
+    "player_pos",
+    "plane",
+    "animation",
+    "pose_animation",
+    "health_ratio",
+    "health_scale",
+)
+
+
+def _require_int(value: object, field_name: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"Invalid integer field {field_name}: {value}")
+    return value
+
+
+def _require_pos(value: object, field_name: str) -> list[int]:
+    if (
+        not isinstance(value, list)
+        or len(value) != 2
+        or isinstance(value[0], bool)
+        or isinstance(value[1], bool)
+        or not isinstance(value[0], int)
+        or not isinstance(value[1], int)
+    ):
+        raise ValueError(f"Invalid position field {field_name}: {value}")
+    return value
+
+
+def _require_list(value: object, field_name: str) -> list[object]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"{field_name} must be a list")
+    return value
+
+
+def _distance(player_pos: list[int], pos: list[int]) -> int:
+    return max(abs(pos[0] - player_pos[0]), abs(pos[1] - player_pos[1]))
+
+
+class TelemetryDeltaDecoder:
+    """Rebuilds full snapshots from keyframe/delta payloads.
+
+    Reconstructed NPC entries are replaced, never mutated, so snapshots that
+    were already handed out stay valid.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._player: dict[str, object] | None = None
+        self._npcs: dict[int, dict[str, object]] = {}
+        self._seq: int | None = None
+        self._keyframe_requested = False
+        self.keyframes = 0
+        self.deltas = 0
+        self.gaps = 0
+
+    @property
+    def keyframe_requested(self) -> bool:
+        with self._lock:
+            return self._keyframe_requested
+
+    def decode(self, payload: dict[str, object]) -> dict[str, object] | None:
+        kind = payload.get("type")
+        if kind is None:
+            return payload
+
+        with self._lock:
+            if kind == "keyframe":
+                return self._apply_keyframe(payload)
+            if kind == "delta":
+                return self._apply_delta(payload)
+        raise ValueError(f"Unknown telemetry payload type: {kind}")
+
+    def _snapshot(self) -> dict[str, object]:
+        assert self._player is not None
+        snapshot = dict(self._player)
+        snapshot["nearby_scorpions"] = list(self._npcs.values())
+        return snapshot
+
+    def _apply_keyframe(self, payload: dict[str, object]) -> dict[str, object]:
+        seq = _require_int(payload.get("seq"), "seq")
+        player = {name: payload[name] for name in PLAYER_FIELDS if name in payload}
+        player_pos = _require_pos(player.get("player_pos"), "player_pos")
+
+        npcs: dict[int, dict[str, object]] = {}
+        raw_npcs = payload.get("nearby_scorpions", [])
+        if not isinstance(raw_npcs, list):
+            raise ValueError("nearby_scorpions must be a list")
+        for item in raw_npcs:
+            if not isinstance(item, dict):
+                raise ValueError(f"Invalid NPC entry: {item}")
+            idx = _require_int(item.get("idx"), "idx")
+            pos = _require_pos(item.get("pos"), "pos")
+            npcs[idx] = {**item, "distance": _distance(player_pos, pos)}
+
+        self._player = player
+        self._npcs = npcs
+        self._seq = seq
+        self._keyframe_requested = False
+        self.keyframes += 1
+        return self._snapshot()
+
+    def _apply_delta(self, payload: dict[str, object]) -> dict[str, object] | None:
+        seq = _require_int(payload.get("seq"), "seq")
+        base_seq = _require_int(payload.get("base_seq"), "base_seq")
+        if self._player is None or self._seq != base_seq:
+            self.gaps += 1
+            self._keyframe_requested = True
+            return None
+
+        player = dict(self._player)
+        for name in PLAYER_FIELDS:
+            if name in payload:
+                player[name] = payload[name]
+        player_pos = _require_pos(player.get("player_pos"), "player_pos")
+        player_moved = player_pos != self._player.get("player_pos")
+
+        # Work on a copy: a bad entry must not leave the decoder half-updated.
+        npcs = dict(self._npcs)
+        for idx_raw in _require_list(payload.get("npcs_removed"), "npcs_removed"):
+            npcs.pop(_require_int(idx_raw, "npcs_removed[]"), None)
+
+        for item in _require_list(payload.get("npcs_moved"), "npcs_moved"):
+            if not isinstance(item, dict):
+                raise ValueError(f"Invalid NPC move: {item}")
+            idx = _require_int(item.get("idx"), "idx")
+            current = npcs.get(idx)
+            if current is None:
+                # Moving an NPC we never saw means we lost a delta somewhere.
+                self.gaps += 1
+                self._keyframe_requested = True
+                return None
+            pos = _require_pos(item.get("pos"), "pos")
+            npcs[idx] = {**current, "pos": pos, "distance": _distance(player_pos, pos)}
+
+        for item in _require_list(payload.get("npcs_added"), "npcs_added"):
+            if not isinstance(item, dict):
+                raise ValueError(f"Invalid NPC entry: {item}")
+            idx = _require_int(item.get("idx"), "idx")
+            pos = _require_pos(item.get("pos"), "pos")
+            npcs[idx] = {**item, "distance": _distance(player_pos, pos)}
+
+        if player_moved:
+            for idx, entry in npcs.items():
+                pos = entry["pos"]
+                assert isinstance(pos, list)
+                npcs[idx] = {**entry, "distance": _distance(player_pos, pos)}
+
+        self._player = player
+        self._npcs = npcs
+        self._seq = seq
+        self.deltas += 1
+        return self._snapshot()
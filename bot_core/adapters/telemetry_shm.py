@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from threading import Event, Thread
+from typing import TYPE_CHECKING
+
+from .telemetry_binary import decode_frame
+
+if TYPE_CHECKING:
+    from .runelite_http import _SnapshotStore
+
+# Memory-mapped ring of binary TickSnapshot frames (see telemetry_binary.py).
+#   file header (64 bytes, little-endian):
+#       magic "TRNG", version u32, slot_count u32, slot_size u32, write_seq u64
+#   slot i at 64 + i * slot_size:
+#       seq_begin u64, seq_end u64, length u32, pad u32, payload[length]
+# The writer stores seq_begin, payload, length, seq_end and finally bumps
+# write_seq. Readers check seq_end before and seq_begin after copying, so a
+# slot overwritten mid-read is detected and skipped (seqlock style).
+
+RING_MAGIC = b"TRNG"
+RING_VERSION = 1
+RING_HEADER_SIZE = 64
+DEFAULT_SLOT_COUNT = 8
+DEFAULT_SLOT_SIZE = 4096
+
+_RING_HEADER = struct.Struct("<4sIII")
+_WRITE_SEQ = struct.Struct("<Q")
+_WRITE_SEQ_OFFSET = _RING_HEADER.size
+_SLOT_HEADER = struct.Struct("<QQI4x")
+_U64 = struct.Struct("<Q")
+
+
+def _ring_size(slot_count: int, slot_size: int) -> int:
+    return RING_HEADER_SIZE + slot_count * slot_size
+
+
+def _read_geometry(fd: int) -> tuple[int, int] | None:
+    size = os.fstat(fd).st_size
+    if size < RING_HEADER_SIZE:
+        return None
+    magic, version, slot_count, slot_size = _RING_HEADER.unpack(
+        os.pread(fd, _RING_HEADER.size, 0)
+    )
+    if magic != RING_MAGIC or version != RING_VERSION:
+        return None
+    if slot_size <= _SLOT_HEADER.size or size < _ring_size(slot_count, slot_size):
+        return None
+    return slot_count, slot_size
+
+
+def _open_ring(
+    path: Path, slot_count: int, slot_size: int
+) -> tuple[mmap.mmap, int, int]:
+    """Map an existing ring, or (re)initialise one with the given geometry.
+
+    Only the writer calls this; readers attach with ``_attach_ring``.
+    """
+    if slot_count < 1 or slot_size <= _SLOT_HEADER.size:
+        raise ValueError(f"Invalid ring geometry: {slot_count} x {slot_size}")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        geometry = _read_geometry(fd)
+        if geometry is None:
+            os.ftruncate(fd, 0)
+            os.ftruncate(fd, _ring_size(slot_count, slot_size))
+            os.pwrite(
+                fd, _RING_HEADER.pack(RING_MAGIC, RING_VERSION, slot_count, slot_size), 0
+            )
+        else:
+            slot_count, slot_size = geometry
+        mapped = mmap.mmap(fd, _ring_size(slot_count, slot_size))
+    finally:
+        os.close(fd)
+    return mapped, slot_count, slot_size
+
+
+def _attach_ring(path: Path) -> tuple[mmap.mmap, int, int] | None:
+    """Map a ring read-only once its writer has published a valid header."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        geometry = _read_geometry(fd)
+        if geometry is None:
+            return None
+        slot_count, slot_size = geometry
+        mapped = mmap.mmap(fd, _ring_size(slot_count, slot_size), access=mmap.ACCESS_READ)
+    finally:
+        os.close(fd)
+    return mapped, slot_count, slot_size
+
+
+class ShmRingWriter:
+    """Python counterpart of the plugin's ring writer, used by tests and tools."""
+
+    def __init__(
+        self,
+        path: Path,
+        slot_count: int = DEFAULT_SLOT_COUNT,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+    ) -> None:
+        self._mm, self.slot_count, self.slot_size = _open_ring(path, slot_count, slot_size)
+        (self._seq,) = _WRITE_SEQ.unpack_from(self._mm, _WRITE_SEQ_OFFSET)
+
+    def write(self, payload: bytes) -> int:
+        if len(payload) > self.slot_size - _SLOT_HEADER.size:
+            raise ValueError(f"payload too large for slot: {len(payload)} bytes")
+        seq = self._seq + 1
+        offset = RING_HEADER_SIZE + ((seq - 1) % self.slot_count) * self.slot_size
+        _U64.pack_into(self._mm, offset, seq)
+        body = offset + _SLOT_HEADER.size
+        self._mm[body : body + len(payload)] = payload
+        struct.pack_into("<I", self._mm, offset + 16, len(payload))
+        _U64.pack_into(self._mm, offset + 8, seq)
+        _WRITE_SEQ.pack_into(self._mm, _WRITE_SEQ_OFFSET, seq)
+        self._seq = seq
+        return seq
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+class ShmTelemetryReader:
+    """Polls a ring file and pushes each newly completed frame into a store.
+
+    The reader never creates or resizes the file: until the writer has
+    published a valid header it keeps retrying, once per poll interval.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        store: _SnapshotStore,
+        poll_interval_s: float = 0.002,
+    ) -> None:
+        self.path = path
+        self.store = store
+        self.poll_interval_s = poll_interval_s
+        self._mm: mmap.mmap | None = None
+        self._view: memoryview | None = None
+        self.slot_count = 0
+        self.slot_size = 0
+        self._last_seq = 0
+        self.frames_read = 0
+        self.frames_skipped = 0
+        self.torn_reads = 0
+        self.decode_errors = 0
+        # Frames already in a ring that exists at startup are stale; a ring
+        # that appears later is read from its first frame.
+        if self._attach():
+            assert self._view is not None
+            (self._last_seq,) = _WRITE_SEQ.unpack_from(self._view, _WRITE_SEQ_OFFSET)
+        self._stop = Event()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def attached(self) -> bool:
+        return self._view is not None
+
+    def _attach(self) -> bool:
+        ring = _attach_ring(self.path)
+        if ring is None:
+            return False
+        self._mm, self.slot_count, self.slot_size = ring
+        self._view = memoryview(self._mm)
+        return True
+
+    def poll_once(self) -> bool:
+        view = self._view
+        if view is None:
+            if not self._attach():
+                return False
+            view = self._view
+            assert view is not None
+        (write_seq,) = _WRITE_SEQ.unpack_from(view, _WRITE_SEQ_OFFSET)
+        if write_seq == self._last_seq:
+            return False
+
+        offset = RING_HEADER_SIZE + ((write_seq - 1) % self.slot_count) * self.slot_size
+        _, seq_end, length = _SLOT_HEADER.unpack_from(view, offset)
+        if seq_end != write_seq or length > self.slot_size - _SLOT_HEADER.size:
+            self.torn_reads += 1
+            return False
+
+        body = offset + _SLOT_HEADER.size
+        try:
+            frame = decode_frame(view[body : body + length])
+        except (ValueError, struct.error):
+            frame = None
+
+        (seq_begin,) = _U64.unpack_from(view, offset)
+        if seq_begin != write_seq:
+            self.torn_reads += 1
+            return False
+        if frame is None:
+            self.decode_errors += 1
+            self._last_seq = write_seq
+            return False
+
+        self.frames_skipped += max(0, write_seq - self._last_seq - 1)
+        self._last_seq = write_seq
+        self.frames_read += 1
+        self.store.put(frame)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self.poll_once():
+                self._stop.wait(self.poll_interval_s)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+
+from .distance_field import DEFAULT_MAX_CELLS, UNREACHABLE, DistanceField
+from .simulator.batch_world import ACT_IDLE, ACT_INTERACT, ACT_MOVE, BatchGridWorld
+from .types import Coord
+
+# State codes, in the order of STATE_NAMES (the FSM state names).
+IDLE = 0
+NAVIGATE = 1
+INTERACT = 2
+RECOVER = 3
+STATE_NAMES = ("idle", "navigate", "interact", "recover")
+
+STOP_NONE = 0
+STOP_COMPLETED = 1
+STOP_MAX_RETRIES = 2
+STOP_NO_RECOVER_MOVE = 3
+STOP_TOO_MANY_FAILURES = 4
+STOP_REASONS = (None, "completed", "max_retries", "no_recover_move", "too_many_failures")
+
+
+class BatchPolicy:
+    """The default FSM (idle/navigate/interact/recover) for N bots at once.
+
+    Mirrors ``build_default_states(distance_fields=...)`` decision for
+    decision: navigation reads the next step off one ``DistanceField`` per
+    target, shared by every bot heading there, and FSM state, retry counters
+    and stop reasons live in arrays. The single-context FSM remains the
+    reference; see tests/test_batch_policy.py for the parity check.
+    """
+
+    def __init__(
+        self,
+        world: BatchGridWorld,
+        max_retries: int = 5,
+        max_cells: int = DEFAULT_MAX_CELLS,
+    ) -> None:
+        if world.width * world.height > max_cells:
+            raise ValueError(
+                f"Grid {world.width}x{world.height} exceeds max_cells={max_cells}"
+            )
+        count = len(world)
+        self.world = world
+        self.max_retries = max_retries
+        self.state = array("b", [IDLE]) * count
+        self.recover_attempts = array("i", [0]) * count
+        self.stop = array("b", [STOP_NONE]) * count
+        self.kind = array("b", [ACT_IDLE]) * count
+        self.target_x = array("i", [0]) * count
+        self.target_y = array("i", [0]) * count
+        self._fields: dict[Coord, DistanceField] = {}
+
+    def field(self, target: Coord) -> DistanceField:
+        field = self._fields.get(target)
+        if field is None:
+            world = self.world
+            field = DistanceField(target, world.width, world.height, world.obstacles)
+            self._fields[target] = field
+        return field
+
+    def decide(self, active: list[int]) -> None:
+        """Fill ``kind``/``target_x``/``target_y`` for every bot in ``active``."""
+        world = self.world
+        width, height, obstacles = world.width, world.height, world.obstacles
+        xs, ys, txs, tys, complete = world.x, world.y, world.target_x, world.target_y, world.complete
+        state, attempts, stop = self.state, self.recover_attempts, self.stop
+        kind, out_x, out_y = self.kind, self.target_x, self.target_y
+        fields = self._fields
+        max_retries = self.max_retries
+
+        for idx in active:
+            x, y, tx, ty = xs[idx], ys[idx], txs[idx], tys[idx]
+            current = state[idx]
+            kind[idx] = ACT_IDLE
+
+            if current == IDLE:
+                if complete[idx]:
+                    stop[idx] = STOP_COMPLETED
+                elif x == tx and y == ty:
+                    state[idx] = INTERACT
+                else:
+                    state[idx] = NAVIGATE
+
+            elif current == NAVIGATE:
+                if x == tx and y == ty:
+                    state[idx] = INTERACT
+                    continue
+                field = fields.get((tx, ty)) or self.field((tx, ty))
+                dist = field.dist
+                here = dist[y * width + x] if 0 <= x < width and 0 <= y < height else UNREACHABLE
+                step = None
+                if here != UNREACHABLE:
+                    # Same neighbour order as DistanceField.next_step.
+                    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                        if 0 <= nx < width and 0 <= ny < height and dist[ny * width + nx] == here - 1:
+                            step = (nx, ny)
+                            break
+                if step is None:
+                    state[idx] = RECOVER
+                    continue
+                attempts[idx] = 0
+                kind[idx] = ACT_MOVE
+                out_x[idx], out_y[idx] = step
+
+            elif current == INTERACT:
+                state[idx] = IDLE
+                kind[idx] = ACT_INTERACT
+
+            else:
+                attempts[idx] += 1
+                if attempts[idx] > max_retries:
+                    stop[idx] = STOP_MAX_RETRIES
+                    continue
+                # Smallest valid neighbour, as RecoverState's sorted() picks.
+                best = None
+                for pos in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if (
+                        0 <= pos[0] < width
+                        and 0 <= pos[1] < height
+                        and pos not in obstacles
+                        and (best is None or pos < best)
+                    ):
+                        best = pos
+                if best is None:
+                    stop[idx] = STOP_NO_RECOVER_MOVE
+                    continue
+                state[idx] = NAVIGATE
+                kind[idx] = ACT_MOVE
+                out_x[idx], out_y[idx] = best
+
+
+@dataclass
+class BatchRunResult:
+    reasons: list[str]
+    ticks: array
+    final_states: list[str]
+
+    def success(self, idx: int) -> bool:
+        return self.reasons[idx] == "completed"
+
+
+def run_batch(
+    world: BatchGridWorld,
+    policy: BatchPolicy,
+    max_ticks: int = 200,
+    max_consecutive_failures: int = 6,
+) -> BatchRunResult:
+    """Run every bot like ``BotEngine.run`` would, all bots one tick at a time."""
+    count = len(world)
+    failures = array("i", [0]) * count
+    ticks = array("i", [0]) * count
+    reasons: list[str | None] = [None] * count
+    active = list(range(count))
+
+    processed = 0
+    while active and processed < max_ticks:
+        policy.decide(active)
+        success = world.step(policy.kind, policy.target_x, policy.target_y, active)
+        processed += 1
+        still_active: list[int] = []
+        for idx in active:
+            if success[idx]:
+                failures[idx] = 0
+            else:
+                failures[idx] += 1
+                if failures[idx] >= max_consecutive_failures:
+                    policy.stop[idx] = STOP_TOO_MANY_FAILURES
+            if world.complete[idx]:
+                reasons[idx] = "completed"
+            elif policy.stop[idx] != STOP_NONE:
+                reasons[idx] = STOP_REASONS[policy.stop[idx]]
+            else:
+                still_active.append(idx)
+                continue
+            ticks[idx] = processed
+        active = still_active
+
+    for idx in active:
+        reasons[idx] = "timeout"
+        ticks[idx] = max_ticks
+    return BatchRunResult(
+        reasons=[reason or "timeout" for reason in reasons],
+        ticks=ticks,
+        final_states=[STATE_NAMES[code] for code in policy.state],
+    )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+# Degradations, applied in this order as the remaining tick budget shrinks.
+REUSE_PATH = "reuse_path"
+SKIP_DOUBLE_OBSERVE = "skip_double_observe"
+DEFER_LOG = "defer_log"
+STALE_SKIP = "stale_skip"
+
+
+@dataclass
+class BudgetStats:
+    ticks: int = 0
+    overruns: int = 0
+    worst_overrun_ms: float = 0.0
+    degradations: dict[str, int] = field(default_factory=dict)
+
+
+class TickBudget:
+    """Tracks how much of the current game tick is left and what to give up.
+
+    Phase costs are smoothed (EWMA) so each step can be skipped *before* it
+    would overrun rather than after. A skipped phase is not measured, so its
+    estimate decays on every skip until the phase fits and is tried again;
+    one slow tick does not disable a step for good. A tick is stale once the
+    whole budget is spent; acting on it would mean acting on a world that
+    has moved on.
+    """
+
+    def __init__(
+        self,
+        tick_ms: float = 600.0,
+        smoothing: float = 0.3,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if tick_ms <= 0:
+            raise ValueError(f"tick_ms must be > 0, got: {tick_ms}")
+        self.tick_ms = tick_ms
+        self.smoothing = smoothing
+        self.clock = clock
+        self.stats = BudgetStats()
+        self._estimates_ms: dict[str, float] = {}
+        self._tick_started = 0.0
+        self._phase_started = 0.0
+        self.applied: list[str] = []
+
+    def begin_tick(self, started_at: float | None = None) -> None:
+        self._tick_started = self.clock() if started_at is None else started_at
+        self.applied = []
+        self.stats.ticks += 1
+
+    def remaining_ms(self) -> float:
+        return self.tick_ms - (self.clock() - self._tick_started) * 1000.0
+
+    def estimate_ms(self, *phases: str) -> float:
+        return sum(self._estimates_ms.get(phase, 0.0) for phase in phases)
+
+    def start_phase(self) -> None:
+        self._phase_started = self.clock()
+
+    def end_phase(self, phase: str) -> None:
+        cost_ms = (self.clock() - self._phase_started) * 1000.0
+        previous = self._estimates_ms.get(phase)
+        if previous is None:
+            self._estimates_ms[phase] = cost_ms
+        else:
+            self._estimates_ms[phase] = previous + self.smoothing * (cost_ms - previous)
+
+    def fits(self, *phases: str) -> bool:
+        return self.remaining_ms() >= self.estimate_ms(*phases)
+
+    def degrade(self, what: str, *skipped_phases: str) -> None:
+        """Record a degradation; ``skipped_phases`` go unmeasured this tick."""
+        for phase in skipped_phases:
+            if phase in self._estimates_ms:
+                self._estimates_ms[phase] *= 1.0 - self.smoothing
+        self.applied.append(what)
+        self.stats.degradations[what] = self.stats.degradations.get(what, 0) + 1
+
+    def end_tick(self) -> float:
+        """Close the tick; returns the overrun in ms (0 when on time)."""
+        overrun_ms = max(0.0, -self.remaining_ms())
+        if overrun_ms > 0:
+            self.stats.overruns += 1
+            self.stats.worst_overrun_ms = max(self.stats.worst_overrun_ms, overrun_ms)
+        return overrun_ms
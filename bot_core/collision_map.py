@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import AbstractSet
+
+from .types import ActionResult, BotAction, Coord
+from .world_model import WorldView
+
+# local x, local y (within the region), flags
+_RECORD = struct.Struct("<BBB")
+_BLOCKED = 1
+# Results of moves the runner never sent (e.g. the HTTP runner only forwards
+# attacks) say nothing about the tile.
+_UNSENT_PREFIXES = ("ignored:", "noop:")
+
+
+class CollisionStore:
+    """Append-only per-region files of learned tiles.
+
+    Tiles are grouped into ``region_size`` squares, one ``<rx>_<ry>.col`` file
+    each, 3 bytes per record. Replaying a file in order gives the latest
+    verdict per tile, so updates never rewrite existing data.
+    """
+
+    def __init__(self, directory: Path, region_size: int = 64) -> None:
+        if not 1 <= region_size <= 256:
+            raise ValueError(f"region_size must be in 1..256, got: {region_size}")
+        self.directory = directory
+        self.region_size = region_size
+        self.records_written = 0
+
+    def _region_path(self, region: Coord) -> Path:
+        return self.directory / f"{region[0]}_{region[1]}.col"
+
+    def append(self, pos: Coord, blocked: bool) -> None:
+        size = self.region_size
+        region = (pos[0] // size, pos[1] // size)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        record = _RECORD.pack(
+            pos[0] - region[0] * size, pos[1] - region[1] * size, _BLOCKED if blocked else 0
+        )
+        with self._region_path(region).open("ab") as handle:
+            handle.write(record)
+        self.records_written += 1
+
+    def load(self) -> dict[Coord, bool]:
+        """Latest verdict per tile: True for blocked, False for walkable."""
+        tiles: dict[Coord, bool] = {}
+        if not self.directory.is_dir():
+            return tiles
+        size = self.region_size
+        for path in sorted(self.directory.glob("*.col")):
+            try:
+                rx, ry = (int(part) for part in path.stem.split("_"))
+            except ValueError:
+                continue
+            data = path.read_bytes()
+            # A torn final record from a crash is ignored.
+            usable = len(data) - len(data) % _RECORD.size
+            for lx, ly, flags in _RECORD.iter_unpack(data[:usable]):
+                tiles[(rx * size + lx, ry * size + ly)] = bool(flags & _BLOCKED)
+        return tiles
+
+
+class CollisionMap:
+    """Blocked/walkable tiles learned from moves and position history.
+
+    A ``blocked`` move result marks the target at once. A move the runner
+    reports as sent but that leaves the bot in place counts as a stall; after
+    ``confirm_after`` stalls towards the same tile it is marked blocked. Any
+    tile the bot is seen standing on is walkable, which also clears a
+    hand-listed or learned obstacle there.
+    """
+
+    def __init__(self, store: CollisionStore | None = None, confirm_after: int = 2) -> None:
+        if confirm_after < 1:
+            raise ValueError(f"confirm_after must be >= 1, got: {confirm_after}")
+        self.store = store
+        self.confirm_after = confirm_after
+        self.blocked: set[Coord] = set()
+        self.walkable: set[Coord] = set()
+        # Bumped when ``blocked`` changes; walkable tiles are logged instead,
+        # since most of them (every tile walked on) never were obstacles.
+        self.version = 0
+        self._walkable_log: list[Coord] = []
+        self._pending: tuple[Coord, Coord] | None = None
+        self._stalls: dict[Coord, int] = {}
+        # (input, version, walkable tiles checked, result)
+        self._merged: tuple[AbstractSet[Coord], int, int, AbstractSet[Coord]] | None = None
+        if store is not None:
+            for pos, blocked in store.load().items():
+                (self.blocked if blocked else self.walkable).add(pos)
+            self._walkable_log.extend(self.walkable)
+
+    def _learn(self, pos: Coord, blocked: bool) -> None:
+        if blocked:
+            if pos in self.blocked:
+                return
+            self.blocked.add(pos)
+            self.walkable.discard(pos)
+            self.version += 1
+        else:
+            if pos in self.walkable:
+                return
+            self.walkable.add(pos)
+            self._walkable_log.append(pos)
+            if pos in self.blocked:
+                self.blocked.discard(pos)
+                self.version += 1
+        if self.store is not None:
+            self.store.append(pos, blocked)
+
+    def observe(self, world: WorldView, action: BotAction, result: ActionResult) -> None:
+        """Learn from the position in ``world`` and the move just made from it."""
+        here = world.bot_pos
+        self._learn(here, blocked=False)
+        if self._pending is not None:
+            origin, target = self._pending
+            if here == target:
+                self._stalls.pop(target, None)
+            elif here == origin:
+                stalls = self._stalls.get(target, 0) + 1
+                self._stalls[target] = stalls
+                if stalls >= self.confirm_after:
+                    self._stalls.pop(target, None)
+                    self._learn(target, blocked=True)
+        self._pending = None
+
+        if action.kind != "move" or action.target is None:
+            return
+        if result.message == "blocked":
+            self._learn(action.target, blocked=True)
+        elif result.success and not result.message.startswith(_UNSENT_PREFIXES):
+            self._pending = (here, action.target)
+
+    def merge(self, obstacles: AbstractSet[Coord]) -> AbstractSet[Coord]:
+        """``obstacles`` with learned tiles applied.
+
+        The result keeps its identity until the obstacle contents change, so
+        caches keyed on it (snapshots, distance fields, route and landmark
+        hashes) stay warm while the bot only learns walkable tiles.
+        """
+        if not self.blocked and not self.walkable:
+            return obstacles
+        log = self._walkable_log
+        cached = self._merged
+        if cached is not None and cached[0] is obstacles and cached[1] == self.version:
+            if not any(pos in obstacles for pos in log[cached[2]:]):
+                self._merged = (obstacles, self.version, len(log), cached[3])
+                return cached[3]
+        if self.blocked <= obstacles and self.walkable.isdisjoint(obstacles):
+            merged: AbstractSet[Coord] = obstacles
+        else:
+            merged = frozenset((set(obstacles) - self.walkable) | self.blocked)
+        self._merged = (obstacles, self.version, len(log), merged)
+        return merged
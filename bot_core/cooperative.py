@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import heapq
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import AbstractSet, Mapping
+
+from .distance_field import DistanceField
+from .simulator.multi_agent import MultiAgentGridEnv
+from .types import Coord
+
+
+class ReservationTable:
+    """Space-time reservations: who occupies which tile at which tick.
+
+    Edge reservations stop two agents from swapping tiles in one tick, which
+    vertex reservations alone would allow.
+    """
+
+    def __init__(self) -> None:
+        self._vertex: dict[tuple[Coord, int], str] = {}
+        self._edge: dict[tuple[Coord, Coord, int], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._vertex)
+
+    def clear(self) -> None:
+        self._vertex.clear()
+        self._edge.clear()
+
+    def reserve(self, agent_id: str, pos: Coord, t: int) -> None:
+        self._vertex[(pos, t)] = agent_id
+
+    def release(self, agent_id: str, pos: Coord, t: int) -> None:
+        if self._vertex.get((pos, t)) == agent_id:
+            del self._vertex[(pos, t)]
+
+    def reserve_path(self, agent_id: str, path: list[Coord], t0: int) -> None:
+        """``path[i]`` is the agent's tile at tick ``t0 + i``."""
+        for i, pos in enumerate(path):
+            self._vertex[(pos, t0 + i)] = agent_id
+            if i and path[i - 1] != pos:
+                self._edge[(path[i - 1], pos, t0 + i - 1)] = agent_id
+
+    def can_move(self, agent_id: str, src: Coord, dst: Coord, t: int) -> bool:
+        """Whether moving (or waiting) ``src`` -> ``dst`` between ``t`` and ``t + 1`` is free."""
+        owner = self._vertex.get((dst, t + 1))
+        if owner is not None and owner != agent_id:
+            return False
+        if src != dst:
+            owner = self._edge.get((dst, src, t))
+            if owner is not None and owner != agent_id:
+                return False
+        return True
+
+
+def space_time_astar(
+    agent_id: str,
+    start: Coord,
+    goal_field: DistanceField,
+    t0: int,
+    window: int,
+    table: ReservationTable,
+) -> list[Coord] | None:
+    """Windowed space-time A* (the inner search of WHCA*).
+
+    Returns ``window + 1`` tiles (one per tick from ``t0``) avoiding
+    ``table``, minimising steps taken plus the true remaining distance at the
+    window's end. Waiting costs 1 except on the goal, so agents settle there.
+    ``goal_field`` gives the exact heuristic (reverse search from the goal).
+    """
+    goal = goal_field.target
+    start_h = goal_field.distance(start)
+    if start_h is None:
+        return None
+    width, height = goal_field.width, goal_field.height
+    obstacles = goal_field.obstacles
+    dist = goal_field.dist
+
+    came_from: dict[tuple[Coord, int], tuple[Coord, int] | None] = {(start, 0): None}
+    best_g: dict[tuple[Coord, int], int] = {(start, 0): 0}
+    frontier: list[tuple[int, int, int, Coord]] = [(start_h, start_h, 0, start)]
+    while frontier:
+        _, _, dt, pos = heapq.heappop(frontier)
+        node = (pos, dt)
+        g = best_g[node]
+        if dt == window:
+            path: list[Coord] = []
+            cursor: tuple[Coord, int] | None = node
+            while cursor is not None:
+                path.append(cursor[0])
+                cursor = came_from[cursor]
+            path.reverse()
+            return path
+
+        x, y = pos
+        t = t0 + dt
+        for nxt in (pos, (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            nx, ny = nxt
+            if not (0 <= nx < width and 0 <= ny < height) or nxt in obstacles:
+                continue
+            h = dist[ny * width + nx]
+            if h == 0x7FFFFFFF or not table.can_move(agent_id, pos, nxt, t):
+                continue
+            step = 0 if nxt == pos == goal else 1
+            key = (nxt, dt + 1)
+            tentative = g + step
+            if tentative < best_g.get(key, 1 << 30):
+                best_g[key] = tentative
+                came_from[key] = node
+                heapq.heappush(frontier, (tentative + h, h, dt + 1, nxt))
+    return None
+
+
+class CooperativePlanner:
+    """Windowed Hierarchical Cooperative A* over a shared reservation table.
+
+    Every ``replan_every`` ticks (or when an agent is off its plan) all agents
+    are replanned in priority order, each reserving its ``window``-tick path
+    for those after it. The priority order rotates on every forced replan so
+    a stuck agent is not always the one yielding.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        window: int = 8,
+        replan_every: int | None = None,
+    ) -> None:
+        if window < 1:
+            raise ValueError(f"window must be >= 1, got: {window}")
+        self.width = width
+        self.height = height
+        self.obstacles = frozenset(obstacles)
+        self.window = window
+        self.replan_every = replan_every if replan_every is not None else max(1, window // 2)
+        self.table = ReservationTable()
+        self.replans = 0
+        self._fields: dict[Coord, DistanceField] = {}
+        self._plans: dict[str, list[Coord]] = {}
+        self._planned_at = -(1 << 30)
+        self._rotation = 0
+
+    def _field(self, goal: Coord) -> DistanceField:
+        field = self._fields.get(goal)
+        if field is None:
+            field = DistanceField(goal, self.width, self.height, self.obstacles)
+            self._fields[goal] = field
+        return field
+
+    def _replan(self, positions: Mapping[str, Coord], goals: Mapping[str, Coord], tick: int) -> None:
+        self.table.clear()
+        self.replans += 1
+        self._planned_at = tick
+
+        def remaining(agent_id: str) -> int:
+            d = self._field(goals[agent_id]).distance(positions[agent_id])
+            return -1 if d is None else d
+
+        # Agents with farther to go pick first; arrived agents last.
+        order = sorted(positions, key=lambda a: (-remaining(a), a))
+        if self._rotation and order:
+            shift = self._rotation % len(order)
+            order = order[shift:] + order[:shift]
+
+        # Agents not planned yet may not move; keep their next tile free.
+        for agent_id, pos in positions.items():
+            self.table.reserve(agent_id, pos, tick + 1)
+        for agent_id in order:
+            pos = positions[agent_id]
+            self.table.release(agent_id, pos, tick + 1)
+            path = space_time_astar(
+                agent_id, pos, self._field(goals[agent_id]), tick, self.window, self.table
+            )
+            if path is None:
+                path = [pos] * (self.window + 1)
+            self.table.reserve_path(agent_id, path, tick)
+            self._plans[agent_id] = path
+
+    def next_moves(
+        self,
+        positions: Mapping[str, Coord],
+        goals: Mapping[str, Coord],
+        tick: int,
+        force: bool = False,
+    ) -> dict[str, Coord]:
+        """Tile each agent should be on at ``tick + 1``."""
+        offset = tick - self._planned_at
+        off_plan = any(
+            offset >= len(self._plans.get(a, ())) or self._plans[a][offset] != pos
+            for a, pos in positions.items()
+        )
+        if force:
+            self._rotation += 1
+        if force or off_plan or offset >= self.replan_every:
+            self._replan(positions, goals, tick)
+            offset = 0
+        return {a: self._plans[a][offset + 1] for a in positions}
+
+
+@dataclass
+class MultiAgentResult:
+    agents: int
+    ticks: int
+    arrived: int
+    moves: int
+    rejected: int
+    replans: int
+    elapsed_s: float
+
+    @property
+    def moves_per_s(self) -> float:
+        return self.moves / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def run_cooperative(
+    env: MultiAgentGridEnv,
+    planner: CooperativePlanner,
+    max_ticks: int = 500,
+) -> MultiAgentResult:
+    """Drive every agent in ``env`` with ``planner`` until all arrive or time runs out."""
+    started = time.perf_counter()
+    force = False
+    while env.tick < max_ticks and len(env.arrived()) < len(env.goals):
+        moves = planner.next_moves(env.positions, env.goals, env.tick, force=force)
+        force = bool(env.step(moves))
+    return MultiAgentResult(
+        agents=len(env.goals),
+        ticks=env.tick,
+        arrived=len(env.arrived()),
+        moves=env.moves,
+        rejected=env.rejected,
+        replans=planner.replans,
+        elapsed_s=time.perf_counter() - started,
+    )
+
+
+def _largest_component(size: int, obstacles: AbstractSet[Coord]) -> list[Coord]:
+    """Free tiles of the largest 4-connected area (the first found on ties)."""
+    seen: set[Coord] = set(obstacles)
+    best: list[Coord] = []
+    for y in range(size):
+        for x in range(size):
+            if (x, y) in seen:
+                continue
+            seen.add((x, y))
+            component = [(x, y)]
+            queue = deque(component)
+            while queue:
+                cx, cy = queue.popleft()
+                for nxt in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                    if 0 <= nxt[0] < size and 0 <= nxt[1] < size and nxt not in seen:
+                        seen.add(nxt)
+                        component.append(nxt)
+                        queue.append(nxt)
+            if len(component) > len(best):
+                best = component
+    best.sort(key=lambda pos: (pos[1], pos[0]))
+    return best
+
+
+def random_scenario(
+    agent_count: int,
+    size: int = 48,
+    obstacle_density: float = 0.1,
+    seed: int = 0,
+) -> MultiAgentGridEnv:
+    """Open map with scattered obstacles and distinct random starts and goals."""
+    rng = random.Random(seed)
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    obstacles = set(rng.sample(cells, int(len(cells) * obstacle_density)))
+
+    # Keep everyone in the largest connected area so every goal is reachable.
+    component = _largest_component(size, obstacles)
+    if agent_count > len(component):
+        raise ValueError(f"{agent_count} agents do not fit on {len(component)} free tiles")
+    starts = rng.sample(component, agent_count)
+    goals = rng.sample(component, agent_count)
+    agents = {f"bot{i:03d}": (starts[i], goals[i]) for i in range(agent_count)}
+    return MultiAgentGridEnv(size, size, agents, obstacles)
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import deque
+from threading import Lock
+from typing import AbstractSet, Callable, Iterable, TypeVar
+
+from .obstacle_grid import ObstacleGrid
+from .types import Coord
+
+UNREACHABLE = 0x7FFFFFFF
+# 4M cells is 16 MB of int32; larger worlds (e.g. the 10000x10000 RuneLite
+# plane) are left to astar.
+DEFAULT_MAX_CELLS = 4_000_000
+
+T = TypeVar("T")
+
+
+class DistanceField:
+    """Step distance from every tile to one fixed target (4-connected grid).
+
+    Built with a single breadth-first expansion from the target into a flat
+    ``array('i')``. The next step from any tile is the neighbour with the
+    smaller entry, so following the field needs no search. Obstacle changes
+    are applied incrementally: only the region whose distances depended on a
+    new obstacle (or can shortcut through a removed one) is recomputed.
+    """
+
+    def __init__(
+        self,
+        target: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+    ) -> None:
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Grid size must be positive, got: {width}x{height}")
+        self.target = target
+        self.width = width
+        self.height = height
+        self.obstacles = frozenset(obstacles)
+        self.cells_updated = 0
+        # Bumped whenever ``dist`` changes, so readers can keep derived paths.
+        self.version = 0
+        self.dist = array("i", [UNREACHABLE]) * (width * height)
+        self._rebuild()
+
+    def _index(self, pos: Coord) -> int:
+        return pos[1] * self.width + pos[0]
+
+    def _in_bounds(self, pos: Coord) -> bool:
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def _neighbors(self, pos: Coord) -> Iterable[Coord]:
+        x, y = pos
+        for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nxt[0] < self.width and 0 <= nxt[1] < self.height:
+                yield nxt
+
+    def _rebuild(self) -> None:
+        dist = self.dist
+        for idx in range(len(dist)):
+            dist[idx] = UNREACHABLE
+        if not self._in_bounds(self.target) or self.target in self.obstacles:
+            return
+
+        width, height, obstacles = self.width, self.height, self.obstacles
+        dist[self._index(self.target)] = 0
+        queue: deque[Coord] = deque([self.target])
+        while queue:
+            current = queue.popleft()
+            x, y = current
+            step = dist[y * width + x] + 1
+            for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                nx, ny = nxt
+                if not (0 <= nx < width and 0 <= ny < height) or nxt in obstacles:
+                    continue
+                idx = ny * width + nx
+                if dist[idx] == UNREACHABLE:
+                    dist[idx] = step
+                    queue.append(nxt)
+        self.cells_updated += len(dist)
+
+    def distance(self, pos: Coord) -> int | None:
+        if not self._in_bounds(pos):
+            return None
+        value = self.dist[self._index(pos)]
+        return None if value == UNREACHABLE else value
+
+    def next_step(self, pos: Coord) -> Coord | None:
+        """Neighbour one step closer to the target; None at the target or if cut off."""
+        here = self.distance(pos)
+        if here is None or here == 0:
+            return None
+        for nxt in self._neighbors(pos):
+            if self.dist[self._index(nxt)] == here - 1:
+                return nxt
+        return None
+
+    def path_from(self, pos: Coord) -> list[Coord] | None:
+        if self.distance(pos) is None:
+            return None
+        path = [pos]
+        while path[-1] != self.target:
+            step = self.next_step(path[-1])
+            if step is None:
+                return None
+            path.append(step)
+        return path
+
+    def update_obstacles(self, obstacles: AbstractSet[Coord]) -> None:
+        new = frozenset(obstacles)
+        if new == self.obstacles:
+            self.obstacles = new
+            return
+        self.apply_delta(new - self.obstacles, self.obstacles - new)
+
+    def apply_delta(self, added: AbstractSet[Coord], removed: AbstractSet[Coord]) -> None:
+        """Repair the field for known changes without diffing whole obstacle sets."""
+        added = frozenset(added) - self.obstacles
+        removed = frozenset(removed) & self.obstacles
+        if not added and not removed:
+            return
+        self.obstacles = (self.obstacles | added) - removed
+        self.version += 1
+        if self.target in added or self.target in removed:
+            self._rebuild()
+            return
+        if added:
+            self._apply_added(added)
+        if removed:
+            self._apply_removed(removed)
+
+    def sync_from(self, grid: ObstacleGrid, version: int) -> int:
+        """Catch up with ``grid`` from ``version``; returns the version now matched."""
+        delta = grid.changes_since(version)
+        if delta.reset:
+            self.obstacles = grid.frozen()
+            self.version += 1
+            self._rebuild()
+        else:
+            self.apply_delta(delta.added, delta.removed)
+            # Same tiles; sharing the grid's set lets callers compare by identity.
+            self.obstacles = grid.frozen()
+        return delta.version
+
+    def _apply_added(self, added: AbstractSet[Coord]) -> None:
+        dist, obstacles = self.dist, self.obstacles
+
+        # Invalidate, in distance order, every tile that only had support
+        # through a blocked or invalidated tile.
+        heap: list[tuple[int, Coord]] = []
+        for pos in added:
+            if not self._in_bounds(pos):
+                continue
+            idx = self._index(pos)
+            if dist[idx] != UNREACHABLE:
+                heapq.heappush(heap, (dist[idx], pos))
+                dist[idx] = UNREACHABLE
+
+        orphaned: list[Coord] = []
+        while heap:
+            level, pos = heapq.heappop(heap)
+            for nxt in self._neighbors(pos):
+                idx = self._index(nxt)
+                if dist[idx] != level + 1 or nxt in obstacles:
+                    continue
+                supported = any(
+                    dist[self._index(other)] == level and other not in obstacles
+                    for other in self._neighbors(nxt)
+                )
+                if not supported:
+                    dist[idx] = UNREACHABLE
+                    orphaned.append(nxt)
+                    heapq.heappush(heap, (level + 1, nxt))
+
+        # Refill the orphaned region from its still-valid border.
+        seeds: list[tuple[int, Coord]] = []
+        for pos in orphaned:
+            best = min(
+                (dist[self._index(other)] for other in self._neighbors(pos) if other not in obstacles),
+                default=UNREACHABLE,
+            )
+            if best != UNREACHABLE:
+                seeds.append((best + 1, pos))
+        self._relax(seeds)
+        self.cells_updated += len(orphaned)
+
+    def _apply_removed(self, removed: AbstractSet[Coord]) -> None:
+        dist, obstacles = self.dist, self.obstacles
+        seeds: list[tuple[int, Coord]] = []
+        for pos in removed:
+            if not self._in_bounds(pos):
+                continue
+            best = min(
+                (dist[self._index(other)] for other in self._neighbors(pos) if other not in obstacles),
+                default=UNREACHABLE,
+            )
+            if best != UNREACHABLE:
+                seeds.append((best + 1, pos))
+        self._relax(seeds)
+
+    def _relax(self, seeds: list[tuple[int, Coord]]) -> None:
+        dist, obstacles = self.dist, self.obstacles
+        heap = list(seeds)
+        heapq.heapify(heap)
+        while heap:
+            level, pos = heapq.heappop(heap)
+            idx = self._index(pos)
+            if level >= dist[idx]:
+                continue
+            dist[idx] = level
+            self.cells_updated += 1
+            for nxt in self._neighbors(pos):
+                if nxt not in obstacles and level + 1 < dist[self._index(nxt)]:
+                    heapq.heappush(heap, (level + 1, nxt))
+
+
+class DistanceFieldCache:
+    """Distance fields shared by every session heading to the same target.
+
+    A field is keyed by ``(target, width, height)`` and brought up to date with
+    the caller's obstacles (patched in place) before each use. When those
+    obstacles are the current ``grid.frozen()`` of an ``ObstacleGrid`` the
+    field was last synced with, the repair reads ``grid.changes_since``
+    instead of diffing the two obstacle sets. ``read`` runs
+    the caller's query under the cache lock, so no session sees ``dist``
+    while another one is patching it; ``get`` hands the field out unguarded
+    and suits a single session. Sessions that see different obstacle sets
+    for the same target will keep patching the shared field, so share a
+    cache only between sessions on the same map.
+    """
+
+    def __init__(self, max_fields: int = 8, max_cells: int = DEFAULT_MAX_CELLS) -> None:
+        self.max_fields = max_fields
+        self.max_cells = max_cells
+        self._fields: dict[tuple[Coord, int, int], DistanceField] = {}
+        # Grid and version each field last matched, for delta repairs.
+        self._synced: dict[tuple[Coord, int, int], tuple[ObstacleGrid, int]] = {}
+        self._lock = Lock()
+
+    def get(
+        self,
+        target: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        grid: ObstacleGrid | None = None,
+    ) -> DistanceField | None:
+        """Field for ``target``, or None when the grid exceeds ``max_cells``."""
+        return self.read(target, width, height, obstacles, lambda field: field, grid)
+
+    def read(
+        self,
+        target: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        reader: Callable[[DistanceField], T],
+        grid: ObstacleGrid | None = None,
+    ) -> T | None:
+        """``reader(field)`` on the up-to-date field, under the lock; None when too large."""
+        if width * height > self.max_cells:
+            return None
+        key = (target, width, height)
+        # Deltas apply only while the caller's obstacles are the grid's current set.
+        live = grid if grid is not None and obstacles is grid.frozen() else None
+        with self._lock:
+            field = self._fields.pop(key, None)
+            synced = self._synced.pop(key, None)
+            if field is None:
+                field = DistanceField(target, width, height, obstacles)
+            elif obstacles is not field.obstacles:
+                if live is not None and synced is not None and synced[0] is live:
+                    field.sync_from(live, synced[1])
+                else:
+                    field.update_obstacles(obstacles)
+            if live is not None:
+                self._synced[key] = (live, live.version)
+            # Re-insert to keep the dict in least-recently-used order.
+            self._fields[key] = field
+            while len(self._fields) > self.max_fields:
+                evicted = next(iter(self._fields))
+                self._fields.pop(evicted)
+                self._synced.pop(evicted, None)
+            return reader(field)
+
+
+SHARED_DISTANCE_FIELDS = DistanceFieldCache()
@@ -3,14 +3,32 @@ from __future__ import annotations
 import json
 import time
 import random
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Callable
 
+from .budget import (
+    DEFER_LOG,
+    REUSE_PATH,
+    SKIP_DOUBLE_OBSERVE,
+    STALE_SKIP,
+    BudgetStats,
+    TickBudget,
+)
 from .fsm import FiniteStateMachine, TickContext
 from .interfaces import IActionRunner, IPerception
 from .safety import SafetyConfig, SafetyGuard
 from .states import build_default_states
-from .types import BotAction
+from .types import ActionResult, BotAction, Coord
+from .world_model import WorldView, chebyshev
+
+if TYPE_CHECKING:
+    from .collision_map import CollisionMap
+
+ENGINE_PROFILES = ("default", "turbo")
+# Fast-forwarded segments stop this many tiles (Chebyshev) short of a live NPC,
+# or len(risk_costs) when that is larger.
+MACRO_NPC_CLEARANCE = 2
 
 
 @dataclass
@@ -23,6 +41,70 @@ class EngineConfig:
     poll_interval_ms: int = 25
     poll_jitter_ms: int = 15
     double_observe: bool = True
+    # "turbo" is a headless simulation profile: one observation per tick, no
+    # per-tick log rows unless log_sample_every > 0 (write every Nth tick).
+    profile: str = "default"
+    log_sample_every: int = 0
+    # Game tick length in ms. When set, each tick degrades step by step
+    # (reuse cached path, skip double_observe, defer logging) to stay inside
+    # it, and skips acting once the tick is spent. Ignored by "turbo".
+    tick_budget_ms: float | None = None
+    # Node expansions per tick for the navigate state's incremental planner;
+    # None plans each route in full. plan_weight > 1 trades optimality for speed.
+    plan_max_expansions: int | None = None
+    plan_weight: float = 1.0
+    # Follow a distance field built from the (fixed) target instead of
+    # searching every tick; fields are shared across engines in the process.
+    use_distance_field: bool = False
+    # ALT heuristic for astar: landmarks per map, cached under landmark_dir by
+    # obstacle-map hash. 0 disables.
+    landmark_count: int = 0
+    landmark_dir: Path = Path("runs/landmarks")
+    # SQLite file of planned routes shared across runs; None disables.
+    route_cache_path: Path | None = None
+    # Waypoint/transport graph (JSON, see waypoints.load_waypoint_graph) that
+    # long trips are planned over before the grid; None disables.
+    waypoint_graph_path: Path | None = None
+    # Extra astar step cost by Chebyshev distance to a live NPC, e.g.
+    # (12, 8, 3, 1); empty plans on obstacles alone.
+    risk_costs: tuple[int, ...] = ()
+    # Learn blocked/walkable tiles from moves and position history, persisted
+    # under this directory and merged into observed obstacles; None disables.
+    collision_map_dir: Path | None = None
+    # Simulated runs only: walk up to this many ticks of the committed path in
+    # one step when nothing can interrupt it, logging one run-length row for
+    # them. 0 disables. Needs double_observe; not used with tick_budget_ms or
+    # collision_map_dir.
+    macro_step_max: int = 0
+
+    def __post_init__(self) -> None:
+        self.validate()
+
+    def validate(self) -> None:
+        """Reject feature combinations that would silently ignore one another."""
+        if self.risk_costs and self.use_distance_field:
+            raise ValueError("risk_costs cannot be combined with use_distance_field")
+        if self.risk_costs and self.route_cache_path is not None:
+            raise ValueError("risk_costs cannot be combined with route_cache_path")
+
+
+@dataclass
+class RunStats:
+    observations: int = 0
+    action_counts: dict[str, int] = field(default_factory=dict)
+    action_failures: int = 0
+    log_rows: int = 0
+    elapsed_s: float = 0.0
+    stale_skips: int = 0
+    budget: BudgetStats | None = None
+    fast_forwarded_ticks: int = 0
+
+    @property
+    def ticks_per_s(self) -> float:
+        total = sum(self.action_counts.values())
+        if self.elapsed_s <= 0:
+            return 0.0
+        return total / self.elapsed_s
 
 
 @dataclass
@@ -32,6 +114,7 @@ class RunResult:
     ticks: int
     final_state: str
     log_path: Path
+    stats: RunStats | None = None
 
 
 class BotEngine:
@@ -49,6 +132,14 @@ class BotEngine:
         self.safety = SafetyGuard(
             SafetyConfig(max_consecutive_failures=self.config.max_consecutive_failures)
         )
+        self.collisions: CollisionMap | None = None
+        if self.config.collision_map_dir is not None:
+            from .collision_map import CollisionMap, CollisionStore
+
+            self.collisions = CollisionMap(CollisionStore(self.config.collision_map_dir))
+        # Resources the engine opened itself (see default()); released by
+        # close() or on leaving a ``with`` block, never by run().
+        self._closeables: list[Callable[[], None]] = []
 
     @classmethod
     def default(
@@ -57,14 +148,248 @@ class BotEngine:
         runner: IActionRunner,
         config: EngineConfig | None = None,
     ) -> "BotEngine":
-        states = build_default_states()
+        resolved = config or EngineConfig()
+        resolved.validate()
+        # Feature modules (sqlite3, mmap, ...) are imported only when enabled,
+        # so a plain engine starts as fast as before they existed.
+        distance_fields = None
+        obstacle_grid = None
+        if resolved.use_distance_field:
+            from .distance_field import SHARED_DISTANCE_FIELDS
+
+            distance_fields = SHARED_DISTANCE_FIELDS
+            # Perceptions backed by an ObstacleGrid let fields repair from its deltas.
+            obstacle_grid = getattr(perception, "obstacle_grid", None)
+        landmarks = None
+        if resolved.landmark_count > 0:
+            from .landmarks import LandmarkStore
+
+            landmarks = LandmarkStore(resolved.landmark_dir, count=resolved.landmark_count)
+        route_cache = None
+        if resolved.route_cache_path is not None:
+            from .route_cache import RouteCache
+
+            route_cache = RouteCache(resolved.route_cache_path)
+        waypoints = None
+        if resolved.waypoint_graph_path is not None:
+            from .waypoints import load_waypoint_graph
+
+            waypoints = load_waypoint_graph(resolved.waypoint_graph_path)
+        risk_grid = None
+        if resolved.risk_costs:
+            from .risk_grid import RiskCostGrid
+
+            risk_grid = RiskCostGrid(resolved.risk_costs)
+        states = build_default_states(
+            plan_max_expansions=resolved.plan_max_expansions,
+            plan_weight=resolved.plan_weight,
+            distance_fields=distance_fields,
+            landmarks=landmarks,
+            route_cache=route_cache,
+            waypoints=waypoints,
+            risk_grid=risk_grid,
+            obstacle_grid=obstacle_grid,
+        )
         fsm = FiniteStateMachine(states=states, initial_state="idle")
-        return cls(perception=perception, runner=runner, fsm=fsm, config=config)
+        engine = cls(perception=perception, runner=runner, fsm=fsm, config=resolved)
+        if route_cache is not None:
+            engine._closeables.append(route_cache.close)
+        return engine
+
+    def close(self) -> None:
+        while self._closeables:
+            self._closeables.pop()()
+
+    def __enter__(self) -> "BotEngine":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _observe(self) -> WorldView:
+        world = self.perception.observe()
+        if self.collisions is None:
+            return world
+        merged = self.collisions.merge(world.obstacles)
+        if merged is world.obstacles:
+            return world
+        return replace(world, obstacles=merged)
+
+    def _macro_segment(self, ctx: TickContext, action: BotAction, limit: int) -> list[Coord] | None:
+        """Committed path ahead of the bot that nothing can interrupt, if any.
+
+        Only a navigate move along a full planned path qualifies (a partial
+        path from the bounded planner may still change). The segment stops
+        before obstacles and short of live NPCs.
+        """
+        limit = min(limit, self.config.macro_step_max)
+        if limit < 1 or action.kind != "move" or self.fsm.current_state != "navigate":
+            return None
+        world = ctx.world
+        path = ctx.blackboard.get("nav_path")
+        if not path or (path[-1] != world.target_pos and "nav_route" not in ctx.blackboard):
+            return None
+        try:
+            idx = path.index(world.bot_pos)
+        except ValueError:
+            return None
+
+        clearance = max(MACRO_NPC_CLEARANCE, len(self.config.risk_costs))
+        npcs = [npc.pos for npc in world.npcs.values() if npc.alive]
+        segment = [world.bot_pos]
+        for pos in path[idx + 1 : idx + 1 + limit]:
+            if pos in world.obstacles or any(chebyshev(pos, npc) <= clearance for npc in npcs):
+                break
+            segment.append(pos)
+        return segment if len(segment) >= 2 else None
+
+    def _fast_forward(self, ctx: TickContext, action: BotAction, processed_ticks: int) -> int:
+        """Walk the uninterruptible part of the path at once; returns ticks skipped.
+
+        On success ``ctx.world`` is the observation after the last skipped tick.
+        """
+        fast_forward = getattr(self.runner, "fast_forward", None)
+        # Without double_observe ctx.world still shows the bot before its move.
+        if fast_forward is None or self.collisions is not None or not self.config.double_observe:
+            return 0
+        segment = self._macro_segment(ctx, action, self.config.max_ticks - processed_ticks)
+        if segment is None:
+            return 0
+        steps = int(fast_forward(segment))
+        if steps:
+            ctx.world = replace(self._observe(), tick=processed_ticks + steps - 1)
+            self.safety.evaluate(ActionResult(success=True, message="fast_forward"), ctx)
+        return steps
+
+    def _macro_row(self, ctx: TickContext, first_tick: int, steps: int) -> dict[str, object]:
+        row = self._log_row(
+            ctx.world,
+            BotAction(kind="move", target=ctx.world.bot_pos),
+            ActionResult(success=True, message="fast_forward"),
+            ctx,
+        )
+        row["first_tick"] = first_tick
+        row["run_length"] = steps
+        return row
+
+    def _log_row(
+        self,
+        post_world: WorldView,
+        action: BotAction,
+        result: ActionResult,
+        ctx: TickContext,
+    ) -> dict[str, object]:
+        best_target = post_world.meta.get("best_target")
+        best_target_id = None
+        best_target_distance = None
+        best_target_name = None
+        if isinstance(best_target, dict):
+            best_target_id = best_target.get("id")
+            best_target_distance = best_target.get("distance")
+            best_target_name = best_target.get("name")
+
+        return {
+            "tick": post_world.tick,
+            "state": self.fsm.current_state,
+            "action": action.kind,
+            "target": action.target,
+            "action_success": result.success,
+            "action_message": result.message,
+            "bot_pos": list(post_world.bot_pos),
+            "target_pos": list(post_world.target_pos),
+            "task_complete": post_world.task_complete,
+            "nearby_scorpion_count": post_world.meta.get("nearby_scorpion_count", 0),
+            "nearest_scorpion_distance": post_world.meta.get("nearest_scorpion_distance"),
+            "risk_level": post_world.meta.get("risk_level", "none"),
+            "attack_recommendation": post_world.meta.get("attack_recommendation", "no_target"),
+            "can_attack_now": post_world.meta.get("can_attack_now", False),
+            "best_target_id": best_target_id,
+            "best_target_name": best_target_name,
+            "best_target_distance": best_target_distance,
+            "stop_reason": ctx.stop_reason,
+        }
+
+    def _step(
+        self, ctx: TickContext, tick: int | None, budget: TickBudget | None = None
+    ) -> tuple[BotAction, ActionResult, WorldView | None]:
+        """Decide on ``ctx.world`` and act on it: the tick both profiles share.
+
+        Returns the action, its result and, with ``double_observe``, the
+        world observed after acting (its tick replaced by ``tick`` when
+        given), else None. ``ctx.world`` is left at the post-action world.
+        """
+        world = ctx.world
+        saved: tuple[str, dict[str, object], str | None] | None = None
+        reuse_path = False
+        if budget is not None:
+            reuse_path = not budget.fits("decide", "act", "observe", "log")
+            if reuse_path:
+                budget.degrade(REUSE_PATH, "decide")
+            ctx.blackboard["reuse_path"] = reuse_path
+            # Planning may use what the rest of the tick does not need.
+            spare_ms = budget.remaining_ms() - budget.estimate_ms("act", "observe", "log")
+            ctx.blackboard["plan_deadline"] = budget.clock() + max(0.0, spare_ms) / 1000.0
+            ctx.blackboard["plan_clock"] = budget.clock
+            saved = (self.fsm.current_state, dict(ctx.blackboard), ctx.stop_reason)
+            budget.start_phase()
+        action = self.fsm.tick(ctx)
+        if budget is not None and not reuse_path:
+            budget.end_phase("decide")
+
+        if budget is not None and saved is not None and budget.remaining_ms() <= 0:
+            # The world has moved on; acting now would act on a stale
+            # tick. Undo the decision too, so e.g. recover attempts
+            # are not spent on actions that were never sent. States
+            # replace blackboard values rather than mutate them; the
+            # bounded search keeps its extra expansions, which stay
+            # valid for its goal and obstacles, and the risk grid's
+            # version tells navigation its restored path is stale.
+            self.fsm.current_state, blackboard, ctx.stop_reason = saved
+            ctx.blackboard.clear()
+            ctx.blackboard.update(blackboard)
+            action = BotAction("idle")
+            budget.degrade(STALE_SKIP)
+            result = ActionResult(success=True, message="skipped: stale tick")
+        else:
+            if budget is not None:
+                budget.start_phase()
+            result = self.runner.execute(action)
+            if budget is not None:
+                budget.end_phase("act")
+            self.safety.evaluate(result, ctx)
+            if self.collisions is not None:
+                self.collisions.observe(world, action, result)
+
+        double_observe = self.config.double_observe
+        if double_observe and budget is not None and not budget.fits("observe", "log"):
+            budget.degrade(SKIP_DOUBLE_OBSERVE, "observe")
+            double_observe = False
+
+        observed: WorldView | None = None
+        if double_observe:
+            if budget is not None:
+                budget.start_phase()
+            observed = self._observe()
+            if budget is not None:
+                budget.end_phase("observe")
+            if tick is not None:
+                observed = replace(observed, tick=tick)
+            ctx.world = observed
+        return action, result, observed
 
     def run(self) -> RunResult:
+        if self.config.profile not in ENGINE_PROFILES:
+            raise ValueError(f"Unknown engine profile: {self.config.profile}")
+        if self.config.profile == "turbo":
+            return self._run_turbo()
+        return self._run_default()
+
+    def _run_default(self) -> RunResult:
+        started = time.perf_counter()
+        stats = RunStats(observations=1)
         self.config.log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        initial_world = self.perception.observe()
+        initial_world = self._observe()
         ctx = TickContext(
             world=initial_world,
             max_retries=self.config.max_retries,
@@ -77,13 +402,28 @@ class BotEngine:
 
         processed_ticks = 0
 
+        budget: TickBudget | None = None
+        if self.config.tick_budget_ms is not None:
+            budget = TickBudget(tick_ms=self.config.tick_budget_ms)
+            stats.budget = budget.stats
+        deferred_rows: list[dict[str, object]] = []
+
         with self.config.log_path.open("w", encoding="utf-8") as logfile:
+
+            def flush_deferred() -> None:
+                for row in deferred_rows:
+                    logfile.write(json.dumps(row) + "\n")
+                deferred_rows.clear()
+
             while processed_ticks < self.config.max_ticks:
-                world = self.perception.observe()
+                world = self._observe()
+                stats.observations += 1
                 observed_tick = int(world.tick)
 
                 if self.config.require_tick_advance and source_tick is not None:
                     if observed_tick == source_tick:
+                        # Idle time between game ticks pays for deferred logging.
+                        flush_deferred()
                         sleep_ms = self.config.poll_interval_ms
                         if self.config.poll_jitter_ms > 0:
                             sleep_ms += random.uniform(
@@ -94,63 +434,52 @@ class BotEngine:
                         time.sleep(sleep_ms / 1000.0)
                         continue
 
-                if not self.config.require_tick_advance:
-                    world.tick = processed_ticks
+                if budget is not None:
+                    budget.begin_tick()
 
+                tick = None if self.config.require_tick_advance else processed_ticks
+                if tick is not None:
+                    world = replace(world, tick=tick)
                 ctx.world = world
 
-                action: BotAction = self.fsm.tick(ctx)
-                result = self.runner.execute(action)
-                self.safety.evaluate(result, ctx)
-
-                if self.config.double_observe:
-                    post_world = self.perception.observe()
-                    if not self.config.require_tick_advance:
-                        post_world.tick = processed_ticks
-                else:
-                    post_world = world
-
-                ctx.world = post_world
+                action, result, observed = self._step(ctx, tick, budget)
+                if budget is not None and STALE_SKIP in budget.applied:
+                    stats.stale_skips += 1
+                if observed is not None:
+                    stats.observations += 1
+                post_world = ctx.world
 
                 if self.config.require_tick_advance:
                     source_tick = observed_tick
 
-                best_target = post_world.meta.get("best_target")
-                best_target_id = None
-                best_target_distance = None
-                best_target_name = None
-                if isinstance(best_target, dict):
-                    best_target_id = best_target.get("id")
-                    best_target_distance = best_target.get("distance")
-                    best_target_name = best_target.get("name")
-
-                log_row = {
-                    "tick": post_world.tick,
-                    "state": self.fsm.current_state,
-                    "action": action.kind,
-                    "target": action.target,
-                    "action_success": result.success,
-                    "action_message": result.message,
-                    "bot_pos": list(post_world.bot_pos),
-                    "target_pos": list(post_world.target_pos),
-                    "task_complete": post_world.task_complete,
-                    "nearby_scorpion_count": post_world.meta.get("nearby_scorpion_count", 0),
-                    "nearest_scorpion_distance": post_world.meta.get(
-                        "nearest_scorpion_distance"
-                    ),
-                    "risk_level": post_world.meta.get("risk_level", "none"),
-                    "attack_recommendation": post_world.meta.get(
-                        "attack_recommendation", "no_target"
-                    ),
-                    "can_attack_now": post_world.meta.get("can_attack_now", False),
-                    "best_target_id": best_target_id,
-                    "best_target_name": best_target_name,
-                    "best_target_distance": best_target_distance,
-                    "stop_reason": ctx.stop_reason,
-                }
-                logfile.write(json.dumps(log_row) + "\n")
+                log_row = self._log_row(post_world, action, result, ctx)
+                if budget is None:
+                    logfile.write(json.dumps(log_row) + "\n")
+                else:
+                    defer = not budget.fits("log")
+                    if defer:
+                        budget.degrade(DEFER_LOG, "log")
+                    remaining_ms = budget.remaining_ms()
+                    log_row["budget_remaining_ms"] = round(remaining_ms, 3)
+                    log_row["overrun_ms"] = round(max(0.0, -remaining_ms), 3)
+                    log_row["degraded"] = list(budget.applied)
+                    if defer:
+                        deferred_rows.append(log_row)
+                    else:
+                        budget.start_phase()
+                        flush_deferred()
+                        logfile.write(json.dumps(log_row) + "\n")
+                        budget.end_phase("log")
+                    budget.end_tick()
 
                 processed_ticks += 1
+                stats.log_rows += 1
+                stats.action_counts[action.kind] = stats.action_counts.get(action.kind, 0) + 1
+                if not result.success:
+                    stats.action_failures += 1
+
+                if post_world.task_complete or ctx.stop_reason is not None:
+                    flush_deferred()
 
                 if post_world.task_complete:
                     return RunResult(
@@ -159,6 +488,7 @@ class BotEngine:
                         ticks=processed_ticks,
                         final_state=self.fsm.current_state,
                         log_path=self.config.log_path,
+                        stats=self._finish_stats(stats, started),
                     )
 
                 if ctx.stop_reason is not None:
@@ -168,12 +498,131 @@ class BotEngine:
                         ticks=processed_ticks,
                         final_state=self.fsm.current_state,
                         log_path=self.config.log_path,
+                        stats=self._finish_stats(stats, started),
                     )
 
+                if budget is None and not self.config.require_tick_advance:
+                    steps = self._fast_forward(ctx, action, processed_ticks)
+                    if steps:
+                        stats.observations += 1
+                        logfile.write(json.dumps(self._macro_row(ctx, processed_ticks, steps)) + "\n")
+                        processed_ticks += steps
+                        stats.log_rows += 1
+                        stats.fast_forwarded_ticks += steps
+                        stats.action_counts["move"] = stats.action_counts.get("move", 0) + steps
+
+            flush_deferred()
+
         return RunResult(
             success=False,
             reason="timeout",
             ticks=self.config.max_ticks,
             final_state=self.fsm.current_state,
             log_path=self.config.log_path,
+            stats=self._finish_stats(stats, started),
+        )
+
+    @staticmethod
+    def _finish_stats(stats: RunStats, started: float) -> RunStats:
+        stats.elapsed_s = time.perf_counter() - started
+        return stats
+
+    def _run_turbo(self) -> RunResult:
+        """Same decisions as run(), minus the per-tick bookkeeping.
+
+        The post-action observation doubles as the next tick's observation,
+        counters live in locals and log rows are only built for sampled ticks.
+        Only meaningful for simulated perception without tick gating.
+        """
+        config = self.config
+        if config.require_tick_advance:
+            raise ValueError("turbo profile does not support require_tick_advance")
+
+        started = time.perf_counter()
+        observe = self._observe
+        step = self._step
+        fsm = self.fsm
+        max_ticks = config.max_ticks
+        sample_every = config.log_sample_every
+
+        logfile: IO[str] | None = None
+        if sample_every > 0:
+            config.log_path.parent.mkdir(parents=True, exist_ok=True)
+            logfile = config.log_path.open("w", encoding="utf-8")
+
+        observations = 1
+        action_failures = 0
+        log_rows = 0
+        action_counts: dict[str, int] = {}
+        processed_ticks = 0
+        fast_forwarded = 0
+        reason = "timeout"
+        success = False
+
+        # The initial observation is reused as the first tick's observation.
+        next_world: WorldView | None = observe()
+        ctx = TickContext(world=next_world, max_retries=config.max_retries, blackboard={})
+        try:
+            while processed_ticks < max_ticks:
+                if next_world is None:
+                    world = observe()
+                    observations += 1
+                else:
+                    world = next_world
+                ctx.world = replace(world, tick=processed_ticks)
+
+                action, result, next_world = step(ctx, processed_ticks)
+                if next_world is not None:
+                    observations += 1
+                post_world = ctx.world
+
+                kind = action.kind
+                action_counts[kind] = action_counts.get(kind, 0) + 1
+                if not result.success:
+                    action_failures += 1
+                if logfile is not None and processed_ticks % sample_every == 0:
+                    row = self._log_row(post_world, action, result, ctx)
+                    logfile.write(json.dumps(row) + "\n")
+                    log_rows += 1
+
+                processed_ticks += 1
+
+                if post_world.task_complete:
+                    success, reason = True, "completed"
+                    break
+                if ctx.stop_reason is not None:
+                    reason = ctx.stop_reason
+                    break
+
+                steps = self._fast_forward(ctx, action, processed_ticks)
+                if steps:
+                    observations += 1
+                    next_world = ctx.world
+                    # Log the run if it covers a sampled tick.
+                    if logfile is not None and -processed_ticks % sample_every < steps:
+                        row = self._macro_row(ctx, processed_ticks, steps)
+                        logfile.write(json.dumps(row) + "\n")
+                        log_rows += 1
+                    processed_ticks += steps
+                    fast_forwarded += steps
+                    action_counts["move"] = action_counts.get("move", 0) + steps
+        finally:
+            if logfile is not None:
+                logfile.close()
+
+        stats = RunStats(
+            observations=observations,
+            action_counts=action_counts,
+            action_failures=action_failures,
+            log_rows=log_rows,
+            elapsed_s=time.perf_counter() - started,
+            fast_forwarded_ticks=fast_forwarded,
+        )
+        return RunResult(
+            success=success,
+            reason=reason,
+            ticks=processed_ticks if reason != "timeout" else max_ticks,
+            final_state=fsm.current_state,
+            log_path=config.log_path,
+            stats=stats,
         )
@@ -4,12 +4,12 @@ from dataclasses import dataclass, field
 from typing import Any, Protocol
 
 from .types import BotAction
-from .world_model import WorldModel
+from .world_model import WorldView
 
 
 @dataclass
 class TickContext:
-    world: WorldModel
+    world: WorldView
     max_retries: int
     blackboard: dict[str, Any] = field(default_factory=dict)
     stop_reason: str | None = None
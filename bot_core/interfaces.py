@@ -3,11 +3,11 @@ from __future__ import annotations
 from typing import Protocol
 
 from .types import ActionResult, BotAction
-from .world_model import WorldModel
+from .world_model import WorldView
 
 
 class IPerception(Protocol):
-    def observe(self) -> WorldModel:
+    def observe(self) -> WorldView:
         ...
 
 
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from typing import IO, Optional
+
+_STOP = object()
+
+
+class RotatingJsonlLog:
+    """Append-only JSONL log written by a background thread.
+
+    Callers only enqueue rows. The writer keeps one file handle open, counts
+    bytes in memory and rotates to ``<name>.1`` ... ``<name>.<backups>`` when
+    ``max_bytes`` is exceeded, so the per-row cost stays flat however long the
+    session runs.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int = 2_000_000,
+        backups: int = 3,
+        max_queue: int = 10_000,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.rotations = 0
+        self._queue: Queue[object] = Queue(maxsize=max_queue)
+        self._error_lock = Lock()
+        self._error: Optional[str] = None
+        self._handle: Optional[IO[str]] = None
+        self._size = 0
+        self._thread = Thread(target=self._run, name="jsonl-log", daemon=True)
+        self._thread.start()
+
+    def write(self, row: dict[str, object]) -> None:
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put_nowait({"ts": time.time(), **row})
+        except Full:
+            # Never block the caller on a stalled disk; count the loss instead.
+            self.rows_dropped += 1
+
+    def take_error(self) -> Optional[str]:
+        """Return the first write error since the last call, if any."""
+        with self._error_lock:
+            error, self._error = self._error, None
+            return error
+
+    def close(self, timeout_s: float = 2.0) -> None:
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout_s)
+            except Full:
+                return
+            self._thread.join(timeout=timeout_s)
+
+    def _set_error(self, exc: Exception) -> None:
+        with self._error_lock:
+            if self._error is None:
+                self._error = str(exc)
+
+    def _open(self) -> IO[str]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = self.path.open("a", encoding="utf-8")
+        self._size = handle.tell()
+        return handle
+
+    def _close_handle(self) -> None:
+        handle, self._handle = self._handle, None
+        if handle is not None:
+            try:
+                handle.close()
+            except OSError as exc:
+                self._set_error(exc)
+
+    def _rotate(self) -> None:
+        self._close_handle()
+
+        path = self.path
+        oldest = path.with_name(f"{path.name}.{self.backups}")
+        if oldest.exists():
+            oldest.unlink()
+        for idx in range(self.backups - 1, 0, -1):
+            src = path.with_name(f"{path.name}.{idx}")
+            if src.exists():
+                src.replace(path.with_name(f"{path.name}.{idx + 1}"))
+        if path.exists():
+            path.replace(path.with_name(f"{path.name}.1"))
+        self.rotations += 1
+
+    def _write_line(self, line: str) -> None:
+        if self._handle is None:
+            self._handle = self._open()
+        if self._size >= self.max_bytes:
+            self._rotate()
+            self._handle = self._open()
+        self._handle.write(line)
+        # Rows are dumped with ensure_ascii, so characters == bytes.
+        self._size += len(line)
+        self.rows_written += 1
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            # Drain whatever queued up meanwhile and flush once per batch.
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            stop = False
+            for row in batch:
+                if row is _STOP:
+                    stop = True
+                    continue
+                try:
+                    self._write_line(json.dumps(row, ensure_ascii=True) + "\n")
+                except Exception as exc:
+                    self._set_error(exc)
+                    self._close_handle()
+            try:
+                if self._handle is not None:
+                    self._handle.flush()
+            except Exception as exc:
+                self._set_error(exc)
+
+            if stop:
+                self._close_handle()
+                return
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from threading import Lock
+from typing import AbstractSet, Sequence
+
+from .distance_field import DEFAULT_MAX_CELLS, UNREACHABLE, DistanceField
+from .types import Coord
+
+_MAGIC = b"ALT1"
+# magic, width, height, landmark count, typecode, padding
+_HEADER = struct.Struct("<4sIIIc3x")
+_UNREACHABLE_BY_TYPE = {"H": 0xFFFF, "I": 0xFFFFFFFF}
+
+
+def obstacle_map_hash(width: int, height: int, obstacles: AbstractSet[Coord]) -> str:
+    digest = hashlib.sha256(f"{width}x{height}".encode("ascii"))
+    for x, y in sorted(obstacles):
+        digest.update(struct.pack("<ii", x, y))
+    return digest.hexdigest()[:32]
+
+
+class LandmarkTable:
+    """Per-landmark step distances for the ALT (A*, landmarks, triangle
+    inequality) heuristic.
+
+    ``lower_bound(a, b)`` is ``max_L |d(L, b) - d(L, a)|``, which never
+    overestimates on the map the table was built for, or on that map with
+    obstacles added. Tables are uint16 when the map allows, uint32 otherwise,
+    and can be backed by a read-only memory map of the cache file.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        landmarks: Sequence[Coord],
+        tables: Sequence[Sequence[int]],
+        unreachable: int,
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.landmarks = list(landmarks)
+        self.tables = list(tables)
+        self.unreachable = unreachable
+        self._mmap: mmap.mmap | None = None
+
+    def lower_bound(self, a: Coord, b: Coord) -> int:
+        width, height, unreachable = self.width, self.height, self.unreachable
+        if not (0 <= a[0] < width and 0 <= a[1] < height) or not (
+            0 <= b[0] < width and 0 <= b[1] < height
+        ):
+            # Off the map: no table entry, so no bound beyond 0.
+            return 0
+        ia = a[1] * width + a[0]
+        ib = b[1] * width + b[0]
+        best = 0
+        for table in self.tables:
+            da = table[ia]
+            db = table[ib]
+            if da == unreachable or db == unreachable:
+                continue
+            diff = da - db if da > db else db - da
+            if diff > best:
+                best = diff
+        return best
+
+    def save(self, path: Path) -> None:
+        typecode = "H" if self.unreachable == _UNREACHABLE_BY_TYPE["H"] else "I"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as handle:
+            handle.write(
+                _HEADER.pack(_MAGIC, self.width, self.height, len(self.landmarks), typecode.encode())
+            )
+            coords = array("i")
+            for x, y in self.landmarks:
+                coords.extend((x, y))
+            handle.write(coords.tobytes())
+            for table in self.tables:
+                handle.write(array(typecode, table).tobytes())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> LandmarkTable:
+        with path.open("rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, width, height, count, raw_type = _HEADER.unpack_from(mapped, 0)
+        typecode = raw_type.decode("ascii")
+        if magic != _MAGIC or typecode not in _UNREACHABLE_BY_TYPE:
+            mapped.close()
+            raise ValueError(f"Not a landmark file: {path}")
+        cells = width * height
+        itemsize = array(typecode).itemsize
+        if len(mapped) != _HEADER.size + 8 * count + count * cells * itemsize:
+            mapped.close()
+            raise ValueError(f"Truncated landmark file: {path}")
+        view = memoryview(mapped)
+        offset = _HEADER.size
+        coords = view[offset : offset + 8 * count].cast("i")
+        landmarks = [(coords[2 * i], coords[2 * i + 1]) for i in range(count)]
+        offset += 8 * count
+        tables = []
+        for _ in range(count):
+            tables.append(view[offset : offset + cells * itemsize].cast(typecode))
+            offset += cells * itemsize
+        table = cls(width, height, landmarks, tables, _UNREACHABLE_BY_TYPE[typecode])
+        table._mmap = mapped
+        return table
+
+
+def build_landmarks(
+    width: int,
+    height: int,
+    obstacles: AbstractSet[Coord],
+    count: int = 8,
+) -> LandmarkTable:
+    """Pick ``count`` landmarks by farthest-point selection and BFS from each."""
+    if count <= 0:
+        raise ValueError(f"count must be > 0, got: {count}")
+    blocked = frozenset(obstacles)
+    seed = next(
+        ((x, y) for y in range(height) for x in range(width) if (x, y) not in blocked),
+        None,
+    )
+    if seed is None:
+        return LandmarkTable(width, height, [], [], _UNREACHABLE_BY_TYPE["H"])
+
+    # Farthest point from an arbitrary tile is a good first landmark (on the
+    # map's periphery); each next one maximises the distance to those chosen.
+    fields: list[DistanceField] = []
+    nearest = DistanceField(seed, width, height, blocked).dist
+    for _ in range(count):
+        best_idx, best_value = -1, -1
+        for idx, value in enumerate(nearest):
+            if value != UNREACHABLE and value > best_value:
+                best_idx, best_value = idx, value
+        if best_value <= 0 and fields:
+            break
+        landmark = (best_idx % width, best_idx // width)
+        field = DistanceField(landmark, width, height, blocked)
+        fields.append(field)
+        nearest = field.dist if len(fields) == 1 else array("i", map(min, nearest, field.dist))
+
+    longest = max((value for f in fields for value in f.dist if value != UNREACHABLE), default=0)
+    typecode = "H" if longest < _UNREACHABLE_BY_TYPE["H"] else "I"
+    unreachable = _UNREACHABLE_BY_TYPE[typecode]
+    tables = [
+        array(typecode, (unreachable if value == UNREACHABLE else value for value in f.dist))
+        for f in fields
+    ]
+    return LandmarkTable(width, height, [f.target for f in fields], tables, unreachable)
+
+
+class LandmarkStore:
+    """Landmark tables cached on disk by obstacle-map hash.
+
+    The last table is kept in memory and reused while obstacles are only
+    added (the bound stays admissible); any removal looks up or builds the
+    table for the new map.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        count: int = 8,
+        max_cells: int = DEFAULT_MAX_CELLS,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.count = count
+        self.max_cells = max_cells
+        self.builds = 0
+        self._lock = Lock()
+        self._current: tuple[int, int, frozenset[Coord], LandmarkTable] | None = None
+        self._seen: AbstractSet[Coord] | None = None
+
+    def path_for(self, width: int, height: int, obstacles: AbstractSet[Coord]) -> Path:
+        key = obstacle_map_hash(width, height, obstacles)
+        return self.cache_dir / f"alt_{key}_k{self.count}.bin"
+
+    def get(
+        self, width: int, height: int, obstacles: AbstractSet[Coord]
+    ) -> LandmarkTable | None:
+        if width * height > self.max_cells:
+            return None
+        with self._lock:
+            current = self._current
+            if current is not None and current[:2] == (width, height):
+                built_for = current[2]
+                seen = isinstance(obstacles, frozenset) and obstacles is self._seen
+                if seen or built_for <= obstacles:
+                    self._seen = obstacles
+                    return current[3]
+
+            blocked = frozenset(obstacles)
+            path = self.path_for(width, height, blocked)
+            table: LandmarkTable | None = None
+            if path.exists():
+                try:
+                    table = LandmarkTable.load(path)
+                except (OSError, ValueError):
+                    table = None
+            if table is None:
+                table = build_landmarks(width, height, blocked, self.count)
+                self.builds += 1
+                try:
+                    table.save(path)
+                except OSError:
+                    # The cache is an optimisation; an unwritable dir only costs startup time.
+                    pass
+            self._current = (width, height, blocked, table)
+            self._seen = obstacles
+            return table
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Callable, Optional
+
+from .interfaces import IActionRunner, IPerception
+from .jsonl_log import RotatingJsonlLog
+from .types import BotAction
+from .world_model import WorldModel
+
+_MAX_PENDING_LOG_LINES = 200
+
+
+@dataclass(frozen=True)
+class LiveSettings:
+    max_ticks: int = 120
+    unlimited_ticks: bool = True
+    verbose_ui_log: bool = False
+    detail_file_log: bool = True
+
+
+@dataclass(frozen=True)
+class LiveFrame:
+    """Ready-to-render state handed from the worker to the UI thread."""
+
+    world: Optional[WorldModel]
+    tick_count: int
+    logs: tuple[str, ...] = ()
+    stop_reason: Optional[str] = None
+    coalesced: int = 0
+
+
+class LiveTelemetryWorker:
+    """Waits on live telemetry, decides, writes logs and publishes LiveFrames.
+
+    Runs on a plain thread. ``on_frame`` is called (from that thread) only when
+    a frame becomes pending; the GUI bridges it to a queued Qt signal and pulls
+    the frame with ``take_frame``. If the UI has not taken the previous frame
+    yet, the new one replaces it and their log lines are merged, so a slow UI
+    never queues stale frames.
+    """
+
+    def __init__(
+        self,
+        perception: IPerception,
+        runner: Optional[IActionRunner],
+        on_frame: Callable[[], None],
+        detail_log_path: Path,
+        detail_log_max_bytes: int = 2_000_000,
+        detail_log_backups: int = 3,
+        summary_every_ticks: int = 20,
+        observe_timeout_s: float = 0.25,
+    ) -> None:
+        self.perception = perception
+        self.runner = runner
+        self.detail_log = RotatingJsonlLog(
+            detail_log_path, max_bytes=detail_log_max_bytes, backups=detail_log_backups
+        )
+        self.summary_every_ticks = summary_every_ticks
+        self.observe_timeout_s = observe_timeout_s
+        self.on_frame = on_frame
+        self.settings = LiveSettings()
+
+        self.tick_count = 0
+        self._last_tick: Optional[int] = None
+        self._last_attack_tick: Optional[int] = None
+        self._last_summary_tick: Optional[int] = None
+        self._last_recommendation: Optional[str] = None
+        self._last_wait_log_time = 0.0
+        self._detail_log_error_reported = False
+
+        self._frame_lock = Lock()
+        self._pending: Optional[LiveFrame] = None
+        self._running = False
+        self._step_requested = False
+        self._restart_requested = False
+        self._wake = Event()
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="live-telemetry", daemon=True)
+        self._thread.start()
+
+    def start_running(self, settings: LiveSettings) -> None:
+        self.settings = settings
+        self._restart_requested = True
+        self._running = True
+        self._wake.set()
+
+    def pause(self) -> None:
+        self._running = False
+
+    def step_once(self, settings: LiveSettings) -> None:
+        self.settings = settings
+        self._step_requested = True
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=self.observe_timeout_s + 1.0)
+        self.detail_log.close()
+
+    def take_frame(self) -> Optional[LiveFrame]:
+        with self._frame_lock:
+            frame = self._pending
+            self._pending = None
+            return frame
+
+    def _publish(
+        self,
+        world: Optional[WorldModel],
+        logs: list[str],
+        stop_reason: Optional[str] = None,
+    ) -> None:
+        with self._frame_lock:
+            previous = self._pending
+            coalesced = 0
+            if previous is not None:
+                logs = [*previous.logs, *logs]
+                world = world if world is not None else previous.world
+                stop_reason = stop_reason or previous.stop_reason
+                coalesced = previous.coalesced + 1
+            if len(logs) > _MAX_PENDING_LOG_LINES:
+                dropped = len(logs) - _MAX_PENDING_LOG_LINES + 1
+                logs = [f"... {dropped} log satırı atlandı", *logs[dropped:]]
+            self._pending = LiveFrame(
+                world=world,
+                tick_count=self.tick_count,
+                logs=tuple(logs),
+                stop_reason=stop_reason,
+                coalesced=coalesced,
+            )
+        if previous is None:
+            self.on_frame()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if not self._running and not self._step_requested:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            if self._restart_requested:
+                self._restart_requested = False
+                self._last_tick = None
+                self._last_attack_tick = None
+                self._last_summary_tick = None
+                self._last_recommendation = None
+                self._last_wait_log_time = 0.0
+            # A manual step shows the latest snapshot instead of waiting for a new one.
+            wait_for_new = self._running
+            self._step_requested = False
+            try:
+                self._step(wait_for_new)
+            except Exception as exc:
+                self._running = False
+                self._publish(None, [], stop_reason=f"Canlı tick error: {exc}")
+
+    def _observe(self, wait_for_new: bool) -> WorldModel:
+        observe_next = getattr(self.perception, "observe_next", None)
+        if wait_for_new and callable(observe_next):
+            world = observe_next(self.observe_timeout_s)
+            if world is None:
+                raise RuntimeError("Timed out waiting for RuneLite telemetry.")
+            return world
+        world = self.perception.observe()
+        if wait_for_new and world.tick == self._last_tick:
+            # Perceptions without change notification: poll at the old UI rate.
+            self._stop.wait(0.1)
+        return world
+
+    def _step(self, wait_for_new: bool) -> None:
+        settings = self.settings
+        if not settings.unlimited_ticks and self.tick_count >= settings.max_ticks:
+            self._running = False
+            self._publish(None, [], stop_reason="Max tick reached!")
+            return
+
+        try:
+            world = self._observe(wait_for_new)
+        except Exception as exc:
+            now = time.monotonic()
+            if now - self._last_wait_log_time >= 5.0:
+                self._last_wait_log_time = now
+                self._publish(None, [f"Canlı veri bekleniyor: {exc}"])
+            return
+
+        logs: list[str] = []
+        if self._last_tick != world.tick:
+            self._last_tick = world.tick
+            self.tick_count += 1
+            self._process_new_tick(world, settings, logs)
+        self._publish(world, logs)
+
+    def _process_new_tick(
+        self, world: WorldModel, settings: LiveSettings, logs: list[str]
+    ) -> None:
+        recommendation = str(world.meta.get("attack_recommendation", "no_target"))
+        nearest_distance = world.meta.get("nearest_scorpion_distance")
+
+        auto_attack_message = None
+        if (
+            self._running
+            and self.runner
+            and recommendation == "attack_now"
+            and self._last_attack_tick != world.tick
+        ):
+            self._last_attack_tick = world.tick
+            result = self.runner.execute(BotAction(kind="attack"))
+            auto_attack_message = result.message
+            logs.append(f"[live-action] attack -> {result.message}")
+
+        if self._should_emit_summary(int(world.tick), recommendation, settings):
+            self._last_summary_tick = int(world.tick)
+            logs.append(
+                "[live] "
+                f"tick={world.tick} "
+                f"player={world.bot_pos} "
+                f"npc_count={world.meta.get('nearby_scorpion_count', 0)} "
+                f"nearest={nearest_distance} "
+                f"rec={recommendation}"
+            )
+
+        self._last_recommendation = recommendation
+
+        best_target_id = None
+        best_target = world.meta.get("best_target")
+        if isinstance(best_target, dict):
+            best_target_id = best_target.get("id")
+
+        self.write_detail_log(
+            {
+                "tick": world.tick,
+                "processed_live_ticks": self.tick_count,
+                "player_pos": list(world.bot_pos),
+                "npc_count": world.meta.get("nearby_scorpion_count", 0),
+                "nearest_scorpion_distance": nearest_distance,
+                "risk_level": world.meta.get("risk_level", "none"),
+                "attack_recommendation": recommendation,
+                "can_attack_now": bool(world.meta.get("can_attack_now", False)),
+                "best_target_id": best_target_id,
+                "auto_attack_result": auto_attack_message,
+            },
+            settings,
+            logs,
+        )
+
+    def _should_emit_summary(
+        self, tick: int, recommendation: str, settings: LiveSettings
+    ) -> bool:
+        if settings.verbose_ui_log:
+            return True
+        if self._last_summary_tick is None:
+            return True
+        if recommendation != self._last_recommendation:
+            return True
+        return tick - self._last_summary_tick >= self.summary_every_ticks
+
+    def write_detail_log(
+        self, row: dict[str, object], settings: LiveSettings, logs: list[str]
+    ) -> None:
+        """Queue a row for the detail log; safe to call from any thread."""
+        if not settings.detail_file_log:
+            return
+
+        error = self.detail_log.take_error()
+        if error is None:
+            self._detail_log_error_reported = False
+        elif not self._detail_log_error_reported:
+            logs.append(f"Canlı detay log yazılamadı: {error}")
+            self._detail_log_error_reported = True
+        self.detail_log.write(row)
@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from http.client import HTTPConnection
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Iterator
+from urllib import error, parse, request
+
+from .adapters.runelite_http import (
+    NDJSON_CONTENT_TYPE,
+    STREAM_PATH,
+    RuneLiteTelemetryServer,
+)
+from .adapters.telemetry_binary import (
+    BINARY_CONTENT_TYPE,
+    NpcRecord,
+    TelemetryFrame,
+    encode_frame,
+)
+
+LOADGEN_KEY = "loadgen_key"
+# Binary frames have no room for a key, so the tick carries it instead.
+_BINARY_TICK_STRIDE = 1_000_000
+
+
+@dataclass(frozen=True)
+class LoadGenConfig:
+    url: str | None = None
+    clients: int = 4
+    rate_hz: float = 10.0
+    duration_s: float = 5.0
+    npc_count: int = 20
+    request_timeout_s: float = 1.0
+    replay_path: Path | None = None
+    seed: int = 0
+    wire_format: str = "json"
+
+
+@dataclass
+class LoadGenReport:
+    sent: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    errors: int = 0
+    observed: int = 0
+    elapsed_s: float = 0.0
+    payload_bytes: int = 0
+    tracks_e2e: bool = False
+    http_latencies_ms: list[float] = field(default_factory=list)
+    e2e_latencies_ms: list[float] = field(default_factory=list)
+
+    @property
+    def throughput_per_s(self) -> float:
+        if self.elapsed_s <= 0:
+            return 0.0
+        return self.accepted / self.elapsed_s
+
+    @property
+    def coalesced(self) -> int | None:
+        if not self.tracks_e2e:
+            return None
+        return max(0, self.accepted - self.observed)
+
+    def summary(self) -> dict[str, object]:
+        return {
+            "sent": self.sent,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "observed": self.observed,
+            "coalesced": self.coalesced,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput_per_s": round(self.throughput_per_s, 1),
+            "avg_payload_bytes": (
+                round(self.payload_bytes / self.sent, 1) if self.sent else 0.0
+            ),
+            "http_latency_ms": _percentiles(self.http_latencies_ms),
+            "e2e_latency_ms": _percentiles(self.e2e_latencies_ms),
+        }
+
+
+def _percentiles(samples: list[float]) -> dict[str, float] | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        idx = min(len(ordered) - 1, int(q * len(ordered)))
+        return round(ordered[idx], 3)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)}
+
+
+def synthesize_snapshot(
+    tick: int,
+    npc_count: int,
+    rng: random.Random,
+    origin: tuple[int, int] = (3200, 3200),
+) -> dict[str, object]:
+    px = origin[0] + rng.randint(-5, 5)
+    py = origin[1] + rng.randint(-5, 5)
+    scorpions: list[dict[str, object]] = []
+    for idx in range(npc_count):
+        nx = px + rng.randint(-15, 15)
+        ny = py + rng.randint(-15, 15)
+        scorpions.append(
+            {
+                "id": 3000 + idx,
+                "name": "Scorpion",
+                "pos": [nx, ny],
+                "distance": max(abs(nx - px), abs(ny - py)),
+            }
+        )
+    return {
+        "tick": tick,
+        "player_pos": [px, py],
+        "plane": 0,
+        "animation": -1,
+        "pose_animation": 808,
+        "health_ratio": 30,
+        "health_scale": 30,
+        "nearby_scorpions": scorpions,
+    }
+
+
+def load_replay(path: Path) -> list[dict[str, object]]:
+    payloads: list[dict[str, object]] = []
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if isinstance(row, dict) and "player_pos" in row:
+                payloads.append(row)
+    if not payloads:
+        raise ValueError(f"No TickSnapshot payloads found in replay file: {path}")
+    return payloads
+
+
+class _Collector:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.report = LoadGenReport()
+        self.pending: dict[str, float] = {}
+
+    def record_send(self, key: str, sent_at: float, size: int) -> None:
+        with self._lock:
+            self.report.sent += 1
+            self.report.payload_bytes += size
+            self.pending[key] = sent_at
+
+    def record_response(self, status: int | None, latency_ms: float) -> None:
+        with self._lock:
+            if status is None:
+                self.report.errors += 1
+            elif 200 <= status < 300:
+                self.report.accepted += 1
+                self.report.http_latencies_ms.append(latency_ms)
+            elif 400 <= status < 500:
+                self.report.rejected += 1
+            else:
+                self.report.errors += 1
+
+    def record_stream(self, status: int | None, lines: int) -> None:
+        with self._lock:
+            if status is not None and 200 <= status < 300:
+                self.report.accepted += lines
+            elif status is not None and 400 <= status < 500:
+                self.report.rejected += lines
+            else:
+                self.report.errors += lines
+
+    def record_observed(self, key: str, seen_at: float) -> None:
+        with self._lock:
+            sent_at = self.pending.pop(key, None)
+            if sent_at is None:
+                return
+            self.report.observed += 1
+            self.report.e2e_latencies_ms.append((seen_at - sent_at) * 1000.0)
+
+
+def _to_frame(payload: dict[str, object], tick: int) -> TelemetryFrame:
+    player_pos = payload["player_pos"]
+    assert isinstance(player_pos, list)
+    records: list[NpcRecord] = []
+    scorpions = payload.get("nearby_scorpions", [])
+    assert isinstance(scorpions, list)
+    for idx, npc in enumerate(scorpions):
+        pos = npc["pos"]
+        records.append(
+            NpcRecord(idx, int(npc["id"]), str(npc["name"]), pos[0], pos[1], int(npc["distance"]))
+        )
+    return TelemetryFrame(
+        tick=tick,
+        player_pos=(int(player_pos[0]), int(player_pos[1])),
+        npcs=tuple(records),
+    )
+
+
+def _post(url: str, body: bytes, content_type: str, timeout_s: float) -> int | None:
+    req = request.Request(
+        url=url,
+        data=body,
+        headers={"Content-Type": content_type},
+        method="POST",
+    )
+    try:
+        with request.urlopen(req, timeout=timeout_s) as response:
+            return int(response.status)
+    except error.HTTPError as exc:
+        return int(exc.code)
+    except Exception:
+        return None
+
+
+def _client_loop(
+    client_idx: int,
+    url: str,
+    config: LoadGenConfig,
+    replay: list[dict[str, object]] | None,
+    collector: _Collector,
+    deadline: float,
+) -> None:
+    rng = random.Random(config.seed * 1_000_003 + client_idx)
+    interval_s = 1.0 / config.rate_hz if config.rate_hz > 0 else 0.0
+    next_send = time.perf_counter()
+    seq = 0
+
+    while True:
+        now = time.perf_counter()
+        if now >= deadline:
+            return
+        if interval_s > 0 and now < next_send:
+            time.sleep(min(next_send - now, deadline - now))
+            continue
+
+        if replay is not None:
+            payload = dict(replay[seq % len(replay)])
+        else:
+            payload = synthesize_snapshot(seq, config.npc_count, rng)
+        if config.wire_format == "binary":
+            tick = client_idx * _BINARY_TICK_STRIDE + seq
+            key = str(tick)
+            body = encode_frame(_to_frame(payload, tick))
+            content_type = BINARY_CONTENT_TYPE
+        else:
+            key = f"{client_idx}:{seq}"
+            payload[LOADGEN_KEY] = key
+            body = json.dumps(payload).encode("utf-8")
+            content_type = "application/json"
+
+        sent_at = time.perf_counter()
+        collector.record_send(key, sent_at, len(body))
+        status = _post(url, body, content_type, config.request_timeout_s)
+        collector.record_response(status, (time.perf_counter() - sent_at) * 1000.0)
+
+        seq += 1
+        next_send += interval_s
+
+
+def _stream_client_loop(
+    client_idx: int,
+    url: str,
+    config: LoadGenConfig,
+    replay: list[dict[str, object]] | None,
+    collector: _Collector,
+    deadline: float,
+) -> None:
+    """Sends every snapshot as one NDJSON line on a single chunked POST."""
+    rng = random.Random(config.seed * 1_000_003 + client_idx)
+    interval_s = 1.0 / config.rate_hz if config.rate_hz > 0 else 0.0
+    lines = 0
+
+    def body() -> Iterator[bytes]:
+        nonlocal lines
+        next_send = time.perf_counter()
+        seq = 0
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            if interval_s > 0 and now < next_send:
+                time.sleep(min(next_send - now, deadline - now))
+                continue
+            if replay is not None:
+                payload = dict(replay[seq % len(replay)])
+            else:
+                payload = synthesize_snapshot(seq, config.npc_count, rng)
+            key = f"{client_idx}:{seq}"
+            payload[LOADGEN_KEY] = key
+            line = json.dumps(payload).encode("utf-8") + b"\n"
+            collector.record_send(key, time.perf_counter(), len(line))
+            lines += 1
+            yield line
+            seq += 1
+            next_send += interval_s
+
+    parsed = parse.urlsplit(url)
+    conn = HTTPConnection(
+        parsed.hostname or "127.0.0.1",
+        parsed.port or 80,
+        timeout=config.request_timeout_s + config.duration_s,
+    )
+    status: int | None = None
+    try:
+        conn.request(
+            "POST",
+            STREAM_PATH,
+            body=body(),
+            headers={"Content-Type": NDJSON_CONTENT_TYPE},
+            encode_chunked=True,
+        )
+        status = conn.getresponse().status
+    except Exception:
+        status = None
+    finally:
+        conn.close()
+    collector.record_stream(status, lines)
+
+
+def _observer_loop(
+    server: RuneLiteTelemetryServer, collector: _Collector, stop: Event
+) -> None:
+    version = server.store.version
+    while not stop.is_set():
+        update = server.store.wait_for_newer(version, timeout_s=0.05)
+        if update is None:
+            continue
+        version, payload = update
+        if isinstance(payload, TelemetryFrame):
+            collector.record_observed(str(payload.tick), time.perf_counter())
+            continue
+        key = payload.get(LOADGEN_KEY)
+        if isinstance(key, str):
+            collector.record_observed(key, time.perf_counter())
+
+
+def run_load(config: LoadGenConfig) -> LoadGenReport:
+    if config.clients < 1:
+        raise ValueError(f"clients must be >= 1, got: {config.clients}")
+    if config.wire_format not in {"json", "binary", "stream"}:
+        raise ValueError(f"Unknown wire_format: {config.wire_format}")
+
+    replay = load_replay(config.replay_path) if config.replay_path else None
+
+    server: RuneLiteTelemetryServer | None = None
+    url = config.url
+    if url is None:
+        server = RuneLiteTelemetryServer(host="127.0.0.1", port=0)
+        url = f"http://127.0.0.1:{server.port}/tick"
+
+    collector = _Collector()
+    stop = Event()
+    observer: Thread | None = None
+    if server is not None:
+        observer = Thread(target=_observer_loop, args=(server, collector, stop), daemon=True)
+        observer.start()
+        collector.report.tracks_e2e = True
+
+    started = time.perf_counter()
+    deadline = started + config.duration_s
+    client_loop = _stream_client_loop if config.wire_format == "stream" else _client_loop
+    clients = [
+        Thread(
+            target=client_loop,
+            args=(idx, url, config, replay, collector, deadline),
+            daemon=True,
+        )
+        for idx in range(config.clients)
+    ]
+    try:
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        collector.report.elapsed_s = time.perf_counter() - started
+        # Give the observer a moment to see the last accepted payload.
+        time.sleep(0.05)
+    finally:
+        stop.set()
+        if observer is not None:
+            observer.join(timeout=1.0)
+        if server is not None:
+            server.stop()
+
+    return collector.report
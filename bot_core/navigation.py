@@ -1,17 +1,30 @@
 from __future__ import annotations
 
 import heapq
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AbstractSet, Callable, Mapping
 
 from .types import Coord
 
+if TYPE_CHECKING:
+    from .landmarks import LandmarkTable
+
 
 def astar(
     start: Coord,
     goal: Coord,
     width: int,
     height: int,
-    obstacles: set[Coord],
+    obstacles: AbstractSet[Coord],
+    landmarks: LandmarkTable | None = None,
+    tile_cost: Mapping[Coord, int] | None = None,
 ) -> list[Coord] | None:
+    """Shortest 4-connected path, or None.
+
+    Each step costs 1 plus ``tile_cost`` of the tile entered (sparse, >= 0),
+    so the heuristics stay admissible with weighted tiles.
+    """
     if start == goal:
         return [start]
 
@@ -27,7 +40,10 @@ def astar(
         return [n for n in candidates if walkable(n)]
 
     def h(a: Coord, b: Coord) -> int:
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        manhattan = abs(a[0] - b[0]) + abs(a[1] - b[1])
+        if landmarks is None:
+            return manhattan
+        return max(manhattan, landmarks.lower_bound(a, b))
 
     frontier: list[tuple[int, Coord]] = []
     heapq.heappush(frontier, (0, start))
@@ -48,6 +64,8 @@ def astar(
 
         for nxt in neighbors(current):
             tentative = g_score[current] + 1
+            if tile_cost is not None:
+                tentative += tile_cost.get(nxt, 0)
             if tentative < g_score.get(nxt, 10**9):
                 came_from[nxt] = current
                 g_score[nxt] = tentative
@@ -55,3 +73,152 @@ def astar(
                 heapq.heappush(frontier, (f_score, nxt))
 
     return None
+
+
+@dataclass
+class PlanResult:
+    path: list[Coord] | None
+    complete: bool
+    expansions: int
+
+
+class BoundedAStar:
+    """Weighted A* that can stop after a budget and resume on a later call.
+
+    The search tree is kept between calls, so a long route is planned a slice
+    at a time. While the goal is not reached yet, ``plan`` returns the path to
+    the discovered node closest to the goal (by heuristic). The tree is rooted
+    at the first start; later starts only need to lie on the tree, which they
+    do while the bot follows the returned paths. A world change needs a new
+    instance (see ``valid_for``).
+    """
+
+    def __init__(
+        self,
+        start: Coord,
+        goal: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        weight: float = 1.0,
+        tile_cost: Mapping[Coord, int] | None = None,
+        landmarks: LandmarkTable | None = None,
+    ) -> None:
+        if weight < 1.0:
+            raise ValueError(f"weight must be >= 1.0, got: {weight}")
+        self.start = start
+        self.goal = goal
+        self.width = width
+        self.height = height
+        self.obstacles = frozenset(obstacles)
+        self.weight = weight
+        # Extra step costs as in astar; read live, so callers restart the
+        # search when the mapping changes.
+        self.tile_cost = tile_cost
+        self.landmarks = landmarks
+        self.expansions = 0
+        self.came_from: dict[Coord, Coord | None] = {start: None}
+        self._g: dict[Coord, int] = {start: 0}
+        self._closed: set[Coord] = set()
+        self._frontier: list[tuple[float, int, Coord]] = [(self._h(start) * weight, 0, start)]
+        self._best = start
+        self._best_key = (self._h(start), 0)
+        self.complete = start == goal
+        self.exhausted = False
+
+    def _h(self, node: Coord) -> int:
+        manhattan = abs(node[0] - self.goal[0]) + abs(node[1] - self.goal[1])
+        if self.landmarks is None:
+            return manhattan
+        return max(manhattan, self.landmarks.lower_bound(node, self.goal))
+
+    def valid_for(
+        self, goal: Coord, width: int, height: int, obstacles: AbstractSet[Coord]
+    ) -> bool:
+        if (goal, width, height) != (self.goal, self.width, self.height):
+            return False
+        return obstacles is self.obstacles or obstacles == self.obstacles
+
+    def search(
+        self,
+        max_expansions: int | None = None,
+        deadline: float | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> bool:
+        """Expand until the goal, the budget or the frontier runs out.
+
+        ``deadline`` is a ``clock()`` value. Returns ``complete``.
+        """
+        if self.complete or self.exhausted:
+            return self.complete
+        width, height = self.width, self.height
+        obstacles = self.obstacles
+        goal, weight, tile_cost = self.goal, self.weight, self.tile_cost
+        frontier, g_score, closed, came_from = self._frontier, self._g, self._closed, self.came_from
+        done = 0
+        while frontier:
+            if max_expansions is not None and done >= max_expansions:
+                return False
+            if deadline is not None and done % 32 == 0 and done and clock() >= deadline:
+                return False
+            _, _, current = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            closed.add(current)
+            done += 1
+            self.expansions += 1
+            if current == goal:
+                self.complete = True
+                return True
+
+            x, y = current
+            step = g_score[current] + 1
+            for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if not (0 <= nxt[0] < width and 0 <= nxt[1] < height) or nxt in obstacles:
+                    continue
+                tentative = step if tile_cost is None else step + tile_cost.get(nxt, 0)
+                if tentative < g_score.get(nxt, 10**9):
+                    came_from[nxt] = current
+                    g_score[nxt] = tentative
+                    h = self._h(nxt)
+                    heapq.heappush(frontier, (tentative + weight * h, -tentative, nxt))
+                    key = (h, tentative)
+                    if key < self._best_key:
+                        self._best, self._best_key = nxt, key
+
+        self.exhausted = True
+        return False
+
+    def plan(
+        self,
+        start: Coord,
+        max_expansions: int | None = None,
+        deadline: float | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> PlanResult:
+        before = self.expansions
+        complete = self.search(max_expansions=max_expansions, deadline=deadline, clock=clock)
+        if self.exhausted or start not in self.came_from:
+            return PlanResult(path=None, complete=False, expansions=self.expansions - before)
+        path = self._tree_path(start, self.goal if complete else self._best)
+        return PlanResult(path=path, complete=complete, expansions=self.expansions - before)
+
+    def _tree_path(self, src: Coord, dst: Coord) -> list[Coord]:
+        # Moves are reversible on the grid, so src -> common ancestor -> dst
+        # is a valid walk through the search tree.
+        up: list[Coord] = []
+        seen: dict[Coord, int] = {}
+        cursor: Coord | None = src
+        while cursor is not None:
+            seen[cursor] = len(up)
+            up.append(cursor)
+            cursor = self.came_from[cursor]
+
+        down: list[Coord] = []
+        cursor = dst
+        while cursor is not None and cursor not in seen:
+            down.append(cursor)
+            cursor = self.came_from[cursor]
+        assert cursor is not None
+        down.reverse()
+        return up[: seen[cursor] + 1] + down
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+from .types import Coord
+
+
+@dataclass(frozen=True)
+class ObstacleDelta:
+    """Obstacle changes between two versions.
+
+    ``reset`` means the history no longer reaches ``since``; callers must
+    rebuild from the current set instead of applying ``added``/``removed``.
+    """
+
+    since: int
+    version: int
+    added: frozenset[Coord] = frozenset()
+    removed: frozenset[Coord] = frozenset()
+    reset: bool = False
+
+    @property
+    def dirty(self) -> frozenset[Coord]:
+        return self.added | self.removed
+
+
+@dataclass
+class _Change:
+    version: int
+    pos: Coord
+    added: bool
+
+
+class ObstacleGrid:
+    """Obstacle set that records which tiles changed at which version.
+
+    Wraps (and mutates) the caller's set so existing readers keep working.
+    Every effective ``add``/``remove`` bumps ``version``; ``changes_since``
+    folds the retained history into one delta (distance fields repair from
+    it). Code that edits the wrapped set directly must call ``sync()``, which
+    diffs it against the last known state.
+    """
+
+    def __init__(self, obstacles: set[Coord] | None = None, history: int = 4096) -> None:
+        self.obstacles: set[Coord] = obstacles if obstacles is not None else set()
+        self.version = 0
+        self._history: deque[_Change] = deque(maxlen=history)
+        # Shadow copy kept in step by apply() so sync() can spot direct edits;
+        # the frozen view is rebuilt lazily, only when asked for.
+        self._shadow = set(self.obstacles)
+        self._frozen: frozenset[Coord] | None = None
+
+    def __contains__(self, pos: object) -> bool:
+        return pos in self.obstacles
+
+    def __iter__(self) -> Iterator[Coord]:
+        return iter(self.obstacles)
+
+    def __len__(self) -> int:
+        return len(self.obstacles)
+
+    def frozen(self) -> frozenset[Coord]:
+        """Current obstacles; the same object until the next change."""
+        if self._frozen is None:
+            self._frozen = frozenset(self.obstacles)
+        return self._frozen
+
+    def add(self, pos: Coord) -> bool:
+        return bool(self.apply(added=(pos,)).dirty)
+
+    def remove(self, pos: Coord) -> bool:
+        return bool(self.apply(removed=(pos,)).dirty)
+
+    def apply(
+        self, added: Iterable[Coord] = (), removed: Iterable[Coord] = ()
+    ) -> ObstacleDelta:
+        """Apply a batch of changes as one version bump (none if nothing changed)."""
+        since = self.version
+        new_added = frozenset(pos for pos in added if pos not in self.obstacles)
+        new_removed = frozenset(pos for pos in removed if pos in self.obstacles) - new_added
+        if not new_added and not new_removed:
+            return ObstacleDelta(since=since, version=since)
+        self.obstacles.update(new_added)
+        self.obstacles.difference_update(new_removed)
+        self._shadow.update(new_added)
+        self._shadow.difference_update(new_removed)
+        return self._record(since, new_added, new_removed)
+
+    def replace(self, obstacles: Iterable[Coord]) -> ObstacleDelta:
+        target = frozenset(obstacles)
+        return self.apply(added=target - self.obstacles, removed=self.obstacles - target)
+
+    def sync(self) -> ObstacleDelta:
+        """Record edits made to the wrapped set behind this object's back."""
+        since = self.version
+        added = frozenset(self.obstacles - self._shadow)
+        removed = frozenset(self._shadow - self.obstacles)
+        if not added and not removed:
+            return ObstacleDelta(since=since, version=since)
+        self._shadow = set(self.obstacles)
+        return self._record(since, added, removed)
+
+    def _record(
+        self, since: int, added: frozenset[Coord], removed: frozenset[Coord]
+    ) -> ObstacleDelta:
+        self.version += 1
+        for pos in added:
+            self._history.append(_Change(self.version, pos, True))
+        for pos in removed:
+            self._history.append(_Change(self.version, pos, False))
+        self._frozen = None
+        return ObstacleDelta(since=since, version=self.version, added=added, removed=removed)
+
+    def changes_since(self, version: int) -> ObstacleDelta:
+        if version >= self.version:
+            return ObstacleDelta(since=version, version=self.version)
+        oldest = self._history[0].version if self._history else self.version + 1
+        # A full deque may have dropped part of the oldest retained version.
+        complete_from = oldest if len(self._history) < (self._history.maxlen or 0) else oldest + 1
+        if version + 1 < complete_from:
+            return ObstacleDelta(since=version, version=self.version, reset=True)
+
+        # Net effect per tile: the first change after ``version`` tells what
+        # the tile was before (an add means it was free); compare with now.
+        before: dict[Coord, bool] = {}
+        for change in self._history:
+            if change.version > version and change.pos not in before:
+                before[change.pos] = not change.added
+        known = self.obstacles
+        added = frozenset(pos for pos, was in before.items() if not was and pos in known)
+        removed = frozenset(pos for pos, was in before.items() if was and pos not in known)
+        return ObstacleDelta(since=version, version=self.version, added=added, removed=removed)
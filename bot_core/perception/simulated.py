@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from ..simulator.grid_world import GridWorldEnv
-from ..world_model import WorldModel
+from ..world_model import WorldView
 
 
 class SimulatedPerception:
     def __init__(self, env: GridWorldEnv) -> None:
         self.env = env
+        self.obstacle_grid = env.obstacle_grid
 
-    def observe(self) -> WorldModel:
+    def observe(self) -> WorldView:
         return self.env.snapshot()
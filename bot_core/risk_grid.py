@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+from .types import Coord
+from .world_model import Npc
+
+# Extra step cost by Chebyshev distance to an NPC: the tiers follow the
+# perception's risk levels (high <= 1, medium <= 3).
+DEFAULT_RISK_COSTS: tuple[int, ...] = (12, 8, 3, 1)
+
+
+class RiskCostGrid:
+    """Sparse per-tile extra cost raised around live NPCs.
+
+    ``update`` diffs the NPC table against the previous call and only
+    re-stamps the square around NPCs that appeared, moved or left, so the
+    per-tick cost is proportional to NPC movement, not map size. Costs from
+    overlapping NPCs add up; ``extra`` maps tile -> added cost for ``astar``.
+    """
+
+    def __init__(self, costs: Sequence[int] = DEFAULT_RISK_COSTS) -> None:
+        if any(cost < 0 for cost in costs):
+            raise ValueError(f"Risk costs must be >= 0, got: {list(costs)}")
+        self.costs = tuple(costs)
+        self.radius = len(self.costs) - 1
+        self.extra: dict[Coord, int] = {}
+        self.tiles_touched = 0
+        # Bumped whenever ``extra`` changes.
+        self.version = 0
+        self._positions: dict[str, Coord] = {}
+        self._last_npcs: Mapping[str, Npc] | None = None
+
+    def cost(self, pos: Coord) -> int:
+        return 1 + self.extra.get(pos, 0)
+
+    def _stamp(self, center: Coord, sign: int) -> None:
+        costs, radius, extra = self.costs, self.radius, self.extra
+        cx, cy = center
+        for dy in range(-radius, radius + 1):
+            for dx in range(-radius, radius + 1):
+                amount = costs[max(abs(dx), abs(dy))]
+                if amount == 0:
+                    continue
+                pos = (cx + dx, cy + dy)
+                value = extra.get(pos, 0) + sign * amount
+                if value:
+                    extra[pos] = value
+                else:
+                    del extra[pos]
+        self.tiles_touched += (2 * radius + 1) ** 2
+
+    def update(self, npcs: Mapping[str, Npc]) -> int:
+        """Apply NPC changes since the last call; returns the squares re-stamped."""
+        # Snapshots share one NPC table until an NPC changes.
+        if not self.costs or npcs is self._last_npcs:
+            return 0
+        self._last_npcs = npcs
+        current = {npc_id: npc.pos for npc_id, npc in npcs.items() if npc.alive}
+        changed = 0
+        for npc_id, pos in self._positions.items():
+            if current.get(npc_id) != pos:
+                self._stamp(pos, -1)
+                changed += 1
+        for npc_id, pos in current.items():
+            if self._positions.get(npc_id) != pos:
+                self._stamp(pos, 1)
+                changed += 1
+        self._positions = current
+        if changed:
+            self.version += 1
+        return changed
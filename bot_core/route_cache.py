@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import AbstractSet, Callable, Sequence
+
+from .landmarks import obstacle_map_hash
+from .types import Coord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS routes (
+    map_hash TEXT NOT NULL,
+    sx INTEGER NOT NULL,
+    sy INTEGER NOT NULL,
+    gx INTEGER NOT NULL,
+    gy INTEGER NOT NULL,
+    path BLOB NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (map_hash, sx, sy, gx, gy)
+)
+"""
+
+RouteKey = tuple[str, Coord, Coord]
+
+
+def _pack(path: Sequence[Coord]) -> bytes:
+    flat = array("i")
+    for x, y in path:
+        flat.extend((x, y))
+    return flat.tobytes()
+
+
+def _unpack(blob: bytes) -> list[Coord]:
+    flat = array("i")
+    flat.frombytes(blob)
+    return [(flat[i], flat[i + 1]) for i in range(0, len(flat), 2)]
+
+
+def path_is_valid(
+    path: Sequence[Coord],
+    start: Coord,
+    goal: Coord,
+    width: int,
+    height: int,
+    obstacles: AbstractSet[Coord],
+) -> bool:
+    """Cheap check that ``path`` is a walkable 4-connected start-to-goal route."""
+    if not path or path[0] != start or path[-1] != goal:
+        return False
+    prev = None
+    for pos in path:
+        x, y = pos
+        if not (0 <= x < width and 0 <= y < height) or pos in obstacles:
+            return False
+        if prev is not None and abs(x - prev[0]) + abs(y - prev[1]) != 1:
+            return False
+        prev = pos
+    return True
+
+
+class RouteCache:
+    """Planned routes keyed by obstacle-map hash and endpoints.
+
+    Lookups go through a bounded in-memory LRU, then a SQLite file shared by
+    every process using the same ``db_path``. Every hit is re-validated
+    against the caller's grid before it is returned, so a stale or damaged
+    entry costs one replan, never a bad move.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        max_entries: int = 256,
+        max_disk_entries: int = 10_000,
+    ) -> None:
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[RouteKey, list[Coord]] = OrderedDict()
+        self._lock = Lock()
+        self._hash_for: tuple[frozenset[Coord], int, int, str] | None = None
+        # Memory hits since the last write; their disk last_used is refreshed
+        # before eviction so hot routes are not the first to go.
+        self._touched: dict[RouteKey, float] = {}
+        self.closed = False
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self._flush_touched()
+            self._db.close()
+            self.closed = True
+
+    def _map_hash(self, width: int, height: int, obstacles: AbstractSet[Coord]) -> str:
+        # Hashing the whole obstacle set is O(n log n); snapshots share one
+        # frozenset until obstacles change, so remember the last one.
+        cached = self._hash_for
+        if cached is not None and cached[0] is obstacles and cached[1:3] == (width, height):
+            return cached[3]
+        map_hash = obstacle_map_hash(width, height, obstacles)
+        if isinstance(obstacles, frozenset):
+            self._hash_for = (obstacles, width, height, map_hash)
+        return map_hash
+
+    def find_path(
+        self,
+        start: Coord,
+        goal: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        planner: Callable[[], list[Coord] | None],
+    ) -> list[Coord] | None:
+        """Cached route, or ``planner()``'s result (stored when not None)."""
+        path = self.lookup(start, goal, width, height, obstacles)
+        if path is not None:
+            return path
+        path = planner()
+        if path is not None:
+            self.store(start, goal, width, height, obstacles, path)
+        return path
+
+    def lookup(
+        self,
+        start: Coord,
+        goal: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+    ) -> list[Coord] | None:
+        """Cached route still valid on this grid; counts a hit or a miss."""
+        with self._lock:
+            key = (self._map_hash(width, height, obstacles), start, goal)
+            path = self._lookup(key)
+            if path is not None and path_is_valid(path, start, goal, width, height, obstacles):
+                self.hits += 1
+                return path
+            if path is not None:
+                self._forget(key)
+            self.misses += 1
+            return None
+
+    def store(
+        self,
+        start: Coord,
+        goal: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        path: list[Coord],
+    ) -> None:
+        with self._lock:
+            self._store((self._map_hash(width, height, obstacles), start, goal), path)
+
+    def _lookup(self, key: RouteKey) -> list[Coord] | None:
+        path = self._memory.get(key)
+        if path is not None:
+            self._memory.move_to_end(key)
+            self._touched[key] = time.time()
+            return path
+
+        map_hash, (sx, sy), (gx, gy) = key
+        row = self._db.execute(
+            "SELECT path FROM routes WHERE map_hash=? AND sx=? AND sy=? AND gx=? AND gy=?",
+            (map_hash, sx, sy, gx, gy),
+        ).fetchone()
+        if row is None:
+            return None
+        self._db.execute(
+            "UPDATE routes SET last_used=? WHERE map_hash=? AND sx=? AND sy=? AND gx=? AND gy=?",
+            (time.time(), map_hash, sx, sy, gx, gy),
+        )
+        path = _unpack(row[0])
+        self._remember(key, path)
+        return path
+
+    def _remember(self, key: RouteKey, path: list[Coord]) -> None:
+        self._memory[key] = path
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self) -> None:
+        if not self._touched:
+            return
+        self._db.executemany(
+            "UPDATE routes SET last_used=? WHERE map_hash=? AND sx=? AND sy=? AND gx=? AND gy=?",
+            [
+                (used, map_hash, sx, sy, gx, gy)
+                for (map_hash, (sx, sy), (gx, gy)), used in self._touched.items()
+            ],
+        )
+        self._touched.clear()
+
+    def _forget(self, key: RouteKey) -> None:
+        self._memory.pop(key, None)
+        self._touched.pop(key, None)
+        map_hash, (sx, sy), (gx, gy) = key
+        self._db.execute(
+            "DELETE FROM routes WHERE map_hash=? AND sx=? AND sy=? AND gx=? AND gy=?",
+            (map_hash, sx, sy, gx, gy),
+        )
+
+    def _store(self, key: RouteKey, path: list[Coord]) -> None:
+        self._remember(key, path)
+        map_hash, (sx, sy), (gx, gy) = key
+        self._db.execute(
+            "INSERT OR REPLACE INTO routes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (map_hash, sx, sy, gx, gy, _pack(path), time.time()),
+        )
+        self._touched.pop(key, None)
+        self._flush_touched()
+        self._db.execute(
+            "DELETE FROM routes WHERE rowid IN ("
+            "SELECT rowid FROM routes ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,),
+        )
@@ -3,25 +3,11 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
-
-from .actions.simulated import SimulatedActionRunner
-from .adapters.real_stub import (
-    RealActionRunnerStub,
-    RealClientBridgeStub,
-    RealPerceptionStub,
-    RealStubWorldConfig,
-)
-from .adapters.runelite_http import (
-    RuneLiteHttpActionRunner,
-    RuneLiteHttpAdapterConfig,
-    RuneLiteNoopActionRunner,
-    RuneLitePerception,
-)
-from .engine import EngineConfig
+
+from .adapters.registry import get_adapter_factory, is_registered
+from .adapters.runelite_config import RuneLiteHttpAdapterConfig
+from .engine import ENGINE_PROFILES, EngineConfig
 from .interfaces import IActionRunner, IPerception
-from .perception.simulated import SimulatedPerception
-from .simulator.grid_world import GridWorldEnv
 from .types import Coord
 
 
@@ -46,7 +32,7 @@ class WorldConfig:
 
 @dataclass(frozen=True)
 class AppConfig:
-    adapter_mode: Literal["sim", "real_stub", "runelite_http"]
+    adapter_mode: str
     engine: EngineConfig
     sim_world: WorldConfig
     real_stub_world: WorldConfig
@@ -65,7 +51,56 @@ def load_app_config(path: Path) -> AppConfig:
         require_tick_advance=bool(engine_raw.get("require_tick_advance", False)),
         poll_interval_ms=int(engine_raw.get("poll_interval_ms", 25)),
         double_observe=bool(engine_raw.get("double_observe", True)),
+        profile=str(engine_raw.get("profile", "default")),
+        log_sample_every=int(engine_raw.get("log_sample_every", 0)),
+        tick_budget_ms=(
+            float(engine_raw["tick_budget_ms"])
+            if engine_raw.get("tick_budget_ms") is not None
+            else None
+        ),
+        plan_max_expansions=(
+            int(engine_raw["plan_max_expansions"])
+            if engine_raw.get("plan_max_expansions") is not None
+            else None
+        ),
+        plan_weight=float(engine_raw.get("plan_weight", 1.0)),
+        use_distance_field=bool(engine_raw.get("use_distance_field", False)),
+        landmark_count=int(engine_raw.get("landmark_count", 0)),
+        landmark_dir=Path(engine_raw.get("landmark_dir", "runs/landmarks")),
+        route_cache_path=(
+            Path(engine_raw["route_cache_path"])
+            if engine_raw.get("route_cache_path")
+            else None
+        ),
+        risk_costs=tuple(int(v) for v in engine_raw.get("risk_costs", [])),
+        collision_map_dir=(
+            Path(engine_raw["collision_map_dir"])
+            if engine_raw.get("collision_map_dir")
+            else None
+        ),
+        waypoint_graph_path=(
+            Path(engine_raw["waypoint_graph_path"])
+            if engine_raw.get("waypoint_graph_path")
+            else None
+        ),
+        macro_step_max=int(engine_raw.get("macro_step_max", 0)),
     )
+    if engine.profile not in ENGINE_PROFILES:
+        raise ValueError(f"Unknown engine.profile: {engine.profile}")
+    if engine.tick_budget_ms is not None and engine.tick_budget_ms <= 0:
+        raise ValueError(f"engine.tick_budget_ms must be > 0, got: {engine.tick_budget_ms}")
+    if engine.plan_max_expansions is not None and engine.plan_max_expansions <= 0:
+        raise ValueError(
+            f"engine.plan_max_expansions must be > 0, got: {engine.plan_max_expansions}"
+        )
+    if engine.landmark_count < 0:
+        raise ValueError(f"engine.landmark_count must be >= 0, got: {engine.landmark_count}")
+    if any(cost < 0 for cost in engine.risk_costs):
+        raise ValueError(f"engine.risk_costs must be >= 0, got: {list(engine.risk_costs)}")
+    if engine.macro_step_max < 0:
+        raise ValueError(f"engine.macro_step_max must be >= 0, got: {engine.macro_step_max}")
+    if engine.plan_weight < 1.0:
+        raise ValueError(f"engine.plan_weight must be >= 1.0, got: {engine.plan_weight}")
 
     sim_raw = raw.get("sim_world", {})
     sim_world = WorldConfig(
@@ -106,10 +141,17 @@ def load_app_config(path: Path) -> AppConfig:
             if rl_raw.get("action_auth_token") is not None
             else None
         ),
+        transport=str(rl_raw.get("transport", "http")),
+        shm_path=(
+            str(rl_raw.get("shm_path")) if rl_raw.get("shm_path") is not None else None
+        ),
+        shm_poll_interval_ms=float(rl_raw.get("shm_poll_interval_ms", 2.0)),
     )
+    if runelite_http.transport not in {"http", "shm"}:
+        raise ValueError(f"Unknown runelite_http.transport: {runelite_http.transport}")
 
     mode = raw.get("adapter_mode", "sim")
-    if mode not in {"sim", "real_stub", "runelite_http"}:
+    if not isinstance(mode, str) or not is_registered(mode):
         raise ValueError(f"Unknown adapter_mode: {mode}")
 
     return AppConfig(
@@ -122,35 +164,4 @@ def load_app_config(path: Path) -> AppConfig:
 
 
 def build_adapters(config: AppConfig) -> tuple[IPerception, IActionRunner]:
-    if config.adapter_mode == "sim":
-        env = GridWorldEnv(
-            width=config.sim_world.width,
-            height=config.sim_world.height,
-            bot_pos=config.sim_world.bot_pos,
-            target_pos=config.sim_world.target_pos,
-            obstacles=config.sim_world.obstacles,
-        )
-        return SimulatedPerception(env), SimulatedActionRunner(env)
-
-    if config.adapter_mode == "real_stub":
-        bridge = RealClientBridgeStub(
-            RealStubWorldConfig(
-                width=config.real_stub_world.width,
-                height=config.real_stub_world.height,
-                bot_pos=config.real_stub_world.bot_pos,
-                target_pos=config.real_stub_world.target_pos,
-                obstacles=config.real_stub_world.obstacles,
-            )
-        )
-        return RealPerceptionStub(bridge), RealActionRunnerStub(bridge)
-
-    perception = RuneLitePerception(config.runelite_http)
-    if config.runelite_http.enable_action_runner and config.runelite_http.action_url:
-        runner = RuneLiteHttpActionRunner(
-            action_url=config.runelite_http.action_url,
-            timeout_s=config.runelite_http.action_timeout_s,
-            auth_token=config.runelite_http.action_auth_token,
-        )
-        return perception, runner
-
-    return perception, RuneLiteNoopActionRunner()
+    return get_adapter_factory(config.adapter_mode)(config)
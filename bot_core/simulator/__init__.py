@@ -1,3 +1,5 @@
+from .batch_world import BatchGridWorld
 from .grid_world import GridWorldEnv
+from .multi_agent import MultiAgentGridEnv
 
-__all__ = ["GridWorldEnv"]
+__all__ = ["BatchGridWorld", "GridWorldEnv", "MultiAgentGridEnv"]
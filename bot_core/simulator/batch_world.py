@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from array import array
+from typing import Sequence
+
+from ..types import Coord
+
+# Action codes shared with bot_core.batch_policy.
+ACT_IDLE = 0
+ACT_MOVE = 1
+ACT_INTERACT = 2
+ACTION_KINDS = ("idle", "move", "interact")
+
+
+class BatchGridWorld:
+    """N independent single-bot grid worlds on one map, stored as arrays.
+
+    Bot ``i`` has its own position, target and completion flag; moves and
+    interactions follow ``GridWorldEnv.step`` rules, applied to the whole
+    batch at once.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        starts: Sequence[Coord],
+        targets: Sequence[Coord],
+        obstacles: set[Coord] | None = None,
+    ) -> None:
+        if len(starts) != len(targets):
+            raise ValueError(f"Got {len(starts)} starts but {len(targets)} targets")
+        self.width = width
+        self.height = height
+        self.obstacles = frozenset(obstacles or ())
+        self.x = array("i", (pos[0] for pos in starts))
+        self.y = array("i", (pos[1] for pos in starts))
+        self.target_x = array("i", (pos[0] for pos in targets))
+        self.target_y = array("i", (pos[1] for pos in targets))
+        self.complete = array("b", bytes(len(starts)))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def bot_pos(self, idx: int) -> Coord:
+        return self.x[idx], self.y[idx]
+
+    def step(
+        self,
+        kinds: Sequence[int],
+        target_x: Sequence[int],
+        target_y: Sequence[int],
+        active: Sequence[int],
+    ) -> array:
+        """Apply action ``i`` to bot ``i`` for every ``i`` in ``active``; returns success flags."""
+        width, height, obstacles = self.width, self.height, self.obstacles
+        xs, ys, complete = self.x, self.y, self.complete
+        success = array("b", bytes(len(xs)))
+        for idx in active:
+            kind = kinds[idx]
+            if complete[idx] or kind == ACT_IDLE:
+                success[idx] = 1
+            elif kind == ACT_MOVE:
+                nx, ny = target_x[idx], target_y[idx]
+                if (
+                    abs(nx - xs[idx]) + abs(ny - ys[idx]) == 1
+                    and 0 <= nx < width
+                    and 0 <= ny < height
+                    and (nx, ny) not in obstacles
+                ):
+                    xs[idx], ys[idx] = nx, ny
+                    success[idx] = 1
+            elif kind == ACT_INTERACT:
+                if xs[idx] == self.target_x[idx] and ys[idx] == self.target_y[idx]:
+                    complete[idx] = 1
+                    success[idx] = 1
+        return success
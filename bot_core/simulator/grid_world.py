@@ -1,9 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Mapping, Sequence
 
+from ..obstacle_grid import ObstacleGrid
 from ..types import ActionResult, BotAction, Coord
-from ..world_model import Npc, NpcType, WorldModel
+from ..world_model import FrozenWorldModel, Npc, NpcSpatialIndex, NpcType, manhattan
+from .npc_dynamics import NpcBehavior, NpcDynamics
 
 
 @dataclass
@@ -15,6 +19,13 @@ class GridWorldState:
     obstacles: set[Coord] = field(default_factory=set)
     task_complete: bool = False
     npcs: dict[str, Npc] = field(default_factory=dict)
+    # Doors, stairs, teleports: entrance tile -> reachable exit tiles.
+    transports: dict[Coord, set[Coord]] = field(default_factory=dict)
+    # Extra bots by id, used by the multi-agent simulator.
+    agents: dict[str, Coord] = field(default_factory=dict)
+    # Lowered by NPC attacks when NPC dynamics are enabled; snapshots report
+    # it as meta["bot_hp"].
+    bot_hp: int = 99
 
 
 class GridWorldEnv:
@@ -31,8 +42,51 @@ class GridWorldEnv:
             height=height,
             bot_pos=bot_pos,
             target_pos=target_pos,
-            obstacles=obstacles or set(),
+            obstacles=set(obstacles or ()),
         )
+        self.npc_index = NpcSpatialIndex(metric="manhattan")
+        # Records which tiles changed so caches can repair just those.
+        self.obstacle_grid = ObstacleGrid(self.state.obstacles)
+        # Snapshot sharing: tables are frozen lazily and reused until a mutator
+        # below invalidates them. Code that edits `state` directly must call
+        # `invalidate_snapshot()`.
+        self._version = 0
+        self._obstacles_version = 0
+        self._npcs_version = 0
+        self._frozen_obstacles: frozenset[Coord] | None = None
+        self._frozen_npcs: Mapping[str, Npc] | None = None
+        self._last_snapshot: FrozenWorldModel | None = None
+        # Moving, fighting, respawning NPCs; None keeps them static.
+        self.npc_dynamics: NpcDynamics | None = None
+
+    def _touch(self) -> None:
+        self._version += 1
+
+    def _touch_obstacles(self) -> None:
+        self._version += 1
+        self._obstacles_version += 1
+        self._frozen_obstacles = None
+
+    def _touch_npcs(self) -> None:
+        self._version += 1
+        self._npcs_version += 1
+        self._frozen_npcs = None
+
+    def invalidate_snapshot(self) -> None:
+        self.obstacle_grid.sync()
+        self._touch_obstacles()
+        self._touch_npcs()
+
+    def add_obstacle(self, pos: Coord) -> None:
+        if self.obstacle_grid.add(pos):
+            self._touch_obstacles()
+
+    def remove_obstacle(self, pos: Coord) -> None:
+        if self.obstacle_grid.remove(pos):
+            self._touch_obstacles()
+
+    def add_transport(self, src: Coord, dst: Coord) -> None:
+        self.state.transports.setdefault(src, set()).add(dst)
 
     def in_bounds(self, pos: Coord) -> bool:
         return 0 <= pos[0] < self.state.width and 0 <= pos[1] < self.state.height
@@ -49,34 +103,82 @@ class GridWorldEnv:
             max_hp=hp,
             alive=True,
         )
+        self.npc_index.insert(npc_id, pos)
+        if self.npc_dynamics is not None:
+            self.npc_dynamics.add(self.state.npcs[npc_id])
+        self._touch_npcs()
+
+    def enable_npc_dynamics(
+        self, behavior: NpcBehavior | None = None, seed: int = 0
+    ) -> NpcDynamics:
+        """Make NPCs wander, aggro, chase, hit back and respawn, one update per step."""
+        self.npc_dynamics = NpcDynamics(behavior, seed=seed)
+        for npc in self.state.npcs.values():
+            self.npc_dynamics.add(npc)
+        return self.npc_dynamics
+
+    def _advance_npcs(self) -> None:
+        dynamics = self.npc_dynamics
+        assert dynamics is not None
+        state = self.state
+        result = dynamics.step(state.bot_pos, state.width, state.height, state.obstacles)
+        if result.bot_damage:
+            state.bot_hp = max(0, state.bot_hp - result.bot_damage)
+            self._touch()
+        if not result.changed:
+            return
+        npcs, index = state.npcs, self.npc_index
+        for idx in result.changed:
+            npc = dynamics.npc(idx)
+            npcs[npc.id] = npc
+            if npc.id in index:
+                index.move(npc.id, npc.pos)
+            else:
+                index.insert(npc.id, npc.pos, rank=idx)
+        self._touch_npcs()
 
     def _distance(self, pos1: Coord, pos2: Coord) -> int:
-        return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+        return manhattan(pos1, pos2)
 
     def _get_nearest_scorpion(self) -> Npc | None:
-        nearest = None
-        min_dist = float("inf")
-        for npc in self.state.npcs.values():
-            if npc.alive:
-                dist = self._distance(self.state.bot_pos, npc.pos)
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest = npc
-        return nearest
-
-    def snapshot(self) -> WorldModel:
-        return WorldModel(
+        nearest = self.npc_index.nearest(self.state.bot_pos)
+        if nearest is None:
+            return None
+        return self.state.npcs[nearest[1]]
+
+    def snapshot(self) -> FrozenWorldModel:
+        last = self._last_snapshot
+        if last is not None and last.version == self._version:
+            return last
+
+        if self._frozen_obstacles is None:
+            self._frozen_obstacles = self.obstacle_grid.frozen()
+        if self._frozen_npcs is None:
+            self._frozen_npcs = MappingProxyType(dict(self.state.npcs))
+
+        self._last_snapshot = FrozenWorldModel(
             tick=0,
             width=self.state.width,
             height=self.state.height,
             bot_pos=self.state.bot_pos,
             target_pos=self.state.target_pos,
-            obstacles=set(self.state.obstacles),
+            obstacles=self._frozen_obstacles,
             task_complete=self.state.task_complete,
-            npcs=dict(self.state.npcs),
+            npcs=self._frozen_npcs,
+            meta=MappingProxyType({"bot_hp": self.state.bot_hp}),
+            version=self._version,
+            obstacles_version=self._obstacles_version,
+            npcs_version=self._npcs_version,
         )
+        return self._last_snapshot
 
     def step(self, action: BotAction) -> ActionResult:
+        result = self._resolve(action)
+        if self.npc_dynamics is not None:
+            self._advance_npcs()
+        return result
+
+    def _resolve(self, action: BotAction) -> ActionResult:
         if self.state.task_complete:
             return ActionResult(success=True, message="already_complete")
 
@@ -91,14 +193,48 @@ class GridWorldEnv:
         if action.kind == "interact":
             if self.state.bot_pos == self.state.target_pos:
                 self.state.task_complete = True
+                self._touch()
                 return ActionResult(success=True, message="interaction_success")
             return ActionResult(success=False, message="not_in_range")
 
         if action.kind in ("attack", "auto_attack"):
             return self._apply_attack()
 
+        if action.kind == "transport":
+            if action.target is None:
+                return ActionResult(success=False, message="missing_transport_target")
+            if action.target not in self.state.transports.get(self.state.bot_pos, ()):
+                return ActionResult(success=False, message="no_transport")
+            self.state.bot_pos = action.target
+            self._touch()
+            return ActionResult(success=True, message="transport_success")
+
         return ActionResult(success=False, message=f"unknown_action:{action.kind}")
 
+    def fast_forward(self, path: Sequence[Coord]) -> int:
+        """Walk ``path`` (which starts on the bot's tile) as one batch of moves.
+
+        Each move follows the rules of ``step(BotAction("move", ...))``; the
+        walk stops before the first one that would fail. Returns the number
+        of moves made.
+        """
+        if self.state.task_complete or not path or path[0] != self.state.bot_pos:
+            return 0
+        # Moving NPCs can interrupt any walk.
+        if self.npc_dynamics is not None:
+            return 0
+        pos = path[0]
+        moved = 0
+        for nxt in path[1:]:
+            if abs(nxt[0] - pos[0]) + abs(nxt[1] - pos[1]) != 1 or not self.is_walkable(nxt):
+                break
+            pos = nxt
+            moved += 1
+        if moved:
+            self.state.bot_pos = pos
+            self._touch()
+        return moved
+
     def _apply_move(self, target: Coord) -> ActionResult:
         x, y = self.state.bot_pos
         tx, ty = target
@@ -109,6 +245,7 @@ class GridWorldEnv:
             return ActionResult(success=False, message="blocked")
 
         self.state.bot_pos = target
+        self._touch()
         return ActionResult(success=True, message="move_success")
 
     def _apply_attack(self) -> ActionResult:
@@ -120,9 +257,18 @@ class GridWorldEnv:
         if dist > 1:
             return ActionResult(success=False, message="not_in_combat_range")
 
-        scorpion.hp -= 1
-        if scorpion.hp <= 0:
-            scorpion.alive = False
+        # Replace rather than mutate so earlier snapshots keep their NPC view.
+        if self.npc_dynamics is not None:
+            dynamics = self.npc_dynamics
+            idx = dynamics.index_of[scorpion.id]
+            hp = dynamics.hit(idx, 1)
+            self.state.npcs[scorpion.id] = dynamics.npc(idx)
+        else:
+            hp = scorpion.hp - 1
+            self.state.npcs[scorpion.id] = replace(scorpion, hp=hp, alive=hp > 0)
+        self._touch_npcs()
+        if hp <= 0:
+            self.npc_index.remove(scorpion.id)
             return ActionResult(success=True, message="scorpion_killed")
 
         return ActionResult(success=True, message="scorpion_damaged")
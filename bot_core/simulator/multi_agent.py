@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from typing import Mapping
+
+from ..types import Coord
+from .grid_world import GridWorldState
+
+
+class MultiAgentGridEnv:
+    """Several bots sharing one grid; all moves of a tick resolve together.
+
+    Agent positions live in ``state.agents`` (``bot_pos``/``target_pos`` mirror
+    the first agent for single-bot readers). A move is rejected when it is not
+    an adjacent walkable tile, when another agent claims the same tile, when
+    two agents would swap, or when the tile's occupant does not leave.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        agents: Mapping[str, tuple[Coord, Coord]],
+        obstacles: set[Coord] | None = None,
+    ) -> None:
+        if not agents:
+            raise ValueError("At least one agent is required")
+        starts = [start for start, _ in agents.values()]
+        if len(set(starts)) != len(starts):
+            raise ValueError("Agents must start on distinct tiles")
+        first_start, first_goal = next(iter(agents.values()))
+        self.state = GridWorldState(
+            width=width,
+            height=height,
+            bot_pos=first_start,
+            target_pos=first_goal,
+            obstacles=set(obstacles or ()),
+        )
+        self.state.agents = {agent_id: start for agent_id, (start, _) in agents.items()}
+        self.goals = {agent_id: goal for agent_id, (_, goal) in agents.items()}
+        self.tick = 0
+        self.moves = 0
+        self.rejected = 0
+
+    @property
+    def positions(self) -> dict[str, Coord]:
+        return self.state.agents
+
+    def is_walkable(self, pos: Coord) -> bool:
+        return (
+            0 <= pos[0] < self.state.width
+            and 0 <= pos[1] < self.state.height
+            and pos not in self.state.obstacles
+        )
+
+    def arrived(self) -> set[str]:
+        return {a for a, pos in self.state.agents.items() if pos == self.goals[a]}
+
+    def step(self, moves: Mapping[str, Coord]) -> set[str]:
+        """Apply one tick of moves; returns the agents whose move was rejected."""
+        positions = self.state.agents
+        proposed: dict[str, Coord] = {}
+        rejected: set[str] = set()
+        for agent_id, target in moves.items():
+            here = positions[agent_id]
+            if target == here:
+                continue
+            adjacent = abs(target[0] - here[0]) + abs(target[1] - here[1]) == 1
+            if not adjacent or not self.is_walkable(target):
+                rejected.add(agent_id)
+                continue
+            proposed[agent_id] = target
+
+        # Reject until stable: each rejection can strand an agent that others
+        # were counting on to vacate its tile.
+        changed = True
+        while changed:
+            changed = False
+            claims: dict[Coord, list[str]] = {}
+            for agent_id, pos in positions.items():
+                if agent_id in proposed and agent_id not in rejected:
+                    pos = proposed[agent_id]
+                claims.setdefault(pos, []).append(agent_id)
+            for pos, claimants in claims.items():
+                if len(claimants) < 2:
+                    continue
+                # Whoever does not move keeps the tile; otherwise lowest id wins.
+                stayers = [a for a in claimants if a not in proposed or a in rejected]
+                keep = stayers[0] if stayers else min(claimants)
+                for agent_id in claimants:
+                    if agent_id != keep and agent_id in proposed and agent_id not in rejected:
+                        rejected.add(agent_id)
+                        changed = True
+            occupant = {pos: a for a, pos in positions.items()}
+            for agent_id, target in proposed.items():
+                if agent_id in rejected:
+                    continue
+                other = occupant.get(target)
+                swapping = other is not None and proposed.get(other) == positions[agent_id]
+                if swapping and other not in rejected:
+                    rejected.update((agent_id, other))
+                    changed = True
+
+        for agent_id, target in proposed.items():
+            if agent_id not in rejected:
+                positions[agent_id] = target
+                self.moves += 1
+        self.rejected += len(rejected)
+        self.tick += 1
+        first = next(iter(positions))
+        self.state.bot_pos = positions[first]
+        return rejected
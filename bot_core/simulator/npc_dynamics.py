@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import random
+from array import array
+from dataclasses import dataclass, field
+from typing import AbstractSet
+
+from ..types import Coord
+from ..world_model import Npc, NpcType
+
+_ALIVE = -1
+
+
+@dataclass
+class NpcBehavior:
+    # Idle NPCs step to a random tile within wander_radius (Chebyshev) of home
+    # with probability wander_chance per tick.
+    wander_radius: int = 4
+    wander_chance: float = 0.25
+    # The bot within aggro_range (Manhattan) starts a chase, which ends once
+    # the NPC would leave leash_radius of home.
+    aggro_range: int = 3
+    leash_radius: int = 10
+    # Adjacent aggressive NPCs hit the bot for damage every attack_interval ticks.
+    damage: int = 1
+    attack_interval: int = 4
+    respawn_ticks: int = 25
+
+    def __post_init__(self) -> None:
+        if self.wander_radius < 0 or self.aggro_range < 0 or self.leash_radius < 0:
+            raise ValueError("NPC radii must be >= 0")
+        if self.attack_interval < 1:
+            raise ValueError(f"attack_interval must be >= 1, got: {self.attack_interval}")
+        if self.respawn_ticks < 1:
+            raise ValueError(f"respawn_ticks must be >= 1, got: {self.respawn_ticks}")
+
+
+@dataclass
+class NpcTickResult:
+    # Indices whose position, hp or liveness changed this tick.
+    changed: list[int] = field(default_factory=list)
+    respawned: list[int] = field(default_factory=list)
+    bot_damage: int = 0
+
+
+class NpcDynamics:
+    """Behaviour state of every simulated NPC, one ``array`` column per field.
+
+    ``step`` advances all NPCs by one tick in a single pass over the columns
+    and reports which indices changed, so the caller only rebuilds the
+    ``Npc`` views (and spatial index entries) that actually moved or died.
+    """
+
+    def __init__(self, behavior: NpcBehavior | None = None, seed: int = 0) -> None:
+        self.behavior = behavior or NpcBehavior()
+        self.rng = random.Random(seed)
+        self.tick = 0
+        self.ids: list[str] = []
+        self.index_of: dict[str, int] = {}
+        self.npc_types: list[NpcType] = []
+        self.x = array("i")
+        self.y = array("i")
+        self.home_x = array("i")
+        self.home_y = array("i")
+        self.hp = array("i")
+        self.max_hp = array("i")
+        # Tick the NPC comes back, or _ALIVE.
+        self.respawn_at = array("i")
+        self.next_attack = array("i")
+        self.aggro = array("b")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, npc: Npc) -> int:
+        """Track ``npc`` with its current tile as home; re-adding an id resets it."""
+        idx = self.index_of.get(npc.id)
+        if idx is None:
+            idx = len(self.ids)
+            self.ids.append(npc.id)
+            self.index_of[npc.id] = idx
+            self.npc_types.append(npc.npc_type)
+            for column in (
+                self.x, self.y, self.home_x, self.home_y, self.hp, self.max_hp,
+                self.respawn_at, self.next_attack, self.aggro,
+            ):
+                column.append(0)
+        self.npc_types[idx] = npc.npc_type
+        self.x[idx] = self.home_x[idx] = npc.pos[0]
+        self.y[idx] = self.home_y[idx] = npc.pos[1]
+        self.hp[idx] = npc.hp
+        self.max_hp[idx] = npc.max_hp
+        self.respawn_at[idx] = _ALIVE if npc.alive else self.tick + self.behavior.respawn_ticks
+        self.next_attack[idx] = 0
+        self.aggro[idx] = 0
+        return idx
+
+    def alive(self, idx: int) -> bool:
+        return self.respawn_at[idx] == _ALIVE
+
+    def npc(self, idx: int) -> Npc:
+        return Npc(
+            id=self.ids[idx],
+            npc_type=self.npc_types[idx],
+            pos=(self.x[idx], self.y[idx]),
+            hp=self.hp[idx],
+            max_hp=self.max_hp[idx],
+            alive=self.respawn_at[idx] == _ALIVE,
+        )
+
+    def hit(self, idx: int, amount: int) -> int:
+        """Damage NPC ``idx`` (it turns on its attacker); returns the hp left."""
+        if self.respawn_at[idx] != _ALIVE:
+            return 0
+        hp = max(0, self.hp[idx] - amount)
+        self.hp[idx] = hp
+        if hp == 0:
+            self.respawn_at[idx] = self.tick + self.behavior.respawn_ticks
+            self.aggro[idx] = 0
+        else:
+            self.aggro[idx] = 1
+        return hp
+
+    def step(
+        self,
+        bot_pos: Coord,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+    ) -> NpcTickResult:
+        """Advance every NPC one tick: respawn, leash, aggro, chase, attack, wander."""
+        self.tick += 1
+        tick = self.tick
+        b = self.behavior
+        rng_random = self.rng.random
+        xs, ys, hxs, hys = self.x, self.y, self.home_x, self.home_y
+        respawn_at, aggro = self.respawn_at, self.aggro
+        bx, by = bot_pos
+        # Outside this box around the bot an idle NPC cannot aggro.
+        reach = b.aggro_range
+        min_x, max_x, min_y, max_y = bx - reach, bx + reach, by - reach, by + reach
+        wander_radius, chance = b.wander_radius, b.wander_chance
+        result = NpcTickResult()
+        changed = result.changed
+        # Live NPCs per tile. Nobody steps onto a held tile, though NPCs
+        # added on the same tile may share it until they move apart.
+        occupied: dict[Coord, int] = {}
+        for idx in range(len(self.ids)):
+            if respawn_at[idx] == _ALIVE:
+                pos = (xs[idx], ys[idx])
+                occupied[pos] = occupied.get(pos, 0) + 1
+
+        for idx in range(len(self.ids)):
+            if respawn_at[idx] != _ALIVE:
+                # A respawn waits while something stands on the home tile.
+                home = (hxs[idx], hys[idx])
+                if tick >= respawn_at[idx] and home not in occupied:
+                    self._respawn(idx)
+                    occupied[home] = 1
+                    changed.append(idx)
+                    result.respawned.append(idx)
+                continue
+
+            x, y = xs[idx], ys[idx]
+            if aggro[idx] or (min_x <= x <= max_x and min_y <= y <= max_y):
+                target = self._engage(
+                    idx, bx, by, tick, result, width, height, obstacles, occupied
+                )
+            else:
+                hx, hy = hxs[idx], hys[idx]
+                if x - hx > wander_radius or hx - x > wander_radius:
+                    target = (x + 1 if hx > x else x - 1, y)
+                elif y - hy > wander_radius or hy - y > wander_radius:
+                    target = (x, y + 1 if hy > y else y - 1)
+                else:
+                    # One draw decides both whether and where to step.
+                    roll = rng_random()
+                    if roll >= chance:
+                        continue
+                    direction = int(roll * 4 / chance)
+                    if direction == 0:
+                        target = (x + 1, y)
+                        if target[0] - hx > wander_radius:
+                            continue
+                    elif direction == 1:
+                        target = (x - 1, y)
+                        if hx - target[0] > wander_radius:
+                            continue
+                    elif direction == 2:
+                        target = (x, y + 1)
+                        if target[1] - hy > wander_radius:
+                            continue
+                    else:
+                        target = (x, y - 1)
+                        if hy - target[1] > wander_radius:
+                            continue
+            if (
+                target is not None
+                and 0 <= target[0] < width
+                and 0 <= target[1] < height
+                and target != bot_pos
+                and target not in obstacles
+                and target not in occupied
+            ):
+                if occupied[(x, y)] > 1:
+                    occupied[(x, y)] -= 1
+                else:
+                    del occupied[(x, y)]
+                occupied[target] = 1
+                xs[idx], ys[idx] = target
+                changed.append(idx)
+        return result
+
+    def _respawn(self, idx: int) -> None:
+        self.respawn_at[idx] = _ALIVE
+        self.hp[idx] = self.max_hp[idx]
+        self.x[idx], self.y[idx] = self.home_x[idx], self.home_y[idx]
+        self.next_attack[idx] = 0
+        self.aggro[idx] = 0
+
+    def _engage(
+        self,
+        idx: int,
+        bx: int,
+        by: int,
+        tick: int,
+        result: NpcTickResult,
+        width: int,
+        height: int,
+        obstacles: AbstractSet[Coord],
+        occupied: AbstractSet[Coord],
+    ) -> Coord | None:
+        """Aggro bookkeeping for an NPC near the bot (or chasing it); returns its step."""
+        b = self.behavior
+        x, y, hx, hy = self.x[idx], self.y[idx], self.home_x[idx], self.home_y[idx]
+        dx, dy = bx - x, by - y
+        dist = abs(dx) + abs(dy)
+        bot_in_leash = max(abs(bx - hx), abs(by - hy)) <= b.leash_radius
+        if self.aggro[idx]:
+            if not bot_in_leash:
+                self.aggro[idx] = 0
+        elif dist <= b.aggro_range and bot_in_leash:
+            self.aggro[idx] = 1
+
+        if not self.aggro[idx]:
+            # Not chasing: drift back inside the wander radius, else stay.
+            if max(abs(x - hx), abs(y - hy)) > b.wander_radius:
+                if x != hx:
+                    return (x + 1 if hx > x else x - 1, y)
+                return (x, y + 1 if hy > y else y - 1)
+            return None
+        if dist <= 1:
+            if tick >= self.next_attack[idx]:
+                result.bot_damage += b.damage
+                self.next_attack[idx] = tick + b.attack_interval
+            return None
+
+        # Close the larger gap first, the other axis if that is blocked.
+        sx = (dx > 0) - (dx < 0)
+        sy = (dy > 0) - (dy < 0)
+        if abs(dx) >= abs(dy):
+            options = [(x + sx, y), (x, y + sy)] if sy else [(x + sx, y)]
+        else:
+            options = [(x, y + sy), (x + sx, y)] if sx else [(x, y + sy)]
+        for nx, ny in options:
+            if (
+                max(abs(nx - hx), abs(ny - hy)) <= b.leash_radius
+                and 0 <= nx < width
+                and 0 <= ny < height
+                and (nx, ny) not in obstacles
+                and (nx, ny) not in occupied
+            ):
+                return (nx, ny)
+        return None
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
 from .fsm import State, TickContext
-from .navigation import astar
+from .navigation import BoundedAStar, PlanResult, astar
 from .types import BotAction, Coord
 
+if TYPE_CHECKING:
+    # Optional navigation features; BotEngine.default imports the ones enabled.
+    from .distance_field import DistanceField, DistanceFieldCache
+    from .landmarks import LandmarkStore
+    from .obstacle_grid import ObstacleGrid
+    from .risk_grid import RiskCostGrid
+    from .route_cache import RouteCache
+    from .waypoints import RouteLeg, WaypointGraph
+
 
 def _adjacent_candidates(pos: Coord) -> list[Coord]:
     x, y = pos
@@ -24,27 +37,270 @@ class IdleState(State):
         return "navigate", BotAction("idle")
 
 
+@dataclass
+class NavigateStats:
+    # Paths read off a distance field, and field lookups that gave none.
+    field_reads: int = 0
+    field_misses: int = 0
+    # Bounded planner calls, those that stopped short of the goal, and the
+    # most nodes one call expanded.
+    bounded_plans: int = 0
+    partial_plans: int = 0
+    max_plan_expansions: int = 0
+
+
 class NavigateState(State):
     name = "navigate"
 
+    def __init__(
+        self,
+        max_expansions: int | None = None,
+        weight: float = 1.0,
+        distance_fields: DistanceFieldCache | None = None,
+        landmarks: LandmarkStore | None = None,
+        route_cache: RouteCache | None = None,
+        waypoints: WaypointGraph | None = None,
+        risk_grid: RiskCostGrid | None = None,
+        obstacle_grid: ObstacleGrid | None = None,
+    ) -> None:
+        # With an expansion limit (or a "plan_deadline" on the blackboard) the
+        # route is planned incrementally and a partial path is followed meanwhile.
+        # With distance_fields the route is read off a field built from the target,
+        # repaired from obstacle_grid's change log while the world's obstacles are its own.
+        # With route_cache, stored routes are tried before any planning, and
+        # complete plans (bounded or not) are stored. Landmarks sharpen both planners.
+        # With waypoints, long trips follow the graph and only local legs hit the grid.
+        # With risk_grid, steps near NPCs cost more for astar and the
+        # incremental planner (the distance field and route cache assume unit
+        # costs; EngineConfig rejects combining them with risk_costs).
+        self.max_expansions = max_expansions
+        self.weight = weight
+        self.distance_fields = distance_fields
+        self.landmarks = landmarks
+        self.route_cache = route_cache
+        self.waypoints = waypoints
+        self.risk_grid = risk_grid
+        self.obstacle_grid = obstacle_grid
+        self.stats = NavigateStats()
+
     def on_tick(self, ctx: TickContext) -> tuple[str | None, BotAction]:
         if ctx.world.bot_pos == ctx.world.target_pos:
             return "interact", BotAction("idle")
 
-        path = astar(
-            start=ctx.world.bot_pos,
-            goal=ctx.world.target_pos,
-            width=ctx.world.width,
-            height=ctx.world.height,
-            obstacles=ctx.world.obstacles,
-        )
+        if self.risk_grid is not None:
+            self.risk_grid.update(ctx.world.npcs)
+            # Paths and searches planned on other costs are stale. Comparing
+            # versions (not update()'s result) also catches a blackboard that
+            # was rolled back after the grid had already moved on.
+            if ctx.blackboard.get("nav_risk_version") != self.risk_grid.version:
+                ctx.blackboard.pop("nav_path", None)
+                ctx.blackboard.pop("nav_search", None)
+                ctx.blackboard["nav_risk_version"] = self.risk_grid.version
+
+        if self.waypoints is not None:
+            routed = self._follow_route(ctx, self.waypoints)
+            if routed is not None:
+                return routed
+
+        # Precedence: reused path, distance field, route cache, then a plan
+        # (incremental when bounded, else astar). Complete plans fill the cache.
+        world = ctx.world
+        path = None
+        if ctx.blackboard.get("reuse_path"):
+            path = _cached_path(ctx)
+        if path is None and self.distance_fields is not None:
+            path = self._field_path(ctx)
+        if path is None and self.route_cache is not None:
+            # Follow the stored route; only a fresh start costs a cache lookup,
+            # not every slice of a bounded search that already missed.
+            path = _cached_path(ctx)
+            search = ctx.blackboard.get("nav_search")
+            if path is None and (
+                search is None
+                or not search.valid_for(
+                    world.target_pos, world.width, world.height, world.obstacles
+                )
+            ):
+                path = self.route_cache.lookup(
+                    world.bot_pos, world.target_pos, world.width, world.height, world.obstacles
+                )
+        deadline = ctx.blackboard.get("plan_deadline")
+        if path is None and (self.max_expansions is not None or deadline is not None):
+            plan = self._bounded_plan(ctx, deadline)
+            if plan.path is not None and len(plan.path) < 2 and not plan.complete:
+                # Nothing discovered beats standing still yet; keep searching.
+                return None, BotAction("idle")
+            path = plan.path
+            if plan.complete and plan.expansions and self.route_cache is not None:
+                # Store once, on the call that finished the search, from where it began.
+                search = ctx.blackboard["nav_search"]
+                self._remember(ctx, search.plan(search.start).path)
+        elif path is None:
+            path = self._astar(ctx)
+            self._remember(ctx, path)
 
         if path is None or len(path) < 2:
+            ctx.blackboard.pop("nav_path", None)
+            ctx.blackboard.pop("nav_search", None)
             return "recover", BotAction("idle")
 
+        ctx.blackboard["nav_path"] = path
         ctx.blackboard["recover_attempts"] = 0
         return None, BotAction(kind="move", target=path[1])
 
+    def _follow_route(
+        self, ctx: TickContext, graph: WaypointGraph
+    ) -> tuple[str | None, BotAction] | None:
+        """Next action on the waypoint route, or None to plan on the grid alone."""
+        from .waypoints import WALK
+
+        world = ctx.world
+        # The route is replaced, never mutated, so a blackboard copy taken
+        # before the tick (the engine's stale-tick rollback) stays intact.
+        route = ctx.blackboard.get("nav_route")
+        if route is None or route.goal != world.target_pos:
+            route = _Route(goal=world.target_pos)
+
+        # A failed local leg is blocked and the trip replanned; the bound only
+        # guards against a graph whose every leg keeps failing.
+        for _ in range(8):
+            if not route.legs:
+                legs = graph.plan(world.bot_pos, route.goal, blocked=route.blocked)
+                if not legs:
+                    ctx.blackboard.pop("nav_route", None)
+                    return None
+                route = replace(route, legs=tuple(legs))
+            done = 0
+            while done < len(route.legs) and world.bot_pos == route.legs[done].dst:
+                done += 1
+            if done:
+                route = replace(route, legs=route.legs[done:])
+            ctx.blackboard["nav_route"] = route
+            if not route.legs:
+                continue
+
+            leg = route.legs[0]
+            if leg.kind != WALK and world.bot_pos == leg.src:
+                ctx.blackboard["recover_attempts"] = 0
+                return None, BotAction(kind="transport", target=leg.dst)
+
+            # Walk the leg, or to the transport's entrance.
+            local_goal = leg.dst if leg.kind == WALK else leg.src
+            path = _cached_path(ctx, local_goal) or self._astar(ctx, local_goal)
+            if path is not None and len(path) >= 2:
+                ctx.blackboard["nav_path"] = path
+                ctx.blackboard["recover_attempts"] = 0
+                return None, BotAction(kind="move", target=path[1])
+            edge = (leg.src, leg.dst) if leg.kind == WALK else (world.bot_pos, leg.src)
+            route = replace(route, legs=(), blocked=route.blocked | {edge})
+            ctx.blackboard["nav_route"] = route
+
+        ctx.blackboard.pop("nav_route", None)
+        return None
+
+    def _astar(self, ctx: TickContext, goal: Coord | None = None) -> list[Coord] | None:
+        world = ctx.world
+        return astar(
+            start=world.bot_pos,
+            goal=world.target_pos if goal is None else goal,
+            width=world.width,
+            height=world.height,
+            obstacles=world.obstacles,
+            landmarks=(
+                self.landmarks.get(world.width, world.height, world.obstacles)
+                if self.landmarks is not None
+                else None
+            ),
+            tile_cost=self.risk_grid.extra if self.risk_grid is not None else None,
+        )
+
+    def _remember(self, ctx: TickContext, path: list[Coord] | None) -> None:
+        world = ctx.world
+        if self.route_cache is not None and path is not None:
+            self.route_cache.store(
+                path[0], world.target_pos, world.width, world.height, world.obstacles, path
+            )
+
+    def _field_path(self, ctx: TickContext) -> list[Coord] | None:
+        assert self.distance_fields is not None
+        world = ctx.world
+
+        def follow(field: DistanceField) -> list[Coord] | None:
+            # While the field is unchanged, the path read off it last time holds.
+            seen = (field, field.version)
+            if ctx.blackboard.get("nav_field") == seen:
+                path = _cached_path(ctx)
+                if path is not None:
+                    return path
+            ctx.blackboard["nav_field"] = seen
+            self.stats.field_reads += 1
+            return field.path_from(world.bot_pos)
+
+        path = self.distance_fields.read(
+            world.target_pos, world.width, world.height, world.obstacles, follow, self.obstacle_grid
+        )
+        if path is None:
+            self.stats.field_misses += 1
+        return path
+
+    def _bounded_plan(self, ctx: TickContext, deadline: float | None) -> PlanResult:
+        world = ctx.world
+        search = ctx.blackboard.get("nav_search")
+        if (
+            search is None
+            or not search.valid_for(world.target_pos, world.width, world.height, world.obstacles)
+            or world.bot_pos not in search.came_from
+        ):
+            search = BoundedAStar(
+                start=world.bot_pos,
+                goal=world.target_pos,
+                width=world.width,
+                height=world.height,
+                obstacles=world.obstacles,
+                weight=self.weight,
+                tile_cost=self.risk_grid.extra if self.risk_grid is not None else None,
+                landmarks=(
+                    self.landmarks.get(world.width, world.height, world.obstacles)
+                    if self.landmarks is not None
+                    else None
+                ),
+            )
+            ctx.blackboard["nav_search"] = search
+        plan = search.plan(
+            world.bot_pos,
+            max_expansions=self.max_expansions,
+            deadline=deadline,
+            clock=ctx.blackboard.get("plan_clock", time.perf_counter),
+        )
+        stats = self.stats
+        stats.bounded_plans += 1
+        if not plan.complete:
+            stats.partial_plans += 1
+        stats.max_plan_expansions = max(stats.max_plan_expansions, plan.expansions)
+        return plan
+
+
+@dataclass(frozen=True)
+class _Route:
+    goal: Coord
+    legs: tuple[RouteLeg, ...] = ()
+    blocked: frozenset[tuple[Coord, Coord]] = frozenset()
+
+
+def _cached_path(ctx: TickContext, goal: Coord | None = None) -> list[Coord] | None:
+    """Remainder of the last planned path, if it still starts here and is clear."""
+    path = ctx.blackboard.get("nav_path")
+    if not path or path[-1] != (ctx.world.target_pos if goal is None else goal):
+        return None
+    try:
+        idx = path.index(ctx.world.bot_pos)
+    except ValueError:
+        return None
+    rest = path[idx:]
+    if len(rest) < 2 or rest[1] in ctx.world.obstacles:
+        return None
+    return rest
+
 
 class InteractState(State):
     name = "interact"
@@ -81,10 +337,28 @@ class RecoverState(State):
         return "navigate", BotAction(kind="move", target=valid[0])
 
 
-def build_default_states() -> dict[str, State]:
+def build_default_states(
+    plan_max_expansions: int | None = None,
+    plan_weight: float = 1.0,
+    distance_fields: DistanceFieldCache | None = None,
+    landmarks: LandmarkStore | None = None,
+    route_cache: RouteCache | None = None,
+    waypoints: WaypointGraph | None = None,
+    risk_grid: RiskCostGrid | None = None,
+    obstacle_grid: ObstacleGrid | None = None,
+) -> dict[str, State]:
     return {
         IdleState.name: IdleState(),
-        NavigateState.name: NavigateState(),
+        NavigateState.name: NavigateState(
+            max_expansions=plan_max_expansions,
+            weight=plan_weight,
+            distance_fields=distance_fields,
+            landmarks=landmarks,
+            route_cache=route_cache,
+            waypoints=waypoints,
+            risk_grid=risk_grid,
+            obstacle_grid=obstacle_grid,
+        ),
         InteractState.name: InteractState(),
         RecoverState.name: RecoverState(),
     }
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import heapq
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AbstractSet, Iterable, Mapping
+
+from .types import Coord
+
+WALK = "walk"
+_START = "\0start"
+_GOAL = "\0goal"
+
+
+@dataclass(frozen=True)
+class TransportEdge:
+    """Directed edge between named waypoints.
+
+    ``kind`` is ``"walk"`` for a leg the grid planner covers; anything else
+    (door, stairs, teleport, ...) is taken with one ``transport`` action.
+    """
+
+    src: str
+    dst: str
+    cost: float
+    kind: str = WALK
+
+
+@dataclass(frozen=True)
+class RouteLeg:
+    kind: str
+    src: Coord
+    dst: Coord
+
+
+def _manhattan(a: Coord, b: Coord) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class WaypointGraph:
+    """Sparse navigation graph above the tile grid.
+
+    Trips are planned over the waypoints first. The start and goal are tied
+    into the graph with walking edges estimated by Manhattan distance, only to
+    waypoints within ``max_local_leg`` tiles, so the grid planner is only ever
+    asked for short local legs.
+    """
+
+    def __init__(
+        self,
+        waypoints: Mapping[str, Coord],
+        edges: Iterable[TransportEdge],
+        max_local_leg: int | None = None,
+    ) -> None:
+        self.waypoints = dict(waypoints)
+        self.max_local_leg = max_local_leg
+        self.edges: dict[str, list[TransportEdge]] = {name: [] for name in self.waypoints}
+        for edge in edges:
+            for name in (edge.src, edge.dst):
+                if name not in self.waypoints:
+                    raise ValueError(f"Unknown waypoint in edge: {name}")
+            if edge.cost < 0:
+                raise ValueError(f"Edge cost must be >= 0: {edge.src} -> {edge.dst}")
+            self.edges[edge.src].append(edge)
+
+    def _local(self, a: Coord, b: Coord) -> int | None:
+        distance = _manhattan(a, b)
+        if self.max_local_leg is not None and distance > self.max_local_leg:
+            return None
+        return distance
+
+    def plan(
+        self,
+        start: Coord,
+        goal: Coord,
+        blocked: AbstractSet[tuple[Coord, Coord]] = frozenset(),
+    ) -> list[RouteLeg] | None:
+        """Cheapest leg sequence from ``start`` to ``goal``; None if unconnected.
+
+        ``blocked`` holds ``(src, dst)`` walking legs the grid planner could not
+        cover, so a replan avoids them.
+        """
+        positions = dict(self.waypoints)
+        positions[_START] = start
+        positions[_GOAL] = goal
+
+        best: dict[str, float] = {_START: 0.0}
+        came_from: dict[str, tuple[str, str]] = {}
+        frontier: list[tuple[float, str]] = [(0.0, _START)]
+        while frontier:
+            cost, node = heapq.heappop(frontier)
+            if node == _GOAL:
+                break
+            if cost > best.get(node, float("inf")):
+                continue
+
+            steps: list[tuple[str, float, str]] = []
+            if node == _START:
+                for name, pos in self.waypoints.items():
+                    distance = self._local(start, pos)
+                    if distance is not None:
+                        steps.append((name, distance, WALK))
+            else:
+                steps.extend((edge.dst, edge.cost, edge.kind) for edge in self.edges[node])
+            direct = self._local(positions[node], goal)
+            if direct is not None:
+                steps.append((_GOAL, direct, WALK))
+
+            for nxt, step_cost, kind in steps:
+                if kind == WALK and (positions[node], positions[nxt]) in blocked:
+                    continue
+                total = cost + step_cost
+                if total < best.get(nxt, float("inf")):
+                    best[nxt] = total
+                    came_from[nxt] = (node, kind)
+                    heapq.heappush(frontier, (total, nxt))
+
+        if _GOAL not in came_from:
+            return [] if start == goal else None
+
+        legs: list[RouteLeg] = []
+        node = _GOAL
+        while node != _START:
+            prev, kind = came_from[node]
+            src, dst = positions[prev], positions[node]
+            if src != dst or kind != WALK:
+                legs.append(RouteLeg(kind=kind, src=src, dst=dst))
+            node = prev
+        legs.reverse()
+        return legs
+
+
+def load_waypoint_graph(path: Path) -> WaypointGraph:
+    """Load ``{"waypoints": {name: [x, y]}, "edges": [...], "max_local_leg": N}``.
+
+    Each edge is ``{"from", "to", "kind"?, "cost"?, "bidirectional"?}``; cost
+    defaults to the Manhattan distance for walking edges and 1 otherwise.
+    """
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    waypoints: dict[str, Coord] = {}
+    for name, value in raw.get("waypoints", {}).items():
+        if len(value) != 2:
+            raise ValueError(f"Expected [x, y] for waypoint {name}, got: {value}")
+        waypoints[str(name)] = (int(value[0]), int(value[1]))
+
+    edges: list[TransportEdge] = []
+    for item in raw.get("edges", []):
+        src, dst = str(item["from"]), str(item["to"])
+        kind = str(item.get("kind", WALK))
+        if src not in waypoints or dst not in waypoints:
+            raise ValueError(f"Unknown waypoint in edge: {src} -> {dst}")
+        default_cost = _manhattan(waypoints[src], waypoints[dst]) if kind == WALK else 1
+        cost = float(item.get("cost", default_cost))
+        edges.append(TransportEdge(src=src, dst=dst, cost=cost, kind=kind))
+        if item.get("bidirectional", False):
+            edges.append(TransportEdge(src=dst, dst=src, cost=cost, kind=kind))
+
+    max_local_leg = raw.get("max_local_leg")
+    return WaypointGraph(
+        waypoints,
+        edges,
+        max_local_leg=int(max_local_leg) if max_local_leg is not None else None,
+    )
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
+from typing import AbstractSet, Callable, Union
 
 from .types import Coord
 
@@ -31,3 +34,273 @@ class WorldModel:
     task_complete: bool = False
     meta: dict[str, object] = field(default_factory=dict)
     npcs: dict[str, Npc] = field(default_factory=dict)
+
+
+_EMPTY_MAPPING: Mapping[str, object] = MappingProxyType({})
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenWorldModel:
+    """Read-only world snapshot whose obstacle and NPC tables are shared by
+    reference with other snapshots until they change.
+
+    ``version`` bumps on any change; ``obstacles_version`` and ``npcs_version``
+    only when those tables are replaced, so ``a.npcs_version == b.npcs_version``
+    implies ``a.npcs is b.npcs``.
+    """
+
+    tick: int
+    width: int
+    height: int
+    bot_pos: Coord
+    target_pos: Coord
+    obstacles: frozenset[Coord] = frozenset()
+    task_complete: bool = False
+    meta: Mapping[str, object] = field(default_factory=lambda: _EMPTY_MAPPING)
+    npcs: Mapping[str, Npc] = field(default_factory=lambda: MappingProxyType({}))
+    version: int = 0
+    obstacles_version: int = 0
+    npcs_version: int = 0
+
+
+WorldView = Union[WorldModel, FrozenWorldModel]
+
+
+def obstacles_in_rect(
+    obstacles: AbstractSet[Coord], origin: Coord, width: int, height: int
+) -> list[Coord]:
+    """Obstacles inside ``[origin, origin + (width, height))``.
+
+    Probes each cell when the rectangle is smaller than the obstacle set, so a
+    small viewport over a large collision map never scans the whole set.
+    """
+    x0, y0 = origin
+    if width <= 0 or height <= 0:
+        return []
+    if width * height < len(obstacles):
+        return [
+            (x, y)
+            for y in range(y0, y0 + height)
+            for x in range(x0, x0 + width)
+            if (x, y) in obstacles
+        ]
+    return [
+        pos
+        for pos in obstacles
+        if x0 <= pos[0] < x0 + width and y0 <= pos[1] < y0 + height
+    ]
+
+
+def manhattan(a: Coord, b: Coord) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def chebyshev(a: Coord, b: Coord) -> int:
+    return max(abs(a[0] - b[0]), abs(a[1] - b[1]))
+
+
+_METRICS: dict[str, Callable[[Coord, Coord], int]] = {
+    "manhattan": manhattan,
+    "chebyshev": chebyshev,
+}
+
+
+class NpcSpatialIndex:
+    """Uniform grid buckets of NPC ids keyed by tile position.
+
+    Results are ordered by ``(distance, rank)``; ``rank`` defaults to insertion
+    order so ties resolve the same way as a first-wins linear scan.
+    """
+
+    def __init__(self, bucket_size: int = 8, metric: str = "manhattan") -> None:
+        if bucket_size < 1:
+            raise ValueError(f"bucket_size must be >= 1, got: {bucket_size}")
+        if metric not in _METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        self.bucket_size = bucket_size
+        self.metric = metric
+        self._distance = _METRICS[metric]
+        self._buckets: dict[Coord, set[str]] = {}
+        self._positions: dict[str, Coord] = {}
+        self._ranks: dict[str, int] = {}
+        self._next_rank = 0
+        self._bounds: tuple[int, int, int, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, npc_id: object) -> bool:
+        return npc_id in self._positions
+
+    def position(self, npc_id: str) -> Coord | None:
+        return self._positions.get(npc_id)
+
+    def _bucket_of(self, pos: Coord) -> Coord:
+        return pos[0] // self.bucket_size, pos[1] // self.bucket_size
+
+    def _add_to_bucket(self, npc_id: str, pos: Coord) -> None:
+        key = self._bucket_of(pos)
+        self._buckets.setdefault(key, set()).add(npc_id)
+        if self._bounds is None:
+            self._bounds = (key[0], key[1], key[0], key[1])
+        else:
+            min_x, min_y, max_x, max_y = self._bounds
+            self._bounds = (
+                min(min_x, key[0]),
+                min(min_y, key[1]),
+                max(max_x, key[0]),
+                max(max_y, key[1]),
+            )
+
+    def _remove_from_bucket(self, npc_id: str, pos: Coord) -> None:
+        key = self._bucket_of(pos)
+        members = self._buckets.get(key)
+        if members is None:
+            return
+        members.discard(npc_id)
+        if not members:
+            del self._buckets[key]
+
+    def insert(self, npc_id: str, pos: Coord, rank: int | None = None) -> None:
+        if npc_id in self._positions:
+            self.remove(npc_id)
+        if rank is None:
+            rank = self._next_rank
+        self._next_rank += 1
+        self._positions[npc_id] = pos
+        self._ranks[npc_id] = rank
+        self._add_to_bucket(npc_id, pos)
+
+    def move(self, npc_id: str, pos: Coord) -> None:
+        old = self._positions.get(npc_id)
+        if old is None:
+            raise KeyError(npc_id)
+        if old == pos:
+            return
+        self._positions[npc_id] = pos
+        if self._bucket_of(old) != self._bucket_of(pos):
+            self._remove_from_bucket(npc_id, old)
+            self._add_to_bucket(npc_id, pos)
+
+    def remove(self, npc_id: str) -> None:
+        pos = self._positions.pop(npc_id, None)
+        if pos is None:
+            return
+        self._ranks.pop(npc_id, None)
+        self._remove_from_bucket(npc_id, pos)
+        if not self._positions:
+            self._bounds = None
+
+    def clear(self) -> None:
+        self._buckets.clear()
+        self._positions.clear()
+        self._ranks.clear()
+        self._bounds = None
+
+    def at(self, pos: Coord) -> list[str]:
+        members = self._buckets.get(self._bucket_of(pos), ())
+        return sorted(
+            (npc_id for npc_id in members if self._positions[npc_id] == pos),
+            key=self._ranks.__getitem__,
+        )
+
+    def _ring(self, center: Coord, radius: int) -> list[Coord]:
+        cx, cy = center
+        if radius == 0:
+            return [center]
+        cells = [(cx + dx, cy - radius) for dx in range(-radius, radius + 1)]
+        cells += [(cx + dx, cy + radius) for dx in range(-radius, radius + 1)]
+        cells += [(cx - radius, cy + dy) for dy in range(-radius + 1, radius)]
+        cells += [(cx + radius, cy + dy) for dy in range(-radius + 1, radius)]
+        return cells
+
+    def nearest_k(
+        self,
+        pos: Coord,
+        k: int,
+        max_distance: int | None = None,
+    ) -> list[tuple[int, str]]:
+        if k <= 0 or self._bounds is None:
+            return []
+
+        center = self._bucket_of(pos)
+        min_x, min_y, max_x, max_y = self._bounds
+        max_ring = max(
+            abs(center[0] - min_x),
+            abs(center[0] - max_x),
+            abs(center[1] - min_y),
+            abs(center[1] - max_y),
+        )
+
+        found: list[tuple[int, int, str]] = []
+        for ring in range(max_ring + 1):
+            for key in self._ring(center, ring):
+                for npc_id in self._buckets.get(key, ()):
+                    dist = self._distance(pos, self._positions[npc_id])
+                    if max_distance is not None and dist > max_distance:
+                        continue
+                    found.append((dist, self._ranks[npc_id], npc_id))
+
+            # Anything in a bucket outside this ring is at least this far away.
+            lower_bound = ring * self.bucket_size + 1
+            if max_distance is not None and lower_bound > max_distance:
+                break
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] < lower_bound:
+                    break
+
+        found.sort()
+        return [(dist, npc_id) for dist, _, npc_id in found[:k]]
+
+    def nearest(self, pos: Coord) -> tuple[int, str] | None:
+        result = self.nearest_k(pos, 1)
+        return result[0] if result else None
+
+    def within_radius(self, pos: Coord, radius: int) -> list[tuple[int, str]]:
+        if radius < 0 or self._bounds is None:
+            return []
+        lo = self._bucket_of((pos[0] - radius, pos[1] - radius))
+        hi = self._bucket_of((pos[0] + radius, pos[1] + radius))
+        found: list[tuple[int, int, str]] = []
+        for bx in range(lo[0], hi[0] + 1):
+            for by in range(lo[1], hi[1] + 1):
+                for npc_id in self._buckets.get((bx, by), ()):
+                    dist = self._distance(pos, self._positions[npc_id])
+                    if dist <= radius:
+                        found.append((dist, self._ranks[npc_id], npc_id))
+        found.sort()
+        return [(dist, npc_id) for dist, _, npc_id in found]
+
+    def nearest_reachable(
+        self,
+        start: Coord,
+        is_walkable: Callable[[Coord], bool],
+        max_steps: int,
+    ) -> tuple[int, str] | None:
+        """Breadth-first walk from ``start``; returns ``(steps, npc_id)`` for the
+        first NPC that becomes adjacent (or co-located) within ``max_steps``."""
+        if self._bounds is None:
+            return None
+
+        frontier = [start]
+        seen = {start}
+        for steps in range(max_steps + 1):
+            hits: list[tuple[int, str]] = []
+            for x, y in frontier:
+                for tile in ((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    for npc_id in self.at(tile):
+                        hits.append((self._ranks[npc_id], npc_id))
+            if hits:
+                return steps, min(hits)[1]
+
+            next_frontier: list[Coord] = []
+            for x, y in frontier:
+                for nxt in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    if nxt not in seen and is_walkable(nxt):
+                        seen.add(nxt)
+                        next_frontier.append(nxt)
+            if not next_frontier:
+                return None
+            frontier = next_frontier
+        return None
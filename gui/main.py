@@ -1,14 +1,13 @@
 from __future__ import annotations
 
-import json
 import sys
-import time
+from collections import deque
 from dataclasses import replace
 from pathlib import Path
 from typing import Optional
 
-from PyQt6.QtCore import QTimer
-from PyQt6.QtGui import QColor, QPainter, QBrush, QPen
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QBrush, QPen, QPixmap
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -17,7 +16,7 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QPushButton,
     QLabel,
-    QTextEdit,
+    QListView,
     QSpinBox,
     QGroupBox,
     QFormLayout,
@@ -32,7 +31,49 @@ from bot_core.runtime import load_app_config, build_adapters
 from bot_core.simulator.grid_world import GridWorldEnv
 from bot_core.states import build_default_states
 from bot_core.types import BotAction, Coord
-from bot_core.world_model import WorldModel
+from bot_core.live_worker import LiveSettings, LiveTelemetryWorker
+from bot_core.world_model import WorldModel, WorldView, obstacles_in_rect
+
+
+class _LiveFrameSignal(QObject):
+    # Emitted from the live worker thread; Qt queues it onto the UI thread.
+    frame_ready = pyqtSignal()
+
+
+class _LogListModel(QAbstractListModel):
+    """Ring buffer of log lines; the oldest rows drop once max_lines is hit."""
+
+    def __init__(self, max_lines: int = 5000, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.max_lines = max_lines
+        self._lines: deque[str] = deque()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._lines)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._lines[index.row()]
+
+    def append_lines(self, lines: list[str]):
+        lines = lines[-self.max_lines:]
+        if not lines:
+            return
+
+        overflow = len(self._lines) + len(lines) - self.max_lines
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self._lines.popleft()
+            self.endRemoveRows()
+
+        start = len(self._lines)
+        self.beginInsertRows(QModelIndex(), start, start + len(lines) - 1)
+        self._lines.extend(lines)
+        self.endInsertRows()
 
 
 class MapWidget(QWidget):
@@ -50,14 +91,17 @@ class MapWidget(QWidget):
         self.grid_height = height
         self.view_origin: Coord = (0, 0)
         self.resize_grid(width, height)
-        self.world: Optional[WorldModel] = None
+        self.world: Optional[WorldView] = None
+        # Grid lines and static obstacles; rebuilt only when _background_key changes.
+        self._background: Optional[QPixmap] = None
+        self._background_key: Optional[tuple] = None
 
     def resize_grid(self, width: int, height: int):
         self.grid_width = width
         self.grid_height = height
         self.setFixedSize(width * self.cell_size, height * self.cell_size)
 
-    def set_world(self, world: WorldModel):
+    def set_world(self, world: WorldView):
         self.world = world
 
         if world.width > self.max_visible_cells or world.height > self.max_visible_cells:
@@ -82,29 +126,20 @@ class MapWidget(QWidget):
             return local_x, local_y
         return None
 
-    def paintEvent(self, event):
-        if self.world is None:
-            return
-
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        for x in range(self.grid_width):
-            for y in range(self.grid_height):
-                painter.setPen(QPen(QColor(100, 100, 100), 1))
-                painter.drawRect(
-                    x * self.cell_size,
-                    (self.grid_height - 1 - y) * self.cell_size,
-                    self.cell_size,
-                    self.cell_size,
-                )
-
-        for obs in self.world.obstacles:
-            mapped = self._to_view(obs)
-            if mapped is None:
-                continue
-            ox, oy = mapped
-            painter.setBrush(QBrush(QColor(80, 80, 80)))
+    def _build_background(self, visible_obstacles: list[Coord]) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        width_px = self.grid_width * self.cell_size
+        height_px = self.grid_height * self.cell_size
+        pixmap = QPixmap(max(1, round(width_px * ratio)), max(1, round(height_px * ratio)))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self.palette().window().color())
+
+        painter = QPainter(pixmap)
+        painter.setBrush(QBrush(QColor(80, 80, 80)))
+        painter.setPen(QPen(QColor(100, 100, 100), 1))
+        for obs in visible_obstacles:
+            ox = obs[0] - self.view_origin[0]
+            oy = obs[1] - self.view_origin[1]
             painter.drawRect(
                 ox * self.cell_size,
                 (self.grid_height - 1 - oy) * self.cell_size,
@@ -112,6 +147,40 @@ class MapWidget(QWidget):
                 self.cell_size,
             )
 
+        for x in range(self.grid_width + 1):
+            painter.drawLine(x * self.cell_size, 0, x * self.cell_size, height_px)
+        for y in range(self.grid_height + 1):
+            painter.drawLine(0, y * self.cell_size, width_px, y * self.cell_size)
+        painter.end()
+        return pixmap
+
+    def _ensure_background(self) -> QPixmap:
+        assert self.world is not None
+        visible_obstacles = obstacles_in_rect(
+            self.world.obstacles, self.view_origin, self.grid_width, self.grid_height
+        )
+        key = (
+            self.view_origin,
+            self.grid_width,
+            self.grid_height,
+            self.cell_size,
+            self.devicePixelRatioF(),
+            frozenset(visible_obstacles),
+        )
+        if self._background is None or key != self._background_key:
+            self._background = self._build_background(visible_obstacles)
+            self._background_key = key
+        return self._background
+
+    def paintEvent(self, event):
+        if self.world is None:
+            return
+
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._ensure_background())
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(QColor(100, 100, 100), 1))
+
         mapped_target = self._to_view(self.world.target_pos)
         if mapped_target is not None:
             tx, ty = mapped_target
@@ -169,13 +238,10 @@ class BotGUI(QMainWindow):
         self.live_detail_log_path = Path(__file__).resolve().parents[1] / "runs" / "gui_live.jsonl"
         self.live_detail_log_max_bytes = 2_000_000
         self.live_detail_log_backups = 3
-        self.live_detail_log_error_reported = False
         self.live_ui_summary_every_ticks = 20
-        self.last_live_tick: Optional[int] = None
-        self.last_live_attack_tick: Optional[int] = None
-        self.last_live_summary_tick: Optional[int] = None
-        self.last_live_recommendation: Optional[str] = None
-        self.last_live_wait_log_time = 0.0
+        self.live_worker: Optional[LiveTelemetryWorker] = None
+        self.live_frame_signal = _LiveFrameSignal(self)
+        self.live_frame_signal.frame_ready.connect(self._on_live_frame)
         self.running = False
         self.tick_count = 0
         self.timer = QTimer(self)
@@ -288,15 +354,28 @@ class BotGUI(QMainWindow):
 
         log_group = QGroupBox("Log")
         log_layout = QVBoxLayout()
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(200)
-        log_layout.addWidget(self.log_text)
+        self.log_model = _LogListModel(parent=self)
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_model)
+        # Rows are only laid out when visible, so a full buffer costs the same to paint.
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setWordWrap(False)
+        self.log_view.setMaximumHeight(200)
+        log_layout.addWidget(self.log_view)
         log_group.setLayout(log_layout)
         right_panel.addWidget(log_group)
 
     def _log(self, msg: str):
-        self.log_text.append(msg)
+        self._log_lines([msg])
+
+    def _log_lines(self, lines: list[str]):
+        if not lines:
+            return
+        scrollbar = self.log_view.verticalScrollBar()
+        follow = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.append_lines(lines)
+        if follow:
+            self.log_view.scrollToBottom()
 
     def _on_settings_changed(self):
         if self.live_mode:
@@ -310,6 +389,9 @@ class BotGUI(QMainWindow):
         self.reset_btn.setEnabled(enabled)
 
     def _close_live_mode(self):
+        if self.live_worker:
+            self.live_worker.stop()
+            self.live_worker = None
         if self.live_perception and hasattr(self.live_perception, "close"):
             try:
                 getattr(self.live_perception, "close")()
@@ -318,58 +400,14 @@ class BotGUI(QMainWindow):
         self.live_perception = None
         self.live_runner = None
         self.live_world = None
-        self.last_live_tick = None
-        self.last_live_attack_tick = None
-        self.last_live_summary_tick = None
-        self.last_live_recommendation = None
-        self.last_live_wait_log_time = 0.0
-        self.live_detail_log_error_reported = False
-
-    def _rotate_live_detail_log_if_needed(self):
-        path = self.live_detail_log_path
-        if not path.exists():
-            return
-        if path.stat().st_size < self.live_detail_log_max_bytes:
-            return
-
-        oldest = path.with_name(f"{path.name}.{self.live_detail_log_backups}")
-        if oldest.exists():
-            oldest.unlink()
 
-        for idx in range(self.live_detail_log_backups - 1, 0, -1):
-            src = path.with_name(f"{path.name}.{idx}")
-            dst = path.with_name(f"{path.name}.{idx + 1}")
-            if src.exists():
-                if dst.exists():
-                    dst.unlink()
-                src.rename(dst)
-
-        path.rename(path.with_name(f"{path.name}.1"))
-
-    def _write_live_detail_log(self, row: dict[str, object]):
-        if not self.live_detail_file_log_check.isChecked():
-            return
-
-        try:
-            self.live_detail_log_path.parent.mkdir(parents=True, exist_ok=True)
-            self._rotate_live_detail_log_if_needed()
-            payload = {"ts": time.time(), **row}
-            with self.live_detail_log_path.open("a", encoding="utf-8") as logfile:
-                logfile.write(json.dumps(payload, ensure_ascii=True) + "\n")
-            self.live_detail_log_error_reported = False
-        except Exception as exc:
-            if not self.live_detail_log_error_reported:
-                self._log(f"Canlı detay log yazılamadı: {exc}")
-                self.live_detail_log_error_reported = True
-
-    def _should_emit_live_summary(self, tick: int, recommendation: str) -> bool:
-        if self.live_verbose_ui_log_check.isChecked():
-            return True
-        if self.last_live_summary_tick is None:
-            return True
-        if recommendation != self.last_live_recommendation:
-            return True
-        return tick - self.last_live_summary_tick >= self.live_ui_summary_every_ticks
+    def _live_settings(self) -> LiveSettings:
+        return LiveSettings(
+            max_ticks=self.max_ticks_spin.value(),
+            unlimited_ticks=self.live_unlimited_ticks_check.isChecked(),
+            verbose_ui_log=self.live_verbose_ui_log_check.isChecked(),
+            detail_file_log=self.live_detail_file_log_check.isChecked(),
+        )
 
     def _enable_live_mode(self, auto: bool = False):
         if self.running:
@@ -394,14 +432,20 @@ class BotGUI(QMainWindow):
             perception, runner = build_adapters(app_config)
             self.live_perception = perception
             self.live_runner = runner
+            self.live_worker = LiveTelemetryWorker(
+                perception,
+                runner,
+                on_frame=self.live_frame_signal.frame_ready.emit,
+                detail_log_path=self.live_detail_log_path,
+                detail_log_max_bytes=self.live_detail_log_max_bytes,
+                detail_log_backups=self.live_detail_log_backups,
+                summary_every_ticks=self.live_ui_summary_every_ticks,
+                observe_timeout_s=short_timeout_cfg.observe_timeout_s,
+            )
             self.live_mode = True
             self.running = False
             self.timer.stop()
             self.tick_count = 0
-            self.last_live_tick = None
-            self.last_live_attack_tick = None
-            self.last_live_summary_tick = None
-            self.last_live_recommendation = None
             max_ticks = max(
                 self.max_ticks_spin.minimum(),
                 min(self.max_ticks_spin.maximum(), app_config.engine.max_ticks),
@@ -449,83 +493,26 @@ class BotGUI(QMainWindow):
             return
         self._enable_live_mode(auto=False)
 
-    def _step_live_tick(self):
-        if not self.live_perception:
-            self._log("Canlı tick error: perception yok")
-            self._stop_bot()
-            return
-
-        live_unlimited = self.live_unlimited_ticks_check.isChecked()
-        if not live_unlimited and self.tick_count >= self.max_ticks_spin.value():
-            self._log("Max tick reached!")
-            self._stop_bot()
+    def _on_live_frame(self):
+        if not self.live_worker:
             return
-
-        try:
-            world = self.live_perception.observe()
-        except Exception as exc:
-            now = time.monotonic()
-            if now - self.last_live_wait_log_time >= 5.0:
-                self._log(f"Canlı veri bekleniyor: {exc}")
-                self.last_live_wait_log_time = now
+        frame = self.live_worker.take_frame()
+        if frame is None:
             return
 
-        self.live_world = world
-        recommendation = str(world.meta.get("attack_recommendation", "no_target"))
-        nearest_distance = world.meta.get("nearest_scorpion_distance")
-
-        self.state_label.setText("State: live")
-        self.tick_label.setText(f"Tick: {world.tick}")
-        self._update_map()
-
-        if self.last_live_tick != world.tick:
-            self.last_live_tick = world.tick
-            self.tick_count += 1
+        self._log_lines(list(frame.logs))
 
-            auto_attack_message = None
-            if (
-                self.running
-                and self.live_runner
-                and recommendation == "attack_now"
-                and self.last_live_attack_tick != world.tick
-            ):
-                self.last_live_attack_tick = world.tick
-                result = self.live_runner.execute(BotAction(kind="attack"))
-                auto_attack_message = result.message
-                self._log(f"[live-action] attack -> {result.message}")
-
-            if self._should_emit_live_summary(int(world.tick), recommendation):
-                self.last_live_summary_tick = int(world.tick)
-                self._log(
-                    "[live] "
-                    f"tick={world.tick} "
-                    f"player={world.bot_pos} "
-                    f"npc_count={world.meta.get('nearby_scorpion_count', 0)} "
-                    f"nearest={nearest_distance} "
-                    f"rec={recommendation}"
-                )
-
-            self.last_live_recommendation = recommendation
+        self.tick_count = frame.tick_count
+        if frame.world is not None:
+            self.live_world = frame.world
+            self.state_label.setText("State: live")
+            self.tick_label.setText(f"Tick: {frame.world.tick}")
+            self._update_map()
 
-            best_target_id = None
-            best_target = world.meta.get("best_target")
-            if isinstance(best_target, dict):
-                best_target_id = best_target.get("id")
-
-            self._write_live_detail_log(
-                {
-                    "tick": world.tick,
-                    "processed_live_ticks": self.tick_count,
-                    "player_pos": list(world.bot_pos),
-                    "npc_count": world.meta.get("nearby_scorpion_count", 0),
-                    "nearest_scorpion_distance": nearest_distance,
-                    "risk_level": world.meta.get("risk_level", "none"),
-                    "attack_recommendation": recommendation,
-                    "can_attack_now": bool(world.meta.get("can_attack_now", False)),
-                    "best_target_id": best_target_id,
-                    "auto_attack_result": auto_attack_message,
-                }
-            )
+        if frame.stop_reason:
+            self._log(frame.stop_reason)
+            if self.running:
+                self._stop_bot()
 
     @staticmethod
     def _distance(pos1: Coord, pos2: Coord) -> int:
@@ -611,14 +598,9 @@ class BotGUI(QMainWindow):
             return
 
         if self.live_mode:
-            if not self.live_perception:
+            if not self.live_worker:
                 self._log("Canlı mod hazır değil")
                 return
-            self.last_live_tick = None
-            self.last_live_attack_tick = None
-            self.last_live_summary_tick = None
-            self.last_live_recommendation = None
-            self.last_live_wait_log_time = 0.0
             self.running = True
             self.start_btn.setEnabled(False)
             self.stop_btn.setEnabled(True)
@@ -627,7 +609,7 @@ class BotGUI(QMainWindow):
             else:
                 self.status_label.setText("Durum: Canlı Veri Dinleniyor")
             self._log("Canlı veri akışı başlatıldı")
-            self.timer.start(100)
+            self.live_worker.start_running(self._live_settings())
             return
 
         if not self.env:
@@ -668,13 +650,11 @@ class BotGUI(QMainWindow):
         self.stop_btn.setEnabled(False)
         self.status_label.setText("Durum: Durduruldu")
         self.timer.stop()
+        if self.live_worker:
+            self.live_worker.pause()
         self._log("Bot durduruldu")
 
     def _step_tick(self):
-        if self.live_mode:
-            self._step_live_tick()
-            return
-
         if not self.env or not self.runner or not self.fsm or not self.ctx:
             return
 
@@ -711,7 +691,10 @@ class BotGUI(QMainWindow):
 
     def _step_bot(self):
         if self.live_mode:
-            self._step_live_tick()
+            if self.live_worker:
+                self.live_worker.step_once(self._live_settings())
+            else:
+                self._log("Canlı tick error: perception yok")
             return
 
         if (
@@ -752,30 +735,44 @@ class BotGUI(QMainWindow):
                 f"(öneri={recommendation}, can_attack_now={can_attack_now}, "
                 f"target={best_target_id})"
             )
-            self._write_live_detail_log(
-                {
-                    "tick": self.live_world.tick if self.live_world else None,
-                    "event": "manual_attack",
-                    "result": result.message,
-                    "attack_recommendation": recommendation,
-                    "can_attack_now": can_attack_now,
-                    "best_target_id": best_target_id,
-                }
-            )
+            logs: list[str] = []
+            if self.live_worker:
+                self.live_worker.write_detail_log(
+                    {
+                        "tick": self.live_world.tick if self.live_world else None,
+                        "event": "manual_attack",
+                        "result": result.message,
+                        "attack_recommendation": recommendation,
+                        "can_attack_now": can_attack_now,
+                        "best_target_id": best_target_id,
+                    },
+                    self._live_settings(),
+                    logs,
+                )
+            self._log_lines(logs)
             return
 
         if not self.env or not self.runner:
             return
 
         try:
-            alive_npcs = [npc for npc in self.env.state.npcs.values() if npc.alive]
-            if not alive_npcs:
+            if len(self.env.npc_index) == 0:
                 self._log("Saldırı: canlı hedef yok")
                 self._update_map()
                 return
 
             bot_pos = self.env.state.bot_pos
-            target_npc = min(alive_npcs, key=lambda npc: self._distance(bot_pos, npc.pos))
+            reachable = self.env.npc_index.nearest_reachable(
+                bot_pos,
+                self.env.is_walkable,
+                max_steps=self.env.state.width * self.env.state.height,
+            )
+            if reachable is None:
+                self._log("Saldırı: menzile yaklaşmak için yol bulunamadı")
+                self._update_map()
+                return
+
+            target_npc = self.env.state.npcs[reachable[1]]
             dist = self._distance(bot_pos, target_npc.pos)
 
             if dist > 1:
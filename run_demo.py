@@ -25,13 +25,13 @@ def main() -> None:
     if hasattr(perception, "listen_port"):
         print(f"telemetry_listen_port={getattr(perception, 'listen_port')}")
 
-    engine = BotEngine.default(
-        perception=perception,
-        runner=runner,
-        config=app_config.engine,
-    )
     try:
-        result = engine.run()
+        with BotEngine.default(
+            perception=perception,
+            runner=runner,
+            config=app_config.engine,
+        ) as engine:
+            result = engine.run()
     except RuntimeError as exc:
         print(f"run_error={exc}")
         return
@@ -46,6 +46,10 @@ def main() -> None:
     print(f"ticks={result.ticks}")
     print(f"final_state={result.final_state}")
     print(f"log_path={result.log_path}")
+    if result.stats is not None:
+        print(f"observations={result.stats.observations}")
+        print(f"action_counts={result.stats.action_counts}")
+        print(f"ticks_per_s={result.stats.ticks_per_s:.1f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from bot_core.loadgen import LoadGenConfig, run_load
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Telemetry ingest load generator")
+    parser.add_argument(
+        "--url",
+        default=None,
+        help="Target /tick endpoint; omit to start an in-process server and measure e2e latency",
+    )
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent simulated clients")
+    parser.add_argument(
+        "--rate-hz",
+        type=float,
+        default=10.0,
+        help="Snapshots per second per client (0 = as fast as possible)",
+    )
+    parser.add_argument("--duration-s", type=float, default=5.0, help="Run duration")
+    parser.add_argument("--npc-count", type=int, default=20, help="Scorpions per snapshot")
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        default=None,
+        help="JSONL file of TickSnapshot payloads to replay instead of synthesizing",
+    )
+    parser.add_argument("--timeout-s", type=float, default=1.0, help="Per-request timeout")
+    parser.add_argument(
+        "--format",
+        choices=["json", "binary", "stream"],
+        default="json",
+        help="Wire format to send",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for synthesized payloads")
+    args = parser.parse_args()
+
+    report = run_load(
+        LoadGenConfig(
+            url=args.url,
+            clients=args.clients,
+            rate_hz=args.rate_hz,
+            duration_s=args.duration_s,
+            npc_count=args.npc_count,
+            request_timeout_s=args.timeout_s,
+            replay_path=args.replay,
+            seed=args.seed,
+            wire_format=args.format,
+        )
+    )
+
+    for key, value in report.summary().items():
+        print(f"{key}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+
+from bot_core.cooperative import CooperativePlanner, random_scenario, run_cooperative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cooperative multi-agent planner benchmark")
+    parser.add_argument(
+        "--agents",
+        default="2,10,50,100,200",
+        help="Comma separated agent counts to run",
+    )
+    parser.add_argument("--size", type=int, default=48, help="Map width and height")
+    parser.add_argument("--obstacles", type=float, default=0.1, help="Fraction of blocked tiles")
+    parser.add_argument("--window", type=int, default=8, help="Reservation window in ticks")
+    parser.add_argument("--max-ticks", type=int, default=400, help="Stop a run after this many ticks")
+    parser.add_argument("--seed", type=int, default=0, help="RNG seed for map and endpoints")
+    args = parser.parse_args()
+
+    print("agents ticks arrived rejected replans ms_per_tick moves_per_s")
+    for count in (int(part) for part in args.agents.split(",") if part.strip()):
+        env = random_scenario(count, size=args.size, obstacle_density=args.obstacles, seed=args.seed)
+        planner = CooperativePlanner(
+            env.state.width, env.state.height, env.state.obstacles, window=args.window
+        )
+        result = run_cooperative(env, planner, max_ticks=args.max_ticks)
+        ms_per_tick = result.elapsed_s * 1000.0 / max(1, result.ticks)
+        print(
+            f"{result.agents} {result.ticks} {result.arrived} {result.rejected} "
+            f"{result.replans} {ms_per_tick:.2f} {result.moves_per_s:.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+package com.asugan.telemetry;
+
+final class NpcRecord
+{
+    final int index;
+    final int id;
+    final String name;
+    final int x;
+    final int y;
+    final int distance;
+
+    NpcRecord(int index, int id, String name, int x, int y, int distance)
+    {
+        this.index = index;
+        this.id = id;
+        this.name = name;
+        this.x = x;
+        this.y = y;
+        this.distance = distance;
+    }
+
+    boolean samePosition(NpcRecord other)
+    {
+        return other != null && other.x == x && other.y == y;
+    }
+}
@@ -37,6 +37,66 @@ public interface TelemetryBridgeConfig extends Config
         return 350;
     }
 
+    @ConfigItem(
+        keyName = "deltaEncoding",
+        name = "Delta Encoding",
+        description = "Send keyframes plus per-tick deltas instead of full snapshots"
+    )
+    default boolean deltaEncoding()
+    {
+        return false;
+    }
+
+    @ConfigItem(
+        keyName = "keyframeInterval",
+        name = "Keyframe Interval (ticks)",
+        description = "Send a full keyframe at least every N ticks in delta mode"
+    )
+    default int keyframeInterval()
+    {
+        return 50;
+    }
+
+    @ConfigItem(
+        keyName = "binaryEncoding",
+        name = "Binary Encoding",
+        description = "Send compact binary snapshots when the receiver advertises support"
+    )
+    default boolean binaryEncoding()
+    {
+        return false;
+    }
+
+    @ConfigItem(
+        keyName = "streamingEnabled",
+        name = "Streaming Ingest",
+        description = "Send JSON snapshots as NDJSON lines over one long-lived connection"
+    )
+    default boolean streamingEnabled()
+    {
+        return false;
+    }
+
+    @ConfigItem(
+        keyName = "sharedMemoryEnabled",
+        name = "Shared Memory Transport",
+        description = "Write binary snapshots into a local memory-mapped ring file instead of HTTP"
+    )
+    default boolean sharedMemoryEnabled()
+    {
+        return false;
+    }
+
+    @ConfigItem(
+        keyName = "sharedMemoryPath",
+        name = "Shared Memory Path",
+        description = "Ring file path shared with the Python reader (runelite_http.shm_path)"
+    )
+    default String sharedMemoryPath()
+    {
+        return System.getProperty("java.io.tmpdir") + "/osrs-telemetry.ring";
+    }
+
     @ConfigItem(
         keyName = "centerOverlayEnabled",
         name = "Center Overlay",
@@ -58,13 +58,18 @@ public class TelemetryBridgePlugin extends Plugin
     private static final Pattern KIND_PATTERN = Pattern.compile("\\\"kind\\\"\\s*:\\s*\\\"([^\\\"]+)\\\"");
     private static final Pattern TARGET_ID_PATTERN = Pattern.compile("\\\"target_id\\\"\\s*:\\s*(-?\\d+)");
     private static final String ACTION_PATH = "/action";
+    private static final String KEYFRAME_HEADER = "X-Telemetry-Keyframe";
+    private static final String ACCEPT_HEADER = "X-Telemetry-Accept";
     private static final java.util.Random RANDOM = new java.util.Random();
+    private static final int RING_SLOT_COUNT = 8;
+    private static final int RING_SLOT_SIZE = 4096;
 
     private final HttpClient httpClient = HttpClient.newBuilder()
         .connectTimeout(Duration.ofSeconds(2))
         .build();
 
     private final ExecutorService executorService = Executors.newSingleThreadExecutor();
+    private final TelemetryDeltaEncoder deltaEncoder = new TelemetryDeltaEncoder();
     private Robot robot;
 
     @Inject
@@ -83,7 +88,10 @@ public class TelemetryBridgePlugin extends Plugin
     private TelemetryCenterOverlay centerOverlay;
 
     private URI endpointUri;
+    private volatile TelemetryRingWriter ringWriter;
+    private volatile TelemetryStreamSender streamSender;
     private HttpServer actionServer;
+    private volatile boolean binaryAccepted = false;
     private volatile int nearbyScorpionCount = 0;
     private volatile int nearestScorpionDistance = Integer.MAX_VALUE;
     private volatile String nearestScorpionName = "Scorpion";
@@ -106,6 +114,8 @@ public class TelemetryBridgePlugin extends Plugin
             LOG.warning("Failed to initialize Robot for mouse control: " + e.getMessage());
         }
         refreshEndpoint();
+        refreshStreamSender();
+        refreshRingWriter();
         restartActionServer();
         overlayManager.add(centerOverlay);
         LOG.info("Telemetry Bridge started");
@@ -115,6 +125,8 @@ public class TelemetryBridgePlugin extends Plugin
     protected void shutDown()
     {
         stopActionServer();
+        closeRingWriter();
+        closeStreamSender();
         overlayManager.remove(centerOverlay);
         clearOverlayState();
         executorService.shutdownNow();
@@ -132,6 +144,27 @@ public class TelemetryBridgePlugin extends Plugin
         if ("endpoint".equals(event.getKey()))
         {
             refreshEndpoint();
+            refreshStreamSender();
+            binaryAccepted = false;
+            deltaEncoder.requestKeyframe();
+            return;
+        }
+
+        if ("streamingEnabled".equals(event.getKey()))
+        {
+            refreshStreamSender();
+            return;
+        }
+
+        if ("sharedMemoryEnabled".equals(event.getKey()) || "sharedMemoryPath".equals(event.getKey()))
+        {
+            refreshRingWriter();
+            return;
+        }
+
+        if ("deltaEncoding".equals(event.getKey()))
+        {
+            deltaEncoder.requestKeyframe();
             return;
         }
 
@@ -180,7 +213,8 @@ public class TelemetryBridgePlugin extends Plugin
         nearestScorpionDistance = scan.nearestDistance;
         nearestScorpionName = scan.nearestName;
 
-        if (endpointUri == null)
+        TelemetryRingWriter ring = ringWriter;
+        if (ring == null && endpointUri == null)
         {
             return;
         }
@@ -197,15 +231,54 @@ public class TelemetryBridgePlugin extends Plugin
             scan.nearbyScorpionsJson
         );
 
-        HttpRequest request = HttpRequest.newBuilder(endpointUri)
-            .header("Content-Type", "application/json")
-            .timeout(Duration.ofMillis(config.requestTimeoutMs()))
-            .POST(HttpRequest.BodyPublishers.ofString(snapshot.toJson()))
-            .build();
+        if (ring != null)
+        {
+            if (!ring.write(snapshot.toBinary(scan.records)))
+            {
+                LOG.log(Level.FINE, "Telemetry snapshot larger than ring slot, dropped");
+            }
+            return;
+        }
+
+        HttpRequest.Builder requestBuilder = HttpRequest.newBuilder(endpointUri)
+            .timeout(Duration.ofMillis(config.requestTimeoutMs()));
 
-        httpClient.sendAsync(request, HttpResponse.BodyHandlers.discarding())
+        // Binary is only used once the receiver has advertised support for it.
+        if (config.binaryEncoding() && binaryAccepted)
+        {
+            requestBuilder
+                .header("Content-Type", TickSnapshot.BINARY_CONTENT_TYPE)
+                .POST(HttpRequest.BodyPublishers.ofByteArray(snapshot.toBinary(scan.records)));
+        }
+        else
+        {
+            String body = config.deltaEncoding()
+                ? deltaEncoder.encode(snapshot, scan.records, config.keyframeInterval())
+                : snapshot.toJson();
+            TelemetryStreamSender stream = streamSender;
+            if (stream != null && stream.send(body))
+            {
+                return;
+            }
+            requestBuilder
+                .header("Content-Type", "application/json")
+                .POST(HttpRequest.BodyPublishers.ofString(body));
+        }
+
+        httpClient.sendAsync(requestBuilder.build(), HttpResponse.BodyHandlers.discarding())
+            .thenAccept(response -> {
+                if (response.headers().firstValue(KEYFRAME_HEADER).isPresent())
+                {
+                    deltaEncoder.requestKeyframe();
+                }
+                binaryAccepted = response.headers()
+                    .allValues(ACCEPT_HEADER)
+                    .stream()
+                    .anyMatch(value -> value.contains(TickSnapshot.BINARY_CONTENT_TYPE));
+            })
             .exceptionally(ex -> {
                 LOG.log(Level.FINE, "Telemetry send failed: " + ex.getMessage());
+                deltaEncoder.requestKeyframe();
                 return null;
             });
     }
@@ -633,6 +706,72 @@ public class TelemetryBridgePlugin extends Plugin
         exchange.close();
     }
 
+    private void refreshStreamSender()
+    {
+        closeStreamSender();
+        if (!config.streamingEnabled() || endpointUri == null)
+        {
+            return;
+        }
+        streamSender = new TelemetryStreamSender(
+            endpointUri,
+            config.requestTimeoutMs(),
+            deltaEncoder::requestKeyframe
+        );
+    }
+
+    private void closeStreamSender()
+    {
+        TelemetryStreamSender stream = streamSender;
+        streamSender = null;
+        if (stream != null)
+        {
+            stream.close();
+        }
+    }
+
+    private void refreshRingWriter()
+    {
+        closeRingWriter();
+        if (!config.sharedMemoryEnabled())
+        {
+            return;
+        }
+
+        String path = config.sharedMemoryPath();
+        try
+        {
+            ringWriter = new TelemetryRingWriter(
+                java.nio.file.Paths.get(path),
+                RING_SLOT_COUNT,
+                RING_SLOT_SIZE
+            );
+            LOG.info("Telemetry ring writer open: " + path);
+        }
+        catch (IOException | RuntimeException ex)
+        {
+            ringWriter = null;
+            LOG.warning("Telemetry ring open failed, falling back to HTTP: " + ex.getMessage());
+        }
+    }
+
+    private void closeRingWriter()
+    {
+        TelemetryRingWriter ring = ringWriter;
+        ringWriter = null;
+        if (ring != null)
+        {
+            try
+            {
+                ring.close();
+            }
+            catch (IOException ex)
+            {
+                LOG.log(Level.FINE, "Telemetry ring close failed: " + ex.getMessage());
+            }
+        }
+    }
+
     private void refreshEndpoint()
     {
         String endpoint = config.endpoint();
@@ -682,6 +821,7 @@ public class TelemetryBridgePlugin extends Plugin
     private ScorpionScanResult scanNearbyScorpions(WorldPoint localPos)
     {
         StringBuilder sb = new StringBuilder("[");
+        java.util.List<NpcRecord> records = new java.util.ArrayList<>();
         int count = 0;
         int nearestDistance = Integer.MAX_VALUE;
         String nearestName = "Scorpion";
@@ -730,12 +870,16 @@ public class TelemetryBridgePlugin extends Plugin
                 sb.append(',');
             }
 
-            sb.append('{')
-                .append("\"id\":").append(npc.getId()).append(',')
-                .append("\"name\":\"").append(escapeJson(name)).append("\",")
-                .append("\"pos\":[").append(npcPos.getX()).append(',').append(npcPos.getY()).append("],")
-                .append("\"distance\":").append(distance)
-                .append('}');
+            NpcRecord record = new NpcRecord(
+                npc.getIndex(),
+                npc.getId(),
+                name,
+                npcPos.getX(),
+                npcPos.getY(),
+                distance
+            );
+            records.add(record);
+            sb.append(TickSnapshot.npcJson(record));
 
             count++;
             if (count >= MAX_SCORPIONS_PER_TICK)
@@ -745,39 +889,27 @@ public class TelemetryBridgePlugin extends Plugin
         }
 
         sb.append(']');
-        return new ScorpionScanResult(sb.toString(), count, nearestDistance, nearestName);
-    }
-
-    private static String escapeJson(String raw)
-    {
-        StringBuilder out = new StringBuilder(raw.length() + 8);
-        for (int i = 0; i < raw.length(); i++)
-        {
-            char c = raw.charAt(i);
-            if (c == '"' || c == '\\')
-            {
-                out.append('\\');
-            }
-            out.append(c);
-        }
-        return out.toString();
+        return new ScorpionScanResult(sb.toString(), records, count, nearestDistance, nearestName);
     }
 
     private static final class ScorpionScanResult
     {
         private final String nearbyScorpionsJson;
+        private final java.util.List<NpcRecord> records;
         private final int count;
         private final int nearestDistance;
         private final String nearestName;
 
         private ScorpionScanResult(
             String nearbyScorpionsJson,
+            java.util.List<NpcRecord> records,
             int count,
             int nearestDistance,
             String nearestName
         )
         {
             this.nearbyScorpionsJson = nearbyScorpionsJson;
+            this.records = records;
             this.count = count;
             this.nearestDistance = nearestDistance;
             this.nearestName = nearestName;
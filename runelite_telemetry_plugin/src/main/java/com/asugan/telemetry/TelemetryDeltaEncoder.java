@@ -0,0 +1,126 @@
+package com.asugan.telemetry;
+
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+
+/**
+ * Stateful encoder for the optional delta protocol.
+ *
+ * Sends a full keyframe every {@code keyframeInterval} ticks (or whenever the
+ * receiver asks for one) and otherwise only changed player fields plus
+ * added/moved/removed NPCs keyed by NPC index.
+ */
+final class TelemetryDeltaEncoder
+{
+    private final Map<Integer, NpcRecord> lastNpcs = new HashMap<>();
+    private int[] lastPlayer;
+    private long seq = 0;
+    private int ticksSinceKeyframe = 0;
+    private volatile boolean keyframeRequested = true;
+
+    void requestKeyframe()
+    {
+        keyframeRequested = true;
+    }
+
+    synchronized String encode(TickSnapshot snapshot, List<NpcRecord> npcs, int keyframeInterval)
+    {
+        seq++;
+        int[] player = snapshot.playerFields();
+
+        if (keyframeRequested || lastPlayer == null || ticksSinceKeyframe >= Math.max(1, keyframeInterval))
+        {
+            keyframeRequested = false;
+            ticksSinceKeyframe = 0;
+            remember(player, npcs);
+            return "{\"type\":\"keyframe\",\"seq\":" + seq + "," + snapshot.toJson().substring(1);
+        }
+
+        ticksSinceKeyframe++;
+        StringBuilder sb = new StringBuilder(128);
+        sb.append("{\"type\":\"delta\",\"seq\":").append(seq)
+            .append(",\"base_seq\":").append(seq - 1)
+            .append(",\"tick\":").append(snapshot.tick());
+
+        if (player[0] != lastPlayer[0] || player[1] != lastPlayer[1])
+        {
+            sb.append(",\"player_pos\":[").append(player[0]).append(',').append(player[1]).append(']');
+        }
+        String[] names = TickSnapshot.PLAYER_FIELD_NAMES;
+        for (int i = 2; i < player.length; i++)
+        {
+            if (player[i] != lastPlayer[i])
+            {
+                sb.append(",\"").append(names[i]).append("\":").append(player[i]);
+            }
+        }
+
+        StringBuilder added = new StringBuilder();
+        StringBuilder moved = new StringBuilder();
+        Map<Integer, NpcRecord> current = new HashMap<>();
+        for (NpcRecord npc : npcs)
+        {
+            current.put(npc.index, npc);
+            NpcRecord previous = lastNpcs.get(npc.index);
+            if (previous == null)
+            {
+                appendSeparator(added);
+                added.append(TickSnapshot.npcJson(npc));
+            }
+            else if (!npc.samePosition(previous))
+            {
+                appendSeparator(moved);
+                moved.append("{\"idx\":").append(npc.index)
+                    .append(",\"pos\":[").append(npc.x).append(',').append(npc.y).append("]}");
+            }
+        }
+
+        StringBuilder removed = new StringBuilder();
+        for (Integer index : lastNpcs.keySet())
+        {
+            if (!current.containsKey(index))
+            {
+                appendSeparator(removed);
+                removed.append(index);
+            }
+        }
+
+        if (added.length() > 0)
+        {
+            sb.append(",\"npcs_added\":[").append(added).append(']');
+        }
+        if (moved.length() > 0)
+        {
+            sb.append(",\"npcs_moved\":[").append(moved).append(']');
+        }
+        if (removed.length() > 0)
+        {
+            sb.append(",\"npcs_removed\":[").append(removed).append(']');
+        }
+        sb.append('}');
+
+        lastPlayer = player;
+        lastNpcs.clear();
+        lastNpcs.putAll(current);
+        return sb.toString();
+    }
+
+    private void remember(int[] player, List<NpcRecord> npcs)
+    {
+        lastPlayer = player;
+        lastNpcs.clear();
+        for (NpcRecord npc : npcs)
+        {
+            lastNpcs.put(npc.index, npc);
+        }
+    }
+
+    private static void appendSeparator(StringBuilder sb)
+    {
+        if (sb.length() > 0)
+        {
+            sb.append(',');
+        }
+    }
+}
@@ -0,0 +1,132 @@
+package com.asugan.telemetry;
+
+import java.io.IOException;
+import java.lang.invoke.MethodHandles;
+import java.lang.invoke.VarHandle;
+import java.nio.ByteOrder;
+import java.nio.MappedByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.StandardOpenOption;
+
+/**
+ * Writes binary snapshots into a memory-mapped ring file shared with the
+ * Python reader (bot_core/adapters/telemetry_shm.py).
+ *
+ * Each slot is a seqlock: seq_begin is stored first, then the payload, then
+ * seq_end. A store-store fence after seq_begin keeps payload bytes from
+ * becoming visible before it, and the release store of seq_end keeps them
+ * from becoming visible after it, so a reader that sees equal sequence
+ * numbers before and after copying the payload got an untorn snapshot.
+ */
+final class TelemetryRingWriter implements AutoCloseable
+{
+    private static final byte[] MAGIC = "TRNG".getBytes(StandardCharsets.US_ASCII);
+    private static final int VERSION = 1;
+    private static final int HEADER_SIZE = 64;
+    private static final int WRITE_SEQ_OFFSET = 16;
+    private static final int SLOT_HEADER_SIZE = 24;
+    private static final VarHandle LONG_VIEW =
+        MethodHandles.byteBufferViewVarHandle(long[].class, ByteOrder.LITTLE_ENDIAN);
+
+    private final FileChannel channel;
+    private final MappedByteBuffer buffer;
+    private final int slotCount;
+    private final int slotSize;
+    private long seq;
+
+    TelemetryRingWriter(Path path, int defaultSlotCount, int defaultSlotSize) throws IOException
+    {
+        Path parent = path.toAbsolutePath().getParent();
+        if (parent != null)
+        {
+            Files.createDirectories(parent);
+        }
+        channel = FileChannel.open(
+            path,
+            StandardOpenOption.CREATE,
+            StandardOpenOption.READ,
+            StandardOpenOption.WRITE
+        );
+
+        int[] geometry = readGeometry();
+        boolean fresh = geometry == null;
+        if (fresh)
+        {
+            geometry = new int[] {defaultSlotCount, defaultSlotSize};
+            channel.truncate(0);
+        }
+        slotCount = geometry[0];
+        slotSize = geometry[1];
+
+        long size = HEADER_SIZE + (long) slotCount * slotSize;
+        buffer = channel.map(FileChannel.MapMode.READ_WRITE, 0, size);
+        buffer.order(ByteOrder.LITTLE_ENDIAN);
+
+        if (fresh)
+        {
+            buffer.put(0, MAGIC);
+            buffer.putInt(4, VERSION);
+            buffer.putInt(8, slotCount);
+            buffer.putInt(12, slotSize);
+            LONG_VIEW.setRelease(buffer, WRITE_SEQ_OFFSET, 0L);
+        }
+        seq = (long) LONG_VIEW.getAcquire(buffer, WRITE_SEQ_OFFSET);
+    }
+
+    private int[] readGeometry() throws IOException
+    {
+        long fileSize = channel.size();
+        if (fileSize < HEADER_SIZE)
+        {
+            return null;
+        }
+
+        java.nio.ByteBuffer header = java.nio.ByteBuffer.allocate(16).order(ByteOrder.LITTLE_ENDIAN);
+        channel.read(header, 0);
+        header.flip();
+        byte[] magic = new byte[4];
+        header.get(magic);
+        int version = header.getInt();
+        int count = header.getInt();
+        int size = header.getInt();
+        if (!java.util.Arrays.equals(magic, MAGIC) || version != VERSION)
+        {
+            return null;
+        }
+        if (count < 1 || size <= SLOT_HEADER_SIZE || fileSize < HEADER_SIZE + (long) count * size)
+        {
+            return null;
+        }
+        return new int[] {count, size};
+    }
+
+    synchronized boolean write(byte[] payload)
+    {
+        if (payload.length > slotSize - SLOT_HEADER_SIZE)
+        {
+            return false;
+        }
+
+        long next = seq + 1;
+        int offset = HEADER_SIZE + (int) ((next - 1) % slotCount) * slotSize;
+
+        LONG_VIEW.setRelease(buffer, offset, next);
+        // setRelease only orders earlier stores; the payload comes after.
+        VarHandle.storeStoreFence();
+        buffer.put(offset + SLOT_HEADER_SIZE, payload);
+        buffer.putInt(offset + 16, payload.length);
+        LONG_VIEW.setRelease(buffer, offset + 8, next);
+        LONG_VIEW.setRelease(buffer, WRITE_SEQ_OFFSET, next);
+        seq = next;
+        return true;
+    }
+
+    @Override
+    public void close() throws IOException
+    {
+        channel.close();
+    }
+}
@@ -0,0 +1,211 @@
+package com.asugan.telemetry;
+
+import java.io.BufferedOutputStream;
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.net.InetSocketAddress;
+import java.net.Socket;
+import java.net.URI;
+import java.nio.charset.StandardCharsets;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.Locale;
+import java.util.concurrent.atomic.AtomicInteger;
+import java.util.logging.Level;
+import java.util.logging.Logger;
+
+/**
+ * Keeps one chunked POST open to the receiver's /stream path and writes one
+ * NDJSON line per snapshot. Connection failures back off exponentially; while
+ * the stream is down {@link #send} returns false so the caller can fall back
+ * to per-tick POSTs.
+ *
+ * <p>The receiver asks for a keyframe mid-stream (after a lost or rejected
+ * delta) with an interim {@code 103} response carrying
+ * {@code X-Telemetry-Keyframe}; a reader thread per connection watches for it,
+ * so recovery takes one tick instead of waiting for the keyframe interval.
+ */
+final class TelemetryStreamSender implements AutoCloseable
+{
+    private static final Logger LOG = Logger.getLogger(TelemetryStreamSender.class.getName());
+    private static final String STREAM_PATH = "/stream";
+    private static final long MIN_BACKOFF_MS = 500;
+    private static final long MAX_BACKOFF_MS = 10_000;
+    private static final int MAX_PENDING = 32;
+    private static final String KEYFRAME_HEADER = "x-telemetry-keyframe:";
+
+    private final String host;
+    private final int port;
+    private final int connectTimeoutMs;
+    // Run on every new connection and whenever the receiver asks for a keyframe.
+    private final Runnable requestKeyframe;
+    private final ExecutorService writer = Executors.newSingleThreadExecutor(runnable -> {
+        Thread thread = new Thread(runnable, "telemetry-stream");
+        thread.setDaemon(true);
+        return thread;
+    });
+    private final AtomicInteger pending = new AtomicInteger();
+
+    private Socket socket;
+    private OutputStream out;
+    private volatile long retryAtMs = 0;
+    private long backoffMs = MIN_BACKOFF_MS;
+    private volatile long linesSent = 0;
+    private volatile int reconnects = 0;
+
+    TelemetryStreamSender(URI endpoint, int connectTimeoutMs, Runnable requestKeyframe)
+    {
+        this.host = endpoint.getHost();
+        this.port = endpoint.getPort() > 0 ? endpoint.getPort() : 80;
+        this.connectTimeoutMs = connectTimeoutMs;
+        this.requestKeyframe = requestKeyframe;
+    }
+
+    boolean send(String line)
+    {
+        if (System.currentTimeMillis() < retryAtMs)
+        {
+            return false;
+        }
+        if (pending.incrementAndGet() > MAX_PENDING)
+        {
+            // The receiver is not keeping up; drop rather than queue stale ticks.
+            pending.decrementAndGet();
+            return false;
+        }
+
+        byte[] data = (line + "\n").getBytes(StandardCharsets.UTF_8);
+        writer.execute(() -> {
+            try
+            {
+                write(data);
+            }
+            finally
+            {
+                pending.decrementAndGet();
+            }
+        });
+        return true;
+    }
+
+    long linesSent()
+    {
+        return linesSent;
+    }
+
+    int reconnects()
+    {
+        return reconnects;
+    }
+
+    private void write(byte[] data)
+    {
+        try
+        {
+            if (out == null)
+            {
+                connect();
+            }
+            out.write(Integer.toHexString(data.length).getBytes(StandardCharsets.US_ASCII));
+            out.write('\r');
+            out.write('\n');
+            out.write(data);
+            out.write('\r');
+            out.write('\n');
+            out.flush();
+            linesSent++;
+            backoffMs = MIN_BACKOFF_MS;
+        }
+        catch (IOException ex)
+        {
+            LOG.log(Level.FINE, "Telemetry stream failed: " + ex.getMessage());
+            disconnect();
+            retryAtMs = System.currentTimeMillis() + backoffMs;
+            backoffMs = Math.min(backoffMs * 2, MAX_BACKOFF_MS);
+        }
+    }
+
+    private void connect() throws IOException
+    {
+        Socket next = new Socket();
+        next.setTcpNoDelay(true);
+        next.connect(new InetSocketAddress(host, port), connectTimeoutMs);
+        OutputStream stream = new BufferedOutputStream(next.getOutputStream());
+        String request = "POST " + STREAM_PATH + " HTTP/1.1\r\n"
+            + "Host: " + host + ":" + port + "\r\n"
+            + "Content-Type: application/x-ndjson\r\n"
+            + "Transfer-Encoding: chunked\r\n"
+            + "\r\n";
+        stream.write(request.getBytes(StandardCharsets.US_ASCII));
+        stream.flush();
+        socket = next;
+        out = stream;
+        reconnects++;
+        startResponseReader(next);
+        // A fresh stream has no shared history with the receiver.
+        requestKeyframe.run();
+    }
+
+    private void startResponseReader(Socket connection)
+    {
+        Thread reader = new Thread(() -> {
+            try (BufferedReader in = new BufferedReader(
+                new InputStreamReader(connection.getInputStream(), StandardCharsets.US_ASCII)))
+            {
+                String line;
+                while ((line = in.readLine()) != null)
+                {
+                    if (line.toLowerCase(Locale.ROOT).startsWith(KEYFRAME_HEADER))
+                    {
+                        requestKeyframe.run();
+                    }
+                }
+            }
+            catch (IOException ignored)
+            {
+                // The socket was closed; the writer reconnects on its own.
+            }
+        }, "telemetry-stream-reader");
+        reader.setDaemon(true);
+        reader.start();
+    }
+
+    private void disconnect()
+    {
+        Socket current = socket;
+        socket = null;
+        out = null;
+        if (current != null)
+        {
+            try
+            {
+                current.close();
+            }
+            catch (IOException ignored)
+            {
+            }
+        }
+    }
+
+    @Override
+    public void close()
+    {
+        writer.execute(() -> {
+            if (out != null)
+            {
+                try
+                {
+                    out.write("0\r\n\r\n".getBytes(StandardCharsets.US_ASCII));
+                    out.flush();
+                }
+                catch (IOException ignored)
+                {
+                }
+            }
+            disconnect();
+        });
+        writer.shutdown();
+    }
+}
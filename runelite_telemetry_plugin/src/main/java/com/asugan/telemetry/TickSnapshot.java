@@ -1,7 +1,28 @@
 package com.asugan.telemetry;
 
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+
 final class TickSnapshot
 {
+    static final String BINARY_CONTENT_TYPE = "application/vnd.osrs-telemetry.v1";
+    private static final int BINARY_VERSION = 1;
+    private static final int BINARY_HEADER_BYTES = 29;
+    private static final int BINARY_NPC_BYTES = 10;
+
+    static final String[] PLAYER_FIELD_NAMES = {
+        "x",
+        "y",
+        "plane",
+        "animation",
+        "pose_animation",
+        "health_ratio",
+        "health_scale"
+    };
+
     private final int tick;
     private final int x;
     private final int y;
@@ -35,6 +56,42 @@ final class TickSnapshot
         this.nearbyScorpionsJson = nearbyScorpionsJson;
     }
 
+    int tick()
+    {
+        return tick;
+    }
+
+    int[] playerFields()
+    {
+        return new int[] {x, y, plane, animation, poseAnimation, healthRatio, healthScale};
+    }
+
+    static String npcJson(NpcRecord npc)
+    {
+        return "{" +
+            "\"idx\":" + npc.index + "," +
+            "\"id\":" + npc.id + "," +
+            "\"name\":\"" + escapeJson(npc.name) + "\"," +
+            "\"pos\":[" + npc.x + "," + npc.y + "]," +
+            "\"distance\":" + npc.distance +
+            "}";
+    }
+
+    static String escapeJson(String raw)
+    {
+        StringBuilder out = new StringBuilder(raw.length() + 8);
+        for (int i = 0; i < raw.length(); i++)
+        {
+            char c = raw.charAt(i);
+            if (c == '"' || c == '\\')
+            {
+                out.append('\\');
+            }
+            out.append(c);
+        }
+        return out.toString();
+    }
+
     String toJson()
     {
         return "{" +
@@ -48,4 +105,66 @@ final class TickSnapshot
             "\"nearby_scorpions\":" + nearbyScorpionsJson +
             "}";
     }
+
+    /**
+     * Binary layout mirrored by bot_core/adapters/telemetry_binary.py: fixed
+     * header, a small NPC name table, then fixed-size NPC records with
+     * positions relative to the player.
+     */
+    byte[] toBinary(List<NpcRecord> npcs)
+    {
+        Map<String, Integer> nameRefs = new LinkedHashMap<>();
+        for (NpcRecord npc : npcs)
+        {
+            if (!nameRefs.containsKey(npc.name) && nameRefs.size() < 255)
+            {
+                nameRefs.put(npc.name, nameRefs.size());
+            }
+        }
+
+        byte[][] names = new byte[nameRefs.size()][];
+        int namesBytes = 0;
+        int i = 0;
+        for (String name : nameRefs.keySet())
+        {
+            byte[] raw = name.getBytes(StandardCharsets.UTF_8);
+            if (raw.length > 255)
+            {
+                raw = java.util.Arrays.copyOf(raw, 255);
+            }
+            names[i++] = raw;
+            namesBytes += 1 + raw.length;
+        }
+
+        ByteBuffer buf = ByteBuffer.allocate(
+            BINARY_HEADER_BYTES + namesBytes + npcs.size() * BINARY_NPC_BYTES
+        );
+        buf.put((byte) 'T').put((byte) 'B');
+        buf.put((byte) BINARY_VERSION).put((byte) 0);
+        buf.putInt(tick).putInt(x).putInt(y);
+        buf.put((byte) plane).put((byte) 0);
+        buf.putShort((short) animation)
+            .putShort((short) poseAnimation)
+            .putShort((short) healthRatio)
+            .putShort((short) healthScale);
+        buf.putShort((short) npcs.size());
+        buf.put((byte) names.length);
+
+        for (byte[] raw : names)
+        {
+            buf.put((byte) raw.length).put(raw);
+        }
+
+        for (NpcRecord npc : npcs)
+        {
+            Integer ref = nameRefs.get(npc.name);
+            buf.putShort((short) npc.index)
+                .putShort((short) npc.id)
+                .putShort((short) (npc.x - x))
+                .putShort((short) (npc.y - y))
+                .put((byte) Math.min(255, npc.distance))
+                .put((byte) (ref == null ? 255 : ref));
+        }
+        return buf.array();
+    }
 }
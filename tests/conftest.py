@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from bot_core.actions.simulated import SimulatedActionRunner
+from bot_core.engine import BotEngine, EngineConfig
+from bot_core.interfaces import IActionRunner, IPerception
+from bot_core.perception.simulated import SimulatedPerception
+from bot_core.simulator.grid_world import GridWorldEnv
+
+
+def _make_engine(
+    env: GridWorldEnv,
+    tmp_path: Path,
+    *,
+    max_ticks: int = 50,
+    max_retries: int = 3,
+    max_consecutive_failures: int = 10,
+    perception: IPerception | None = None,
+    runner: IActionRunner | None = None,
+    **overrides: object,
+) -> BotEngine:
+    """Engine on ``env``; ``overrides`` are further EngineConfig fields."""
+    return BotEngine.default(
+        perception=perception or SimulatedPerception(env),
+        runner=runner or SimulatedActionRunner(env),
+        config=EngineConfig(
+            max_ticks=max_ticks,
+            max_retries=max_retries,
+            max_consecutive_failures=max_consecutive_failures,
+            log_path=tmp_path / "latest.jsonl",
+            **overrides,  # type: ignore[arg-type]
+        ),
+    )
+
+
+@pytest.fixture
+def make_engine() -> Callable[..., BotEngine]:
+    return _make_engine
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from bot_core.batch_policy import BatchPolicy, run_batch
+from bot_core.simulator.batch_world import ACT_INTERACT, ACT_MOVE, BatchGridWorld
+from bot_core.simulator.grid_world import GridWorldEnv
+
+
+def _scenario(seed: int, count: int) -> tuple[set[tuple[int, int]], list, list]:
+    rng = random.Random(seed)
+    size = 16
+    obstacles = {(rng.randrange(size), rng.randrange(size)) for _ in range(50)}
+    # A sealed pocket: targets inside it are unreachable, so bots end in recover.
+    obstacles |= {(12, 12), (12, 13), (12, 14), (12, 15), (13, 12), (14, 12), (15, 12)}
+    obstacles -= {(14, 14)}
+    free = [(x, y) for y in range(size) for x in range(size) if (x, y) not in obstacles]
+    starts = [rng.choice(free) for _ in range(count)]
+    targets = [rng.choice(free) for _ in range(count - 2)] + [(14, 14), starts[-1]]
+    return obstacles, starts, targets
+
+
+def test_batch_policy_matches_reference_fsm(tmp_path: Path, make_engine) -> None:
+    obstacles, starts, targets = _scenario(seed=5, count=40)
+    world = BatchGridWorld(16, 16, starts, targets, obstacles)
+    batch = run_batch(world, BatchPolicy(world, max_retries=3), max_ticks=60)
+
+    for idx, (start, target) in enumerate(zip(starts, targets)):
+        env = GridWorldEnv(16, 16, bot_pos=start, target_pos=target, obstacles=obstacles)
+        engine = make_engine(
+            env,
+            tmp_path / str(idx),
+            max_ticks=60,
+            max_consecutive_failures=6,
+            profile="turbo",
+            use_distance_field=True,
+        )
+        expected = engine.run()
+
+        assert (batch.reasons[idx], batch.ticks[idx], batch.final_states[idx]) == (
+            expected.reason,
+            expected.ticks,
+            expected.final_state,
+        ), idx
+        assert world.bot_pos(idx) == env.state.bot_pos
+    assert {"completed", "max_retries"} <= set(batch.reasons)
+
+
+def test_decide_emits_action_arrays() -> None:
+    world = BatchGridWorld(5, 1, [(0, 0), (3, 0)], [(2, 0), (3, 0)])
+    policy = BatchPolicy(world)
+
+    policy.decide([0, 1])
+    policy.decide([0, 1])
+
+    assert list(policy.kind) == [ACT_MOVE, ACT_INTERACT]
+    assert (policy.target_x[0], policy.target_y[0]) == (1, 0)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from bot_core.actions.simulated import SimulatedActionRunner
+from bot_core.budget import DEFER_LOG, REUSE_PATH, SKIP_DOUBLE_OBSERVE, STALE_SKIP, TickBudget
+from bot_core.fsm import TickContext
+from bot_core.risk_grid import RiskCostGrid
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.states import NavigateState
+from bot_core.types import ActionResult, BotAction
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_ms(self, ms: float) -> None:
+        self.now += ms / 1000.0
+
+
+class _SlowRunner:
+    def __init__(self, inner: SimulatedActionRunner, delay_s: float) -> None:
+        self.inner = inner
+        self.delay_s = delay_s
+
+    def execute(self, action: BotAction) -> ActionResult:
+        time.sleep(self.delay_s)
+        return self.inner.execute(action)
+
+
+def test_tick_budget_tracks_phases_and_overruns() -> None:
+    clock = _FakeClock()
+    budget = TickBudget(tick_ms=100.0, smoothing=0.5, clock=clock)
+
+    budget.begin_tick()
+    budget.start_phase()
+    clock.advance_ms(40)
+    budget.end_phase("decide")
+    assert budget.estimate_ms("decide") == 40.0
+    assert budget.remaining_ms() == 60.0
+    assert budget.fits("decide")
+    assert budget.end_tick() == 0.0
+
+    budget.begin_tick()
+    budget.start_phase()
+    clock.advance_ms(120)
+    budget.end_phase("decide")
+    assert budget.estimate_ms("decide") == 80.0
+    assert not budget.fits("decide")
+    budget.degrade(REUSE_PATH)
+    assert budget.applied == [REUSE_PATH]
+    assert budget.end_tick() == 20.0
+
+    budget.begin_tick()
+    assert budget.applied == []
+    assert budget.stats.ticks == 3
+    assert budget.stats.overruns == 1
+    assert budget.stats.worst_overrun_ms == 20.0
+    assert budget.stats.degradations == {REUSE_PATH: 1}
+
+
+def test_navigate_reuses_cached_path_when_asked() -> None:
+    env = GridWorldEnv(width=6, height=3, bot_pos=(0, 0), target_pos=(5, 0))
+    ctx = TickContext(world=env.snapshot(), max_retries=3, blackboard={})
+    state = NavigateState()
+
+    state.on_tick(ctx)
+    planned = ctx.blackboard["nav_path"]
+    env.step(BotAction(kind="move", target=planned[1]))
+    ctx.world = env.snapshot()
+    ctx.blackboard["reuse_path"] = True
+
+    _, action = state.on_tick(ctx)
+
+    assert action.target == planned[2]
+    assert ctx.blackboard["nav_path"] == planned[1:]
+
+
+def test_engine_degrades_when_actions_are_slow(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(width=6, height=3, bot_pos=(0, 0), target_pos=(5, 0))
+    runner = _SlowRunner(SimulatedActionRunner(env), delay_s=0.005)
+    engine = make_engine(env, tmp_path, max_ticks=30, runner=runner, tick_budget_ms=2.0)
+
+    result = engine.run()
+
+    assert result.success is True
+    assert result.stats is not None and result.stats.budget is not None
+    budget_stats = result.stats.budget
+    assert budget_stats.overruns > 0
+    assert budget_stats.degradations.get(REUSE_PATH, 0) > 0
+    assert budget_stats.degradations.get(SKIP_DOUBLE_OBSERVE, 0) > 0
+    assert budget_stats.degradations.get(DEFER_LOG, 0) > 0
+    rows = [json.loads(line) for line in (tmp_path / "latest.jsonl").read_text().splitlines()]
+    # Deferred rows are flushed, never lost.
+    assert len(rows) == result.ticks
+    assert any(row["overrun_ms"] > 0 for row in rows)
+    assert any(DEFER_LOG in row["degraded"] for row in rows)
+
+
+def test_engine_never_acts_on_a_stale_tick(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(width=6, height=3, bot_pos=(0, 0), target_pos=(5, 0))
+    engine = make_engine(env, tmp_path, tick_budget_ms=1.0)
+    decide = engine.fsm.tick
+
+    def slow_decide(ctx: TickContext) -> BotAction:
+        time.sleep(0.003)
+        return decide(ctx)
+
+    engine.fsm.tick = slow_decide  # type: ignore[method-assign]
+    engine.config.max_ticks = 5
+
+    result = engine.run()
+
+    assert result.reason == "timeout"
+    assert env.state.bot_pos == (0, 0)
+    assert result.stats is not None and result.stats.stale_skips == 5
+    rows = [json.loads(line) for line in (tmp_path / "latest.jsonl").read_text().splitlines()]
+    assert all(row["action_message"] == "skipped: stale tick" for row in rows)
+    assert all(STALE_SKIP in row["degraded"] for row in rows)
+
+
+def test_skipped_phase_is_probed_again() -> None:
+    clock = _FakeClock()
+    budget = TickBudget(tick_ms=20.0, smoothing=0.3, clock=clock)
+    budget.begin_tick()
+    budget.start_phase()
+    clock.advance_ms(30)
+    budget.end_phase("decide")
+
+    skips = 0
+    budget.begin_tick()
+    while not budget.fits("decide"):
+        budget.degrade(REUSE_PATH, "decide")
+        skips += 1
+        budget.begin_tick()
+
+    assert 0 < skips <= 3
+    assert budget.estimate_ms("decide") < 20.0
+
+
+def test_stale_ticks_leave_no_fsm_side_effects(tmp_path: Path, make_engine) -> None:
+    wall = {(2, y) for y in range(3)}
+    env = GridWorldEnv(width=6, height=3, bot_pos=(0, 0), target_pos=(5, 0), obstacles=wall)
+    engine = make_engine(env, tmp_path, tick_budget_ms=1.0)
+    engine.config.max_retries = 2
+    engine.fsm.current_state = "recover"
+    decide = engine.fsm.tick
+
+    def slow_decide(ctx: TickContext) -> BotAction:
+        action = decide(ctx)
+        time.sleep(0.003)
+        return action
+
+    engine.fsm.tick = slow_decide  # type: ignore[method-assign]
+    engine.config.max_ticks = 6
+
+    result = engine.run()
+
+    assert result.reason == "timeout"
+    assert result.final_state == "recover"
+    assert env.state.bot_pos == (0, 0)
+
+
+def test_rolled_back_blackboard_does_not_keep_a_path_planned_on_old_costs() -> None:
+    env = GridWorldEnv(width=11, height=9, bot_pos=(0, 4), target_pos=(10, 4))
+    navigate = NavigateState(risk_grid=RiskCostGrid())
+    ctx = TickContext(world=env.snapshot(), max_retries=3)
+    navigate.on_tick(ctx)
+    assert (5, 4) in ctx.blackboard["nav_path"]
+
+    env.add_scorpion("s1", (5, 4))
+    ctx.world = env.snapshot()
+    saved = dict(ctx.blackboard)
+    navigate.on_tick(ctx)
+    # The tick ran out of budget: the engine restores the blackboard, but the
+    # risk grid has already taken the scorpion in.
+    ctx.blackboard.clear()
+    ctx.blackboard.update(saved)
+
+    ctx.blackboard["reuse_path"] = True
+    navigate.on_tick(ctx)
+    assert all(max(abs(x - 5), abs(y - 4)) > 1 for x, y in ctx.blackboard["nav_path"])
+
+
+def test_plan_deadline_is_read_on_the_blackboard_clock() -> None:
+    env = GridWorldEnv(width=40, height=40, bot_pos=(0, 0), target_pos=(39, 39))
+    clock = _FakeClock()
+    for now_ms, complete in ((0.0, True), (2000.0, False)):
+        clock.now = now_ms / 1000.0
+        ctx = TickContext(
+            world=env.snapshot(),
+            max_retries=3,
+            blackboard={"plan_deadline": 1.0, "plan_clock": clock},
+        )
+        NavigateState().on_tick(ctx)
+        assert ctx.blackboard["nav_search"].complete is complete
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable
+
+from bot_core.collision_map import CollisionMap, CollisionStore
+from bot_core.engine import BotEngine
+from bot_core.perception.simulated import SimulatedPerception
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.types import ActionResult, BotAction
+from bot_core.world_model import WorldModel
+
+
+class _BlindPerception:
+    """Reports no obstacles, like a RuneLite session with an empty config."""
+
+    def __init__(self, env: GridWorldEnv) -> None:
+        self.inner = SimulatedPerception(env)
+
+    def observe(self):
+        return replace(self.inner.observe(), obstacles=frozenset())
+
+
+def _world(pos: tuple[int, int]) -> WorldModel:
+    return WorldModel(tick=0, width=10, height=10, bot_pos=pos, target_pos=(9, 9))
+
+
+def test_store_replays_latest_verdict_per_tile(tmp_path: Path) -> None:
+    store = CollisionStore(tmp_path, region_size=16)
+    store.append((3, 4), blocked=True)
+    store.append((40, 2), blocked=True)
+    store.append((3, 4), blocked=False)
+    store.append((-1, 5), blocked=True)
+    with (tmp_path / "2_0.col").open("ab") as handle:
+        handle.write(b"\x01")
+
+    assert store.load() == {(3, 4): False, (40, 2): True, (-1, 5): True}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["-1_0.col", "0_0.col", "2_0.col"]
+
+
+def test_stalled_moves_mark_tile_blocked() -> None:
+    learned = CollisionMap(confirm_after=2)
+    move = BotAction(kind="move", target=(2, 1))
+    sent = ActionResult(success=True, message="action_sent:move")
+
+    learned.observe(_world((1, 1)), move, sent)
+    learned.observe(_world((1, 1)), move, sent)
+    assert (2, 1) not in learned.blocked
+    learned.observe(_world((1, 1)), move, sent)
+    assert (2, 1) in learned.blocked
+
+    # Unsent moves prove nothing.
+    learned.observe(_world((1, 1)), BotAction("move", (1, 2)), ActionResult(True, "ignored:move"))
+    learned.observe(_world((1, 1)), BotAction("move", (1, 2)), ActionResult(True, "ignored:move"))
+    learned.observe(_world((1, 1)), BotAction("idle"), ActionResult(True, "idle"))
+    assert (1, 2) not in learned.blocked
+
+    # Standing on a tile proves it walkable.
+    learned.observe(_world((2, 1)), BotAction("idle"), ActionResult(True, "idle"))
+    assert (2, 1) in learned.walkable and (2, 1) not in learned.blocked
+    assert learned.merge({(2, 1), (5, 5)}) == {(5, 5)}
+
+
+def test_merge_keeps_identity_until_obstacles_change() -> None:
+    learned = CollisionMap()
+    obstacles = frozenset({(5, 5), (6, 6)})
+    idle = (BotAction("idle"), ActionResult(True, "idle"))
+    learned.observe(_world((1, 1)), *idle)
+    assert learned.merge(obstacles) is obstacles
+
+    learned.observe(_world((1, 2)), BotAction("move", (1, 3)), ActionResult(False, "blocked"))
+    merged = learned.merge(obstacles)
+    assert merged == obstacles | {(1, 3)}
+    for pos in ((2, 2), (3, 2), (4, 2)):
+        learned.observe(_world(pos), *idle)
+        assert learned.merge(obstacles) is merged
+
+    # Standing on a listed obstacle does change the contents.
+    learned.observe(_world((5, 5)), *idle)
+    assert learned.merge(obstacles) == {(6, 6), (1, 3)}
+
+
+def test_learned_walls_persist_across_runs(tmp_path: Path, make_engine) -> None:
+    for profile in ("default", "turbo"):
+        _check_walls_persist(make_engine, tmp_path / profile, profile)
+
+
+def _check_walls_persist(
+    make_engine: Callable[..., BotEngine], tmp_path: Path, profile: str
+) -> None:
+    def run() -> int:
+        env = GridWorldEnv(
+            width=8, height=6, bot_pos=(0, 0), target_pos=(6, 0), obstacles={(3, y) for y in range(5)}
+        )
+        engine = make_engine(
+            env,
+            tmp_path,
+            max_ticks=80,
+            max_retries=5,
+            max_consecutive_failures=20,
+            perception=_BlindPerception(env),
+            collision_map_dir=tmp_path / "collisions",
+            profile=profile,
+        )
+        result = engine.run()
+        assert result.success is True
+        assert result.stats is not None
+        return result.stats.action_failures
+
+    first = run()
+    second = run()
+    assert first > 0
+    assert second == 0
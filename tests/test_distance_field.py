@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from bot_core.distance_field import DistanceField, DistanceFieldCache
+from bot_core.fsm import TickContext
+from bot_core.navigation import astar
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.states import NavigateState
+
+
+def test_field_paths_match_astar_length() -> None:
+    obstacles = {(5, y) for y in range(9)} | {(2, 3), (3, 3)}
+    field = DistanceField((9, 0), 10, 10, obstacles)
+
+    for start in [(0, 0), (0, 9), (4, 4), (9, 9)]:
+        path = field.path_from(start)
+        expected = astar(start, (9, 0), 10, 10, obstacles)
+        assert path is not None and expected is not None
+        assert len(path) == len(expected)
+        assert path[0] == start and path[-1] == (9, 0)
+        assert all(step not in obstacles for step in path)
+
+    assert field.distance((5, 0)) is None
+    assert field.next_step((9, 0)) is None
+
+
+def test_incremental_updates_match_full_rebuild() -> None:
+    rng = random.Random(7)
+    cells = [(x, y) for x in range(16) for y in range(12)]
+    obstacles: set[tuple[int, int]] = set(rng.sample(cells, 30))
+    obstacles.discard((8, 6))
+    field = DistanceField((8, 6), 16, 12, obstacles)
+
+    for _ in range(40):
+        for pos in rng.sample(cells, 4):
+            if pos == (8, 6):
+                continue
+            if pos in obstacles:
+                obstacles.remove(pos)
+            else:
+                obstacles.add(pos)
+        field.update_obstacles(obstacles)
+        fresh = DistanceField((8, 6), 16, 12, obstacles)
+        assert field.dist == fresh.dist
+
+
+def test_cache_shares_fields_and_skips_huge_grids() -> None:
+    cache = DistanceFieldCache(max_fields=2, max_cells=1000)
+
+    first = cache.get((3, 3), 10, 10, frozenset())
+    assert first is not None
+    version = first.version
+    again = cache.get((3, 3), 10, 10, frozenset({(1, 1)}))
+    assert first is again
+    assert first.distance((1, 1)) is None and first.version > version
+    assert cache.read((3, 3), 10, 10, frozenset({(1, 1)}), lambda field: field.version) == first.version
+
+    cache.get((0, 0), 10, 10, frozenset())
+    cache.get((9, 9), 10, 10, frozenset())
+    assert cache.get((3, 3), 10, 10, frozenset()) is not first
+    assert cache.get((0, 0), 100, 100, frozenset()) is None
+
+
+def test_engine_follows_distance_field(tmp_path: Path, monkeypatch, make_engine) -> None:
+    wall = {(4, y) for y in range(7)}
+    env = GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 0), obstacles=wall)
+    engine = make_engine(env, tmp_path, use_distance_field=True)
+
+    def no_astar(*args: object, **kwargs: object) -> None:
+        raise AssertionError("astar used despite use_distance_field")
+
+    monkeypatch.setattr("bot_core.states.astar", no_astar)
+
+    result = engine.run()
+
+    assert result.success is True
+    assert env.state.bot_pos == (7, 0)
+    stats = engine.fsm.states["navigate"].stats
+    assert stats.field_reads > 0 and stats.field_misses == 0
+
+
+def test_navigate_reads_the_field_once_while_it_is_unchanged() -> None:
+    env = GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 0), obstacles={(4, 0)})
+    state = NavigateState(distance_fields=DistanceFieldCache())
+    ctx = TickContext(world=env.snapshot(), max_retries=3, blackboard={})
+    for _ in range(3):
+        _, action = state.on_tick(ctx)
+        env.step(action)
+        ctx.world = env.snapshot()
+    assert state.stats.field_reads == 1
+
+    env.add_obstacle((6, 0))
+    ctx.world = env.snapshot()
+    state.on_tick(ctx)
+    assert state.stats.field_reads == 2
@@ -1,34 +1,12 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
-from bot_core.actions.simulated import SimulatedActionRunner
-from bot_core.engine import BotEngine, EngineConfig
-from bot_core.perception.simulated import SimulatedPerception
 from bot_core.simulator.grid_world import GridWorldEnv
 
 
-def make_engine(
-    env: GridWorldEnv,
-    tmp_path: Path,
-    *,
-    max_ticks: int = 50,
-    max_retries: int = 3,
-    max_consecutive_failures: int = 10,
-) -> BotEngine:
-    return BotEngine.default(
-        perception=SimulatedPerception(env),
-        runner=SimulatedActionRunner(env),
-        config=EngineConfig(
-            max_ticks=max_ticks,
-            max_retries=max_retries,
-            max_consecutive_failures=max_consecutive_failures,
-            log_path=tmp_path / "latest.jsonl",
-        ),
-    )
-
-
-def test_reaches_target_and_completes(tmp_path: Path) -> None:
+def test_reaches_target_and_completes(tmp_path: Path, make_engine) -> None:
     env = GridWorldEnv(width=5, height=5, bot_pos=(0, 0), target_pos=(2, 0))
     engine = make_engine(env, tmp_path)
 
@@ -40,7 +18,7 @@ def test_reaches_target_and_completes(tmp_path: Path) -> None:
     assert env.state.bot_pos == (2, 0)
 
 
-def test_timeout_when_ticks_are_too_low(tmp_path: Path) -> None:
+def test_timeout_when_ticks_are_too_low(tmp_path: Path, make_engine) -> None:
     env = GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 7))
     engine = make_engine(env, tmp_path, max_ticks=3, max_retries=20)
 
@@ -50,7 +28,7 @@ def test_timeout_when_ticks_are_too_low(tmp_path: Path) -> None:
     assert result.reason == "timeout"
 
 
-def test_recover_stops_after_max_retries(tmp_path: Path) -> None:
+def test_recover_stops_after_max_retries(tmp_path: Path, make_engine) -> None:
     wall = {(2, y) for y in range(6)}
     env = GridWorldEnv(
         width=6,
@@ -65,3 +43,108 @@ def test_recover_stops_after_max_retries(tmp_path: Path) -> None:
 
     assert result.success is False
     assert result.reason == "max_retries"
+
+
+def _scenario_envs() -> list[GridWorldEnv]:
+    wall = {(2, y) for y in range(6)}
+    return [
+        GridWorldEnv(width=5, height=5, bot_pos=(0, 0), target_pos=(2, 0)),
+        GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 7)),
+        GridWorldEnv(
+            width=6, height=6, bot_pos=(0, 0), target_pos=(5, 5), obstacles=wall
+        ),
+    ]
+
+
+def test_turbo_profile_matches_default_run(tmp_path: Path, make_engine) -> None:
+    # The second round checks the single-observation path. Each round gets
+    # fresh envs: an env a previous run finished would start out complete.
+    for double_observe in (True, False):
+        pairs = zip(_scenario_envs(), _scenario_envs())
+        for idx, (default_env, turbo_env) in enumerate(pairs):
+            assert not default_env.state.task_complete and not turbo_env.state.task_complete
+            run_dir = tmp_path / f"{'double' if double_observe else 'single'}_{idx}"
+            default_engine = make_engine(default_env, run_dir / "default", max_retries=2)
+            turbo_engine = make_engine(turbo_env, run_dir / "turbo", max_retries=2)
+            turbo_engine.config.profile = "turbo"
+            default_engine.config.double_observe = double_observe
+            turbo_engine.config.double_observe = double_observe
+
+            expected = default_engine.run()
+            got = turbo_engine.run()
+
+            assert (got.success, got.reason, got.ticks, got.final_state) == (
+                expected.success,
+                expected.reason,
+                expected.ticks,
+                expected.final_state,
+            )
+            assert turbo_env.state.bot_pos == default_env.state.bot_pos
+            assert got.stats is not None and expected.stats is not None
+            assert got.stats.action_counts == expected.stats.action_counts
+            assert got.stats.observations < expected.stats.observations
+            assert got.stats.log_rows == 0
+            assert not (run_dir / "turbo").exists()
+
+
+def test_turbo_profile_writes_sampled_rows(tmp_path: Path, make_engine) -> None:
+    default_env, turbo_env = _scenario_envs()[1], _scenario_envs()[1]
+    default_engine = make_engine(default_env, tmp_path / "default", max_ticks=12)
+    turbo_engine = make_engine(turbo_env, tmp_path / "turbo", max_ticks=12)
+    turbo_engine.config.profile = "turbo"
+    turbo_engine.config.log_sample_every = 5
+
+    default_engine.run()
+    result = turbo_engine.run()
+
+    default_rows = (tmp_path / "default" / "latest.jsonl").read_text().splitlines()
+    turbo_rows = (tmp_path / "turbo" / "latest.jsonl").read_text().splitlines()
+    assert turbo_rows == default_rows[::5]
+    assert result.stats is not None and result.stats.log_rows == len(turbo_rows)
+
+
+def test_macro_steps_reach_the_same_end_state(tmp_path: Path, make_engine) -> None:
+    def envs() -> list[GridWorldEnv]:
+        long_walk = GridWorldEnv(width=200, height=3, bot_pos=(0, 1), target_pos=(199, 1))
+        long_walk.add_scorpion("s1", (120, 0))
+        return [*_scenario_envs(), long_walk]
+
+    for profile in ("default", "turbo"):
+        for idx, (plain_env, macro_env) in enumerate(zip(envs(), envs())):
+            plain = make_engine(plain_env, tmp_path / f"plain_{profile}_{idx}", max_ticks=300)
+            macro = make_engine(macro_env, tmp_path / f"macro_{profile}_{idx}", max_ticks=300)
+            plain.config.profile = macro.config.profile = profile
+            macro.config.macro_step_max = 64
+
+            expected = plain.run()
+            got = macro.run()
+
+            assert (got.success, got.reason, got.ticks, got.final_state) == (
+                expected.success,
+                expected.reason,
+                expected.ticks,
+                expected.final_state,
+            )
+            assert macro_env.state.bot_pos == plain_env.state.bot_pos
+            assert got.stats is not None and expected.stats is not None
+            assert got.stats.action_counts == expected.stats.action_counts
+            if idx == 3:
+                assert got.stats.fast_forwarded_ticks > 150
+                assert got.stats.observations < expected.stats.observations // 10
+
+
+def test_macro_rows_are_run_length_encoded(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(width=40, height=1, bot_pos=(0, 0), target_pos=(39, 0))
+    env.add_scorpion("s1", (20, 0))
+    engine = make_engine(env, tmp_path, max_ticks=100)
+    engine.config.macro_step_max = 10
+
+    result = engine.run()
+
+    rows = [json.loads(line) for line in (tmp_path / "latest.jsonl").read_text().splitlines()]
+    runs = [row for row in rows if "run_length" in row]
+    assert [row["run_length"] for row in runs][:2] == [10, 5]
+    assert (runs[0]["first_tick"], runs[0]["tick"], runs[0]["bot_pos"]) == (2, 11, [11, 0])
+    # Nothing within the NPC's clearance is skipped.
+    assert all(not 18 <= row["bot_pos"][0] <= 22 for row in runs)
+    assert sum(row.get("run_length", 1) for row in rows) == result.ticks
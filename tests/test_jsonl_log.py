@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from bot_core.jsonl_log import RotatingJsonlLog
+
+
+def test_rotating_log_keeps_backups_and_caps_size(tmp_path: Path) -> None:
+    path = tmp_path / "runs" / "live.jsonl"
+    log = RotatingJsonlLog(path, max_bytes=400, backups=2)
+    for idx in range(100):
+        log.write({"tick": idx, "note": "x" * 20})
+    log.close()
+
+    assert log.rows_written == 100
+    assert log.rotations > 2
+    assert path.with_name("live.jsonl.1").exists()
+    assert path.with_name("live.jsonl.2").exists()
+    assert not path.with_name("live.jsonl.3").exists()
+    for candidate in (path, path.with_name("live.jsonl.1")):
+        assert candidate.stat().st_size < 400 + 100
+
+    last = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+    assert last["tick"] == 99
+    assert log.take_error() is None
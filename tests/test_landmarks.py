@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from bot_core.landmarks import LandmarkStore, LandmarkTable, build_landmarks
+from bot_core.navigation import astar
+
+
+def _maze() -> set[tuple[int, int]]:
+    walls = {(x, 4) for x in range(0, 18)} | {(x, 9) for x in range(2, 20)}
+    return walls | {(10, y) for y in range(10, 18)}
+
+
+def test_alt_bound_is_admissible_and_keeps_paths_optimal() -> None:
+    obstacles = _maze()
+    table = build_landmarks(20, 20, obstacles, count=4)
+    assert len(table.landmarks) == 4
+    assert table.tables[0].typecode == "H"
+
+    rng = random.Random(3)
+    free = [(x, y) for x in range(20) for y in range(20) if (x, y) not in obstacles]
+    for _ in range(25):
+        start, goal = rng.sample(free, 2)
+        plain = astar(start, goal, 20, 20, obstacles)
+        guided = astar(start, goal, 20, 20, obstacles, landmarks=table)
+        assert plain is not None and guided is not None
+        assert len(guided) == len(plain)
+        assert table.lower_bound(start, goal) <= len(plain) - 1
+
+
+def test_off_map_goal_falls_back_like_plain_astar() -> None:
+    table = build_landmarks(10, 10, set(), count=2)
+    assert table.lower_bound((5, 5), (5, 12)) == 0
+    assert table.lower_bound((-1, 0), (5, 5)) == 0
+    assert astar((0, 0), (5, 12), 10, 10, set(), landmarks=table) is None
+
+
+def test_store_reuses_cached_file(tmp_path: Path) -> None:
+    obstacles = frozenset(_maze())
+    store = LandmarkStore(tmp_path, count=3)
+
+    built = store.get(20, 20, obstacles)
+    assert built is not None and store.builds == 1
+    cache_file = store.path_for(20, 20, obstacles)
+    assert cache_file.exists()
+
+    fresh = LandmarkStore(tmp_path, count=3)
+    loaded = fresh.get(20, 20, set(obstacles))
+    assert fresh.builds == 0
+    assert loaded is not None and loaded.landmarks == built.landmarks
+    assert [list(t) for t in loaded.tables] == [list(t) for t in built.tables]
+
+    # Adding obstacles keeps the bound admissible; removing one needs a new map.
+    assert fresh.get(20, 20, obstacles | {(0, 0)}) is loaded
+    assert fresh.get(20, 20, obstacles - {(5, 4)}) is not loaded
+    assert fresh.builds == 1
+
+
+def test_load_rejects_truncated_file(tmp_path: Path) -> None:
+    table = build_landmarks(6, 6, set(), count=2)
+    path = tmp_path / "alt.bin"
+    table.save(path)
+    path.write_bytes(path.read_bytes()[:-2])
+
+    with pytest.raises(ValueError):
+        LandmarkTable.load(path)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from threading import Event
+
+from bot_core.adapters.runelite_http import RuneLiteHttpAdapterConfig, RuneLitePerception
+from bot_core.live_worker import LiveSettings, LiveTelemetryWorker
+
+
+def _payload(tick: int) -> dict[str, object]:
+    return {"tick": tick, "player_pos": [3200, 3200], "nearby_scorpions": []}
+
+
+def test_worker_coalesces_frames_until_ui_takes_them(tmp_path: Path) -> None:
+    perception = RuneLitePerception(
+        RuneLiteHttpAdapterConfig(
+            host="127.0.0.1",
+            port=0,
+            observe_timeout_s=0.2,
+            world_width=10000,
+            world_height=10000,
+            target_pos=(0, 0),
+        )
+    )
+    notified = Event()
+    notifications = []
+
+    def on_frame() -> None:
+        notifications.append(time.monotonic())
+        notified.set()
+
+    log_path = tmp_path / "gui_live.jsonl"
+    worker = LiveTelemetryWorker(
+        perception, None, on_frame=on_frame, detail_log_path=log_path, observe_timeout_s=0.2
+    )
+    try:
+        worker.start_running(LiveSettings(verbose_ui_log=True))
+        store = perception.server.store
+        for tick in range(1, 6):
+            store.put(_payload(tick))
+            deadline = time.monotonic() + 2.0
+            while worker.tick_count < tick and time.monotonic() < deadline:
+                time.sleep(0.005)
+
+        assert notified.wait(2.0)
+        frame = worker.take_frame()
+        assert frame is not None
+        # The UI never pulled, so every tick folded into one pending frame.
+        assert len(notifications) == 1
+        assert frame.world is not None and frame.world.tick == 5
+        assert frame.tick_count == 5
+        assert frame.coalesced == 4
+        assert sum(line.startswith("[live] ") for line in frame.logs) == 5
+        assert worker.take_frame() is None
+    finally:
+        worker.stop()
+        perception.close()
+
+    assert len(log_path.read_text(encoding="utf-8").splitlines()) == 5
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+from bot_core.loadgen import LoadGenConfig, load_replay, run_load, synthesize_snapshot
+
+
+def test_synthesized_snapshot_matches_tick_snapshot_schema() -> None:
+    payload = synthesize_snapshot(7, npc_count=3, rng=random.Random(1))
+
+    assert payload["tick"] == 7
+    assert isinstance(payload["player_pos"], list) and len(payload["player_pos"]) == 2
+    scorpions = payload["nearby_scorpions"]
+    assert isinstance(scorpions, list) and len(scorpions) == 3
+    assert set(scorpions[0]) == {"id", "name", "pos", "distance"}
+
+
+def test_run_load_against_in_process_server_reports_e2e_latency() -> None:
+    report = run_load(LoadGenConfig(clients=2, rate_hz=50.0, duration_s=0.3, npc_count=5))
+
+    assert report.sent > 0
+    assert report.accepted == report.sent
+    assert report.rejected == 0
+    assert report.observed > 0
+    assert report.e2e_latencies_ms
+    summary = report.summary()
+    assert summary["coalesced"] == report.accepted - report.observed
+
+
+def test_replay_file_is_loaded_and_sent(tmp_path: Path) -> None:
+    replay_path = tmp_path / "replay.jsonl"
+    rows = [synthesize_snapshot(i, 2, random.Random(i)) for i in range(3)]
+    replay_path.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+
+    assert len(load_replay(replay_path)) == 3
+
+    report = run_load(
+        LoadGenConfig(clients=1, rate_hz=30.0, duration_s=0.2, replay_path=replay_path)
+    )
+    assert report.accepted > 0
+
+
+def test_stream_format_sends_ndjson_over_one_connection() -> None:
+    report = run_load(
+        LoadGenConfig(clients=2, rate_hz=50.0, duration_s=0.3, npc_count=5, wire_format="stream")
+    )
+
+    assert report.sent > 0
+    assert report.accepted == report.sent
+    assert report.observed > 0
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from bot_core.cooperative import (
+    CooperativePlanner,
+    ReservationTable,
+    _largest_component,
+    random_scenario,
+    run_cooperative,
+)
+from bot_core.simulator.multi_agent import MultiAgentGridEnv
+
+
+def test_env_rejects_conflicting_moves() -> None:
+    env = MultiAgentGridEnv(
+        5,
+        1,
+        {"a": ((0, 0), (4, 0)), "b": ((1, 0), (0, 0)), "c": ((3, 0), (2, 0))},
+    )
+
+    # a and b swap; c moves alone.
+    assert env.step({"a": (1, 0), "b": (0, 0), "c": (2, 0)}) == {"a", "b"}
+    assert env.positions == {"a": (0, 0), "b": (1, 0), "c": (2, 0)}
+    # c stays on (2, 0), so b cannot enter it and a cannot enter b's tile.
+    assert env.step({"a": (1, 0), "b": (2, 0)}) == {"a", "b"}
+    assert env.step({"c": (4, 0)}) == {"c"}
+
+
+def test_reservation_table_blocks_swaps() -> None:
+    table = ReservationTable()
+    table.reserve_path("a", [(0, 0), (1, 0)], t0=0)
+
+    assert not table.can_move("b", (2, 0), (1, 0), 0)
+    assert not table.can_move("b", (1, 0), (0, 0), 0)
+    assert table.can_move("b", (1, 0), (1, 1), 0)
+    assert table.can_move("a", (0, 0), (1, 0), 0)
+
+
+def test_agents_pass_each_other_in_a_corridor_with_a_bay() -> None:
+    # Row 0 is a corridor; (2, 1) is the only place to step aside.
+    obstacles = {(x, 1) for x in range(5) if x != 2}
+    env = MultiAgentGridEnv(
+        5, 2, {"a": ((0, 0), (4, 0)), "b": ((4, 0), (0, 0))}, obstacles
+    )
+    planner = CooperativePlanner(5, 2, obstacles, window=8)
+
+    result = run_cooperative(env, planner, max_ticks=40)
+
+    assert result.arrived == 2
+    assert env.positions == {"a": (4, 0), "b": (0, 0)}
+
+
+def test_many_agents_all_arrive() -> None:
+    env = random_scenario(30, size=20, seed=3)
+    planner = CooperativePlanner(20, 20, env.state.obstacles, window=6)
+
+    result = run_cooperative(env, planner, max_ticks=200)
+
+    assert result.arrived == 30
+    assert env.arrived() == set(env.goals)
+
+
+def test_scenario_tiles_come_from_the_largest_area() -> None:
+    # Walls split the map into areas of 4, 8, 8 and 16 tiles. A small area
+    # around the first free tile must not make the disconnected rest count.
+    walls = {(2, y) for y in range(7)} | {(x, 2) for x in range(7)}
+    component = _largest_component(7, walls)
+
+    assert sorted(component) == sorted((x, y) for x in range(3, 7) for y in range(3, 7))
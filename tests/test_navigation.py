@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from bot_core.navigation import BoundedAStar, astar
+from bot_core.simulator.grid_world import GridWorldEnv
+
+
+def _wall_with_gap(height: int) -> set[tuple[int, int]]:
+    return {(5, y) for y in range(height - 1)}
+
+
+def test_bounded_search_resumes_to_optimal_path() -> None:
+    obstacles = _wall_with_gap(10)
+    expected = astar((0, 0), (9, 0), 10, 10, obstacles)
+    search = BoundedAStar((0, 0), (9, 0), 10, 10, obstacles)
+
+    calls = 0
+    while True:
+        calls += 1
+        result = search.plan((0, 0), max_expansions=5)
+        assert result.path is not None and result.path[0] == (0, 0)
+        assert result.expansions <= 5
+        if result.complete:
+            break
+
+    assert calls > 1
+    assert expected is not None and result.path == expected
+
+
+def test_partial_path_leads_toward_goal_and_survives_moving_start() -> None:
+    search = BoundedAStar((0, 0), (30, 0), 40, 5, set())
+
+    first = search.plan((0, 0), max_expansions=4)
+    assert not first.complete and first.path is not None
+    assert first.path[-1][0] > 0
+
+    second = search.plan(first.path[1], max_expansions=1000)
+    assert second.complete and second.path is not None
+    assert second.path[0] == first.path[1]
+    assert second.path[-1] == (30, 0)
+    assert len(second.path) == 30
+
+
+def test_bounded_search_reports_unreachable_goal() -> None:
+    walled_in = {(1, 0), (0, 1)}
+    search = BoundedAStar((0, 0), (4, 4), 5, 5, walled_in)
+
+    result = search.plan((0, 0))
+
+    assert result.path is None and not result.complete
+    assert not search.valid_for((4, 4), 5, 5, set())
+
+
+def test_engine_reaches_target_with_expansion_budget(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(
+        width=12, height=12, bot_pos=(0, 0), target_pos=(11, 0), obstacles=_wall_with_gap(12)
+    )
+    engine = make_engine(
+        env, tmp_path, max_ticks=200, plan_max_expansions=3, plan_weight=1.5
+    )
+
+    result = engine.run()
+
+    assert result.success is True
+    assert env.state.bot_pos == (11, 0)
+    # The route was planned in budget-sized slices, following partial paths.
+    stats = engine.fsm.states["navigate"].stats
+    assert stats.max_plan_expansions <= 3
+    assert stats.partial_plans > 1
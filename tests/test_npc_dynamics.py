@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.simulator.npc_dynamics import NpcBehavior
+from bot_core.types import BotAction
+
+IDLE = BotAction("idle")
+
+
+def test_npc_chases_and_hits_the_bot() -> None:
+    env = GridWorldEnv(width=12, height=1, bot_pos=(2, 0), target_pos=(11, 0))
+    env.add_scorpion("s1", (5, 0))
+    env.enable_npc_dynamics(NpcBehavior(wander_chance=0.0, aggro_range=3, attack_interval=2))
+
+    env.step(IDLE)
+    env.step(IDLE)
+    assert env.snapshot().npcs["s1"].pos == (3, 0)
+    assert env.npc_index.position("s1") == (3, 0)
+
+    for _ in range(4):
+        env.step(IDLE)
+    assert env.state.bot_hp == 97
+    assert env.snapshot().meta["bot_hp"] == 97
+
+
+def test_chase_takes_the_other_axis_around_an_obstacle() -> None:
+    env = GridWorldEnv(width=8, height=6, bot_pos=(2, 2), target_pos=(7, 5), obstacles={(4, 3)})
+    env.add_scorpion("s1", (5, 3))
+    env.enable_npc_dynamics(NpcBehavior(wander_chance=0.0, aggro_range=4))
+
+    env.step(IDLE)
+    assert env.state.npcs["s1"].pos == (5, 2)
+
+
+def test_npcs_never_step_onto_each_other() -> None:
+    env = GridWorldEnv(width=6, height=6, bot_pos=(0, 0), target_pos=(5, 5))
+    for i in range(20):
+        env.add_scorpion(f"s{i}", (i % 5 + 1, i // 5 + 1))
+    env.enable_npc_dynamics(NpcBehavior(wander_chance=1.0, aggro_range=0), seed=2)
+
+    moves = 0
+    for _ in range(40):
+        before = {npc_id: npc.pos for npc_id, npc in env.state.npcs.items()}
+        env.step(IDLE)
+        moves += sum(npc.pos != before[npc_id] for npc_id, npc in env.state.npcs.items())
+        positions = [npc.pos for npc in env.state.npcs.values()]
+        assert len(set(positions)) == len(positions)
+    assert moves > 0
+
+
+def test_npc_respects_wander_radius_and_leash() -> None:
+    env = GridWorldEnv(width=40, height=40, bot_pos=(0, 0), target_pos=(39, 39))
+    env.add_scorpion("s1", (20, 20))
+    env.enable_npc_dynamics(NpcBehavior(wander_radius=2, wander_chance=1.0), seed=4)
+
+    seen = set()
+    for _ in range(200):
+        env.step(IDLE)
+        seen.add(env.state.npcs["s1"].pos)
+    assert len(seen) > 5
+    assert all(max(abs(x - 20), abs(y - 20)) <= 2 for x, y in seen)
+
+
+def test_killed_npc_respawns_at_home() -> None:
+    env = GridWorldEnv(width=6, height=1, bot_pos=(0, 0), target_pos=(5, 0))
+    env.add_scorpion("s1", (1, 0), hp=2)
+    env.enable_npc_dynamics(NpcBehavior(wander_chance=0.0, respawn_ticks=5))
+
+    assert env.step(BotAction("attack")).message == "scorpion_damaged"
+    assert env.step(BotAction("attack")).message == "scorpion_killed"
+    assert not env.state.npcs["s1"].alive
+    assert "s1" not in env.npc_index
+
+    for _ in range(5):
+        env.step(IDLE)
+    npc = env.snapshot().npcs["s1"]
+    assert (npc.alive, npc.hp, npc.pos) == (True, 2, (1, 0))
+    assert env.npc_index.position("s1") == (1, 0)
+
+
+def test_thousands_of_npcs_step_together() -> None:
+    env = GridWorldEnv(width=200, height=200, bot_pos=(100, 100), target_pos=(0, 0))
+    rng = random.Random(1)
+    for i in range(3000):
+        env.add_scorpion(f"s{i}", (rng.randrange(200), rng.randrange(200)))
+    dynamics = env.enable_npc_dynamics(seed=1)
+
+    before = dict(env.state.npcs)
+    for _ in range(10):
+        env.step(IDLE)
+
+    moved = [npc_id for npc_id, npc in env.state.npcs.items() if npc.pos != before[npc_id].pos]
+    assert len(dynamics) == 3000
+    assert len(moved) > 1000
+    assert all(env.npc_index.position(npc_id) == env.state.npcs[npc_id].pos for npc_id in moved)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import random
+
+from bot_core.actions.simulated import SimulatedActionRunner
+from bot_core.distance_field import DistanceField, DistanceFieldCache
+from bot_core.engine import BotEngine, EngineConfig
+from bot_core.obstacle_grid import ObstacleDelta, ObstacleGrid
+from bot_core.perception.simulated import SimulatedPerception
+from bot_core.simulator.grid_world import GridWorldEnv
+
+
+def test_changes_since_folds_history_into_net_delta() -> None:
+    grid = ObstacleGrid({(0, 0), (1, 1)})
+    start = grid.version
+
+    grid.add((2, 2))
+    grid.remove((0, 0))
+    grid.add((3, 3))
+    grid.remove((3, 3))
+    assert grid.add((2, 2)) is False
+
+    delta = grid.changes_since(start)
+    assert delta.added == {(2, 2)}
+    assert delta.removed == {(0, 0)}
+    assert delta.version == grid.version == 4
+    assert grid.changes_since(grid.version) == ObstacleDelta(since=4, version=4)
+
+
+def test_history_overflow_requests_reset() -> None:
+    grid = ObstacleGrid(history=3)
+
+    for x in range(5):
+        grid.add((x, 0))
+    grid.add((9, 9))
+
+    assert grid.changes_since(0).reset is True
+    assert grid.changes_since(4).added == {(4, 0), (9, 9)}
+
+
+def test_env_tracks_direct_edits_after_invalidate() -> None:
+    env = GridWorldEnv(width=5, height=5, bot_pos=(0, 0), target_pos=(4, 4))
+    version = env.obstacle_grid.version
+
+    env.add_obstacle((1, 1))
+    env.state.obstacles.add((2, 2))
+    env.invalidate_snapshot()
+
+    delta = env.obstacle_grid.changes_since(version)
+    assert delta.added == {(1, 1), (2, 2)}
+    assert env.snapshot().obstacles is env.obstacle_grid.frozen()
+
+
+def test_distance_field_repairs_from_grid_changes() -> None:
+    rng = random.Random(5)
+    grid = ObstacleGrid()
+    field = DistanceField((6, 6), 14, 14, grid.frozen())
+    version = grid.version
+    cells = [(x, y) for x in range(14) for y in range(14) if (x, y) != (6, 6)]
+
+    for _ in range(25):
+        for pos in rng.sample(cells, 3):
+            if pos in grid:
+                grid.remove(pos)
+            else:
+                grid.add(pos)
+        version = field.sync_from(grid, version)
+        assert field.dist == DistanceField((6, 6), 14, 14, grid.frozen()).dist
+
+
+def test_cache_repairs_fields_from_the_grid_change_log(monkeypatch) -> None:
+    env = GridWorldEnv(width=12, height=12, bot_pos=(0, 0), target_pos=(6, 6))
+    engine_grid = BotEngine.default(
+        perception=SimulatedPerception(env),
+        runner=SimulatedActionRunner(env),
+        config=EngineConfig(use_distance_field=True),
+    ).fsm.states["navigate"].obstacle_grid
+    assert engine_grid is env.obstacle_grid
+
+    cache = DistanceFieldCache()
+    grid = env.obstacle_grid
+    field = cache.get((6, 6), 12, 12, env.snapshot().obstacles, grid)
+    assert field is not None
+
+    def no_diff(self, obstacles) -> None:
+        raise AssertionError("diffed whole obstacle sets")
+
+    monkeypatch.setattr(DistanceField, "update_obstacles", no_diff)
+    for pos in ((3, 3), (6, 5), (7, 6)):
+        env.add_obstacle(pos)
+        assert cache.get((6, 6), 12, 12, env.snapshot().obstacles, grid) is field
+    env.remove_obstacle((6, 5))
+    assert cache.get((6, 6), 12, 12, env.snapshot().obstacles, grid) is field
+    assert field.obstacles is grid.frozen()
+    assert field.dist == DistanceField((6, 6), 12, 12, grid.frozen()).dist
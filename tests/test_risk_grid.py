@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from bot_core.engine import EngineConfig
+from bot_core.navigation import astar
+from bot_core.risk_grid import RiskCostGrid
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.world_model import Npc, NpcType
+
+
+def _npc(npc_id: str, pos: tuple[int, int]) -> Npc:
+    return Npc(id=npc_id, npc_type=NpcType.SCORPION, pos=pos)
+
+
+def test_incremental_updates_match_fresh_grid() -> None:
+    rng = random.Random(11)
+    grid = RiskCostGrid()
+    npcs = {f"s{i}": _npc(f"s{i}", (rng.randrange(30), rng.randrange(30))) for i in range(6)}
+    grid.update(dict(npcs))
+
+    for step in range(30):
+        npc_id = rng.choice(sorted(npcs))
+        if rng.random() < 0.2:
+            npcs.pop(npc_id)
+            npcs[f"n{step}"] = _npc(f"n{step}", (rng.randrange(30), rng.randrange(30)))
+        else:
+            x, y = npcs[npc_id].pos
+            npcs[npc_id] = _npc(npc_id, (x + rng.choice((-1, 1)), y))
+        touched = grid.tiles_touched
+        grid.update(dict(npcs))
+        # Only the squares around the NPCs that changed are re-stamped.
+        assert grid.tiles_touched - touched <= 2 * 49
+
+        fresh = RiskCostGrid()
+        fresh.update(dict(npcs))
+        assert grid.extra == fresh.extra
+
+    grid.update({})
+    assert grid.extra == {}
+
+
+def test_weighted_astar_detours_around_npcs() -> None:
+    grid = RiskCostGrid()
+    grid.update({"s": _npc("s", (5, 2))})
+
+    plain = astar((0, 2), (10, 2), 11, 9, set())
+    safe = astar((0, 2), (10, 2), 11, 9, set(), tile_cost=grid.extra)
+
+    assert plain is not None and safe is not None
+    assert (5, 2) in plain
+    assert all(max(abs(x - 5), abs(y - 2)) > 1 for x, y in safe)
+    assert sum(grid.cost(pos) for pos in safe[1:]) < sum(grid.cost(pos) for pos in plain[1:])
+
+
+def test_engine_routes_around_scorpion(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(width=11, height=9, bot_pos=(0, 4), target_pos=(10, 4))
+    env.add_scorpion("s1", (5, 4))
+    engine = make_engine(env, tmp_path, risk_costs=(12, 8, 3, 1))
+
+    result = engine.run()
+
+    assert result.success is True
+    rows = [json.loads(line) for line in (tmp_path / "latest.jsonl").read_text().splitlines()]
+    assert all(max(abs(x - 5), abs(y - 4)) > 1 for x, y in (row["bot_pos"] for row in rows))
+
+
+def test_engine_keeps_risk_costs_under_a_tick_budget(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(width=11, height=9, bot_pos=(0, 4), target_pos=(10, 4))
+    env.add_scorpion("s1", (5, 4))
+    engine = make_engine(env, tmp_path, risk_costs=(12, 8, 3, 1), tick_budget_ms=600)
+
+    result = engine.run()
+
+    assert result.success is True
+    stats = engine.fsm.states["navigate"].stats
+    # The deadline left room to finish the weighted search in one call.
+    assert stats.bounded_plans > 0 and stats.partial_plans == 0
+    rows = [json.loads(line) for line in (tmp_path / "latest.jsonl").read_text().splitlines()]
+    assert all(max(abs(x - 5), abs(y - 4)) > 1 for x, y in (row["bot_pos"] for row in rows))
+
+
+def test_config_rejects_unit_cost_planners_with_risk_costs(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="use_distance_field"):
+        EngineConfig(risk_costs=(3, 1), use_distance_field=True)
+    with pytest.raises(ValueError, match="route_cache_path"):
+        EngineConfig(risk_costs=(3, 1), route_cache_path=tmp_path / "routes.sqlite")
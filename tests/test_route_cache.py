@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Callable
+
+from bot_core.actions.simulated import SimulatedActionRunner
+from bot_core.engine import BotEngine
+from bot_core.navigation import astar
+from bot_core.perception.simulated import SimulatedPerception
+from bot_core.route_cache import RouteCache, path_is_valid
+from bot_core.simulator.grid_world import GridWorldEnv
+
+WALL = frozenset((4, y) for y in range(7))
+
+
+def _counting_planner(calls: list[int], start, goal, obstacles):
+    def plan():
+        calls.append(1)
+        return astar(start, goal, 8, 8, obstacles)
+
+    return plan
+
+
+def test_routes_survive_a_restart(tmp_path: Path) -> None:
+    db = tmp_path / "routes.sqlite"
+    calls: list[int] = []
+
+    cache = RouteCache(db)
+    first = cache.find_path((0, 0), (7, 0), 8, 8, WALL, _counting_planner(calls, (0, 0), (7, 0), WALL))
+    again = cache.find_path((0, 0), (7, 0), 8, 8, WALL, _counting_planner(calls, (0, 0), (7, 0), WALL))
+    cache.close()
+    assert first == again and len(calls) == 1
+
+    restarted = RouteCache(db)
+    loaded = restarted.find_path(
+        (0, 0), (7, 0), 8, 8, set(WALL), _counting_planner(calls, (0, 0), (7, 0), WALL)
+    )
+    assert loaded == first and len(calls) == 1
+    assert restarted.hits == 1 and restarted.misses == 0
+
+    other_map = WALL | {(5, 7)}
+    restarted.find_path(
+        (0, 0), (7, 0), 8, 8, other_map, _counting_planner(calls, (0, 0), (7, 0), other_map)
+    )
+    assert len(calls) == 2
+    restarted.close()
+
+
+def test_path_validation_rejects_broken_routes() -> None:
+    route = [(0, 0), (1, 0), (2, 0)]
+    assert path_is_valid(route, (0, 0), (2, 0), 3, 1, set())
+    assert not path_is_valid(route, (0, 0), (2, 0), 3, 1, {(1, 0)})
+    assert not path_is_valid([(0, 0), (2, 0)], (0, 0), (2, 0), 3, 1, set())
+    assert not path_is_valid(route, (0, 0), (2, 0), 2, 1, set())
+
+
+def test_hot_memory_routes_survive_disk_eviction(tmp_path: Path) -> None:
+    db = tmp_path / "routes.sqlite"
+    calls: list[int] = []
+    cache = RouteCache(db, max_disk_entries=2)
+    for goal in ((7, 0), (7, 7)):
+        cache.find_path((0, 0), goal, 8, 8, WALL, _counting_planner(calls, (0, 0), goal, WALL))
+        time.sleep(0.01)
+    # Served from memory only; the disk copy must still count as recently used.
+    cache.find_path((0, 0), (7, 0), 8, 8, WALL, _counting_planner(calls, (0, 0), (7, 0), WALL))
+    time.sleep(0.01)
+    cache.find_path((0, 0), (5, 5), 8, 8, WALL, _counting_planner(calls, (0, 0), (5, 5), WALL))
+    cache.close()
+    assert len(calls) == 3
+
+    restarted = RouteCache(db)
+    restarted.find_path((0, 0), (7, 0), 8, 8, WALL, _counting_planner(calls, (0, 0), (7, 0), WALL))
+    restarted.find_path((0, 0), (7, 7), 8, 8, WALL, _counting_planner(calls, (0, 0), (7, 7), WALL))
+    restarted.close()
+    assert (restarted.hits, restarted.misses) == (1, 1)
+
+
+def _run_engine(
+    make_engine: Callable[..., BotEngine], tmp_path: Path, **overrides: object
+) -> RouteCache:
+    env = GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 0), obstacles=set(WALL))
+    with make_engine(
+        env, tmp_path, route_cache_path=tmp_path / "routes.sqlite", **overrides
+    ) as engine:
+        result = engine.run()
+        cache = engine.fsm.states["navigate"].route_cache
+        assert not cache.closed
+    assert result.success is True
+    # The engine owns the connection it opened and releases it on exit.
+    assert cache.closed
+    return cache
+
+
+def test_engine_can_run_again_before_it_is_closed(tmp_path: Path, make_engine) -> None:
+    env = GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 0), obstacles=set(WALL))
+    with make_engine(env, tmp_path, route_cache_path=tmp_path / "routes.sqlite") as engine:
+        assert engine.run().success is True
+        # A new trip on the same engine; its route is not in memory yet.
+        other = GridWorldEnv(width=8, height=8, bot_pos=(0, 0), target_pos=(7, 7), obstacles=set(WALL))
+        engine.perception = SimulatedPerception(other)
+        engine.runner = SimulatedActionRunner(other)
+        engine.fsm.current_state = "idle"
+        assert engine.run().success is True
+    cache = engine.fsm.states["navigate"].route_cache
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+def test_engine_plans_each_route_once(tmp_path: Path, make_engine) -> None:
+    cold = _run_engine(make_engine, tmp_path)
+    warm = _run_engine(make_engine, tmp_path)
+    assert (cold.hits, cold.misses) == (0, 1)
+    assert (warm.hits, warm.misses) == (1, 0)
+
+
+def test_engine_uses_route_cache_with_bounded_planning(tmp_path: Path, make_engine) -> None:
+    bounded = {"plan_max_expansions": 4, "landmark_count": 2, "landmark_dir": tmp_path / "landmarks"}
+    for idx, overrides in enumerate(({"tick_budget_ms": 600.0}, bounded)):
+        cold = _run_engine(make_engine, tmp_path / str(idx), **overrides)
+        warm = _run_engine(make_engine, tmp_path / str(idx), **overrides)
+        assert (cold.hits, cold.misses) == (0, 1)
+        assert (warm.hits, warm.misses) == (1, 0)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import socket
+import time
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from threading import Thread
 from urllib import request
@@ -10,6 +12,8 @@ from bot_core.adapters.runelite_http import (
     RuneLiteHttpAdapterConfig,
     RuneLiteNoopActionRunner,
     RuneLitePerception,
+    RuneLiteTelemetryServer,
+    _TelemetryHandler,
 )
 from bot_core.types import BotAction
 
@@ -78,6 +82,44 @@ def test_runelite_perception_observe_maps_payload() -> None:
         perception.close()
 
 
+def test_runelite_perception_orders_scorpions_nearest_first() -> None:
+    perception = RuneLitePerception(
+        RuneLiteHttpAdapterConfig(
+            host="127.0.0.1",
+            port=0,
+            observe_timeout_s=1.0,
+            world_width=10000,
+            world_height=10000,
+            target_pos=(3210, 3210),
+        )
+    )
+
+    try:
+        url = f"http://127.0.0.1:{perception.listen_port}/tick"
+        scorpion = {"name": "Scorpion"}
+        status = _post_json(
+            url,
+            {
+                "tick": 5,
+                "player_pos": [3200, 3200],
+                "nearby_scorpions": [
+                    {**scorpion, "id": 3030, "pos": [3207, 3200], "distance": 7},
+                    {**scorpion, "id": 3029, "pos": [3203, 3201], "distance": 3},
+                    {**scorpion, "id": 3028, "pos": [3200, 3203], "distance": 3},
+                ],
+            },
+        )
+        assert status == 204
+
+        world = perception.observe()
+        assert [npc["id"] for npc in world.meta["nearby_scorpions"]] == [3028, 3029, 3030]
+        assert world.meta["nearest_scorpion_distance"] == 3
+        assert world.meta["best_target"]["id"] == 3028
+        assert world.meta["attack_recommendation"] == "prepare_attack"
+    finally:
+        perception.close()
+
+
 def test_runelite_noop_runner_returns_success() -> None:
     runner = RuneLiteNoopActionRunner()
     result = runner.execute(BotAction(kind="move", target=(1, 0)))
@@ -119,3 +161,131 @@ def test_runelite_http_action_runner_posts_attack() -> None:
     finally:
         server.shutdown()
         server.server_close()
+
+
+def _chunk(data: bytes) -> bytes:
+    return f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n"
+
+
+def test_telemetry_server_ingests_chunked_ndjson_stream() -> None:
+    server = RuneLiteTelemetryServer(host="127.0.0.1", port=0)
+    try:
+        lines = b"".join(
+            json.dumps({"tick": tick, "player_pos": [3200 + tick, 3200]}).encode("utf-8") + b"\n"
+            for tick in range(3)
+        )
+        lines += b"not json\n"
+        split = len(lines) // 2 + 3
+
+        with socket.create_connection(("127.0.0.1", server.port), timeout=2.0) as sock:
+            sock.sendall(
+                b"POST /stream HTTP/1.1\r\nHost: localhost\r\n"
+                b"Content-Type: application/x-ndjson\r\nTransfer-Encoding: chunked\r\n\r\n"
+            )
+            # The first snapshot must be visible before the stream is finished.
+            sock.sendall(_chunk(lines[:split]))
+            update = server.store.wait_for_newer(0, timeout_s=2.0)
+            assert update is not None
+
+            sock.sendall(_chunk(lines[split:]) + b"0\r\n\r\n")
+            response = sock.recv(1024)
+
+        assert response.startswith(b"HTTP/1.1 204") or response.startswith(b"HTTP/1.0 204")
+        latest = server.store.wait_for_latest(timeout_s=1.0)
+        assert isinstance(latest, dict)
+        assert latest["tick"] == 2
+
+        (stats,) = server.stream_stats()
+        assert stats.snapshots == 3
+        assert stats.parse_errors == 1
+        assert stats.close_reason == "eof"
+    finally:
+        server.stop()
+
+
+def test_telemetry_server_requests_keyframe_on_open_stream() -> None:
+    server = RuneLiteTelemetryServer(host="127.0.0.1", port=0)
+    try:
+        keyframe = {"type": "keyframe", "seq": 1, "tick": 1, "player_pos": [1, 1]}
+        gap = {"type": "delta", "seq": 5, "base_seq": 4, "tick": 5}
+        with socket.create_connection(("127.0.0.1", server.port), timeout=2.0) as sock:
+            sock.sendall(
+                b"POST /stream HTTP/1.1\r\nHost: localhost\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n"
+                + _chunk(json.dumps(gap).encode("utf-8") + b"\n")
+                + _chunk(json.dumps({**gap, "seq": 6, "base_seq": 5}).encode("utf-8") + b"\n")
+            )
+            interim = b""
+            while b"\r\n\r\n" not in interim:
+                interim += sock.recv(1024)
+            assert interim.split(b" ", 2)[1] == b"103"
+            assert b"X-Telemetry-Keyframe: 1" in interim
+
+            sock.sendall(_chunk(json.dumps(keyframe).encode("utf-8") + b"\n") + b"0\r\n\r\n")
+            final = interim.split(b"\r\n\r\n", 1)[1]
+            while b"\r\n\r\n" not in final:
+                final += sock.recv(1024)
+            assert final.split(b" ", 2)[1] == b"204"
+
+        _wait_for_closed_streams(server, 1)
+        (stats,) = server.stream_stats()
+        assert (stats.dropped, stats.snapshots, stats.keyframe_requests) == (2, 1, 1)
+    finally:
+        server.stop()
+
+
+def _wait_for_closed_streams(server: RuneLiteTelemetryServer, count: int) -> None:
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline:
+        if sum(item.closed_at is not None for item in server.stream_stats()) >= count:
+            return
+        time.sleep(0.01)
+    raise AssertionError(f"expected {count} closed streams")
+
+
+def test_telemetry_server_drops_stream_with_overlong_line(monkeypatch) -> None:
+    monkeypatch.setattr(_TelemetryHandler, "max_stream_line_bytes", 64)
+    server = RuneLiteTelemetryServer(host="127.0.0.1", port=0)
+    try:
+        with socket.create_connection(("127.0.0.1", server.port), timeout=2.0) as sock:
+            sock.sendall(
+                b"POST /stream HTTP/1.1\r\nHost: localhost\r\n"
+                b"Transfer-Encoding: chunked\r\n\r\n"
+                + _chunk(b'{"tick": 1, "player_pos": [1, 1]}\n')
+            )
+            # No newline ever comes; the server must not keep buffering.
+            for _ in range(4):
+                sock.sendall(_chunk(b"x" * 40))
+            assert sock.recv(1024) == b""
+
+        _wait_for_closed_streams(server, 1)
+        (stats,) = server.stream_stats()
+        assert (stats.snapshots, stats.overflows, stats.close_reason) == (1, 1, "overflow")
+    finally:
+        server.stop()
+
+
+def test_telemetry_server_counts_broken_stream_and_accepts_reconnect() -> None:
+    server = RuneLiteTelemetryServer(host="127.0.0.1", port=0)
+    try:
+        header = (
+            b"POST /stream HTTP/1.1\r\nHost: localhost\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        with socket.create_connection(("127.0.0.1", server.port), timeout=2.0) as sock:
+            sock.sendall(header + _chunk(b'{"tick": 1, "player_pos": [1, 1]}\n{"tick": 2,'))
+        _wait_for_closed_streams(server, 1)
+
+        with socket.create_connection(("127.0.0.1", server.port), timeout=2.0) as sock:
+            sock.sendall(header + _chunk(b'{"tick": 3, "player_pos": [1, 1]}\n') + b"0\r\n\r\n")
+            sock.recv(1024)
+
+        _wait_for_closed_streams(server, 2)
+        by_id = {item.connection_id: item for item in server.stream_stats()}
+        assert by_id[1].snapshots == 1
+        assert by_id[1].dropped == 1
+        assert by_id[1].close_reason is not None and by_id[1].close_reason != "eof"
+        assert by_id[2].snapshots == 1
+        assert server.streams.connections_total == 2
+    finally:
+        server.stop()
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+from dataclasses import replace
 from pathlib import Path
 
 from bot_core.adapters.real_stub import RealActionRunnerStub, RealPerceptionStub
@@ -8,6 +12,8 @@ from bot_core.adapters.runelite_http import (
     RuneLiteNoopActionRunner,
     RuneLitePerception,
 )
+from bot_core.adapters import registry
+from bot_core.adapters.registry import adapter_modes, register_adapter
 from bot_core.actions.simulated import SimulatedActionRunner
 from bot_core.perception.simulated import SimulatedPerception
 from bot_core.runtime import build_adapters, load_app_config
@@ -193,3 +199,96 @@ def test_load_config_and_build_runelite_http_with_action_runner(tmp_path: Path)
     finally:
         if hasattr(perception, "close"):
             getattr(perception, "close")()
+
+
+# Generous enough for slow CI; the module check below catches the real regression.
+IMPORT_BUDGET_MS = float(os.environ.get("BOT_CORE_IMPORT_BUDGET_MS", "150"))
+
+_SIM_STARTUP = """
+import sys
+from pathlib import Path
+from bot_core.runtime import build_adapters, load_app_config
+build_adapters(load_app_config(Path(sys.argv[1])))
+heavy = ("http.server", "urllib.request", "ssl", "bot_core.adapters.runelite_http")
+print(",".join(name for name in heavy if name in sys.modules))
+"""
+
+
+def _import_cost_ms(module: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    for line in proc.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000.0
+    raise AssertionError(f"{module} missing from importtime output")
+
+
+def test_sim_mode_does_not_import_other_adapters() -> None:
+    config_path = Path(__file__).resolve().parents[1] / "configs" / "dev.json"
+    proc = subprocess.run(
+        [sys.executable, "-c", _SIM_STARTUP, str(config_path)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    assert proc.stdout.strip() == ""
+
+
+_ENGINE_STARTUP = """
+import sys
+from pathlib import Path
+from bot_core.actions.simulated import SimulatedActionRunner
+from bot_core.engine import BotEngine, EngineConfig
+from bot_core.perception.simulated import SimulatedPerception
+from bot_core.simulator.grid_world import GridWorldEnv
+env = GridWorldEnv(width=5, height=5, bot_pos=(0, 0), target_pos=(4, 0))
+BotEngine.default(SimulatedPerception(env), SimulatedActionRunner(env), EngineConfig())
+features = (
+    "sqlite3", "mmap", "bot_core.route_cache", "bot_core.landmarks", "bot_core.waypoints",
+    "bot_core.collision_map", "bot_core.distance_field", "bot_core.risk_grid",
+)
+print(",".join(name for name in features if name in sys.modules))
+"""
+
+
+def test_plain_engine_does_not_import_feature_modules() -> None:
+    proc = subprocess.run(
+        [sys.executable, "-c", _ENGINE_STARTUP],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parents[1],
+    )
+    assert proc.stdout.strip() == ""
+
+
+def test_runtime_import_time_budget() -> None:
+    best_ms = min(_import_cost_ms("bot_core.runtime") for _ in range(3))
+    assert best_ms < IMPORT_BUDGET_MS, f"bot_core.runtime import took {best_ms:.1f} ms"
+
+
+def test_registered_adapter_factory_is_resolved_lazily(tmp_path: Path, monkeypatch) -> None:
+    # Registering into a copy keeps "custom_test" out of the other tests.
+    monkeypatch.setattr(registry, "_factories", dict(registry._factories))
+    calls: list[str] = []
+
+    def factory(config):  # type: ignore[no-untyped-def]
+        calls.append(config.adapter_mode)
+        return build_adapters(replace(config, adapter_mode="sim"))
+
+    register_adapter("custom_test", factory)
+    config_path = tmp_path / "custom.json"
+    config_path.write_text('{"adapter_mode": "custom_test"}', encoding="utf-8")
+
+    perception, _ = build_adapters(load_app_config(config_path))
+
+    assert calls == ["custom_test"]
+    assert isinstance(perception, SimulatedPerception)
+    assert "custom_test" in adapter_modes()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from urllib import error, request
+
+import pytest
+
+from bot_core.adapters.runelite_http import RuneLiteHttpAdapterConfig, RuneLitePerception
+from bot_core.adapters.telemetry_binary import (
+    ACCEPT_HEADER,
+    BINARY_CONTENT_TYPE,
+    NpcRecord,
+    TelemetryFrame,
+    decode_frame,
+    encode_frame,
+)
+
+
+def _frame() -> TelemetryFrame:
+    return TelemetryFrame(
+        tick=123,
+        player_pos=(3200, 3200),
+        plane=0,
+        animation=-1,
+        pose_animation=808,
+        health_ratio=30,
+        health_scale=30,
+        npcs=(
+            NpcRecord(7, 3028, "Scorpion", 3203, 3200, 3),
+            NpcRecord(9, 3029, "King Scorpion", 3201, 3199, 1),
+        ),
+    )
+
+
+def test_binary_frame_round_trip() -> None:
+    frame = _frame()
+    body = encode_frame(frame)
+
+    assert decode_frame(memoryview(body)) == frame
+
+
+def test_binary_frame_rejects_truncated_body() -> None:
+    body = encode_frame(_frame())
+
+    with pytest.raises(ValueError):
+        decode_frame(body[:-3])
+    with pytest.raises(ValueError):
+        decode_frame(b"XX" + body[2:])
+
+
+def test_perception_accepts_binary_content_type() -> None:
+    perception = RuneLitePerception(
+        RuneLiteHttpAdapterConfig(port=0, observe_timeout_s=1.0, target_pos=(3200, 3200))
+    )
+    url = f"http://127.0.0.1:{perception.listen_port}/tick"
+
+    def post(body: bytes) -> tuple[int, str | None]:
+        req = request.Request(
+            url=url,
+            data=body,
+            headers={"Content-Type": BINARY_CONTENT_TYPE},
+            method="POST",
+        )
+        try:
+            with request.urlopen(req, timeout=2.0) as response:
+                return int(response.status), response.headers.get(ACCEPT_HEADER)
+        except error.HTTPError as exc:
+            return int(exc.code), None
+
+    try:
+        assert post(b"garbage")[0] == 400
+        assert post(encode_frame(_frame())) == (204, BINARY_CONTENT_TYPE)
+
+        world = perception.observe()
+        assert world.tick == 123
+        assert world.task_complete is True
+        assert world.meta["nearby_scorpion_count"] == 2
+        assert world.meta["nearest_scorpion_distance"] == 1
+        best_target = world.meta["best_target"]
+        assert isinstance(best_target, dict)
+        assert best_target["id"] == 3029
+        assert best_target["name"] == "King Scorpion"
+    finally:
+        perception.close()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+from urllib import error, request
+
+import pytest
+
+from bot_core.adapters.runelite_http import RuneLiteHttpAdapterConfig, RuneLitePerception
+from bot_core.adapters.telemetry_delta import KEYFRAME_HEADER, TelemetryDeltaDecoder
+
+
+def _keyframe(seq: int = 1) -> dict[str, object]:
+    return {
+        "type": "keyframe",
+        "seq": seq,
+        "tick": 100,
+        "player_pos": [3200, 3200],
+        "plane": 0,
+        "animation": -1,
+        "nearby_scorpions": [
+            {"idx": 7, "id": 3028, "name": "Scorpion", "pos": [3203, 3200], "distance": 3},
+            {"idx": 9, "id": 3028, "name": "Scorpion", "pos": [3210, 3200], "distance": 10},
+        ],
+    }
+
+
+def test_delta_reconstructs_full_snapshot() -> None:
+    decoder = TelemetryDeltaDecoder()
+    first = decoder.decode(_keyframe())
+    assert first is not None
+
+    snapshot = decoder.decode(
+        {
+            "type": "delta",
+            "seq": 2,
+            "base_seq": 1,
+            "tick": 101,
+            "player_pos": [3201, 3200],
+            "npcs_moved": [{"idx": 7, "pos": [3202, 3200]}],
+            "npcs_removed": [9],
+            "npcs_added": [{"idx": 11, "id": 3029, "name": "Scorpion", "pos": [3201, 3204]}],
+        }
+    )
+
+    assert snapshot is not None
+    assert snapshot["tick"] == 101
+    assert snapshot["plane"] == 0
+    by_idx = {npc["idx"]: npc for npc in snapshot["nearby_scorpions"]}
+    assert set(by_idx) == {7, 11}
+    assert by_idx[7]["distance"] == 1
+    assert by_idx[11]["distance"] == 4
+    # Earlier snapshots are not mutated by later deltas.
+    assert len(first["nearby_scorpions"]) == 2
+    assert first["nearby_scorpions"][0]["pos"] == [3203, 3200]
+
+
+def test_gap_requests_keyframe_until_one_arrives() -> None:
+    decoder = TelemetryDeltaDecoder()
+    assert decoder.decode({"type": "delta", "seq": 5, "base_seq": 4, "tick": 1}) is None
+    assert decoder.keyframe_requested is True
+
+    decoder.decode(_keyframe(seq=10))
+    assert decoder.keyframe_requested is False
+    assert decoder.decode({"type": "delta", "seq": 12, "base_seq": 11, "tick": 2}) is None
+    assert decoder.gaps == 2
+    assert decoder.keyframe_requested is True
+
+
+def test_rejected_delta_leaves_decoder_state_untouched() -> None:
+    decoder = TelemetryDeltaDecoder()
+    decoder.decode(_keyframe())
+    bad_pos = {"type": "delta", "seq": 2, "base_seq": 1, "tick": 101, "npcs_removed": [9]}
+    with pytest.raises(ValueError):
+        decoder.decode({**bad_pos, "npcs_added": [{"idx": 11, "pos": "nowhere"}]})
+    unknown_idx = {**bad_pos, "npcs_moved": [{"idx": 42, "pos": [3201, 3200]}]}
+    assert decoder.decode(unknown_idx) is None
+
+    snapshot = decoder.decode({"type": "delta", "seq": 2, "base_seq": 1, "tick": 101})
+    assert snapshot is not None
+    assert {npc["idx"] for npc in snapshot["nearby_scorpions"]} == {7, 9}
+
+
+def test_malformed_delta_lists_are_rejected() -> None:
+    decoder = TelemetryDeltaDecoder()
+    decoder.decode(_keyframe())
+    base = {"type": "delta", "seq": 2, "base_seq": 1, "tick": 101}
+    for field, value in (("npcs_removed", 5), ("npcs_moved", {"idx": 7}), ("npcs_added", "x")):
+        with pytest.raises(ValueError, match=field):
+            decoder.decode({**base, field: value})
+    assert decoder.decode({**base, "npcs_removed": None}) is not None
+
+
+def test_legacy_payload_passes_through() -> None:
+    decoder = TelemetryDeltaDecoder()
+    payload = {"tick": 1, "player_pos": [0, 0], "nearby_scorpions": []}
+    assert decoder.decode(payload) is payload
+
+
+def test_server_signals_keyframe_request_and_serves_reconstruction() -> None:
+    perception = RuneLitePerception(
+        RuneLiteHttpAdapterConfig(port=0, observe_timeout_s=1.0, target_pos=(0, 0))
+    )
+    url = f"http://127.0.0.1:{perception.listen_port}/tick"
+
+    def post(payload: dict[str, object]) -> str | None:
+        req = request.Request(
+            url=url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with request.urlopen(req, timeout=2.0) as response:
+            return response.headers.get(KEYFRAME_HEADER)
+
+    try:
+        assert post({"type": "delta", "seq": 2, "base_seq": 1, "tick": 1}) == "1"
+        assert post(_keyframe()) is None
+        assert post({"type": "delta", "seq": 2, "base_seq": 1, "tick": 101}) is None
+
+        with pytest.raises(error.HTTPError) as rejected:
+            post({"type": "delta", "seq": 3, "base_seq": 2, "tick": 102, "npcs_removed": 5})
+        assert rejected.value.code == 400
+
+        world = perception.observe()
+        assert world.tick == 101
+        assert world.meta["nearby_scorpion_count"] == 2
+        assert world.meta["nearest_scorpion_distance"] == 3
+    finally:
+        perception.close()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+from bot_core.adapters.runelite_http import (
+    RuneLiteHttpAdapterConfig,
+    RuneLitePerception,
+    _SnapshotStore,
+)
+from bot_core.adapters.telemetry_binary import NpcRecord, TelemetryFrame, encode_frame
+from bot_core.adapters.telemetry_shm import ShmRingWriter, ShmTelemetryReader
+
+
+def _frame(tick: int) -> TelemetryFrame:
+    return TelemetryFrame(
+        tick=tick,
+        player_pos=(3200, 3200),
+        npcs=(NpcRecord(5, 3028, "Scorpion", 3202, 3200, 2),),
+    )
+
+
+def test_perception_reads_frames_from_shared_memory_ring(tmp_path: Path) -> None:
+    ring_path = tmp_path / "telemetry.ring"
+    perception = RuneLitePerception(
+        RuneLiteHttpAdapterConfig(
+            observe_timeout_s=1.0,
+            target_pos=(0, 0),
+            transport="shm",
+            shm_path=str(ring_path),
+            shm_poll_interval_ms=1.0,
+        )
+    )
+    writer = ShmRingWriter(ring_path)
+
+    try:
+        assert not hasattr(perception, "listen_port")
+
+        # Lap the ring so the reader has to pick the newest slot.
+        for tick in range(1, 20):
+            writer.write(encode_frame(_frame(tick)))
+
+        deadline = time.monotonic() + 1.0
+        world = perception.observe()
+        while world.tick != 19 and time.monotonic() < deadline:
+            time.sleep(0.005)
+            world = perception.observe()
+
+        assert world.tick == 19
+        assert world.meta["nearest_scorpion_distance"] == 2
+        reader = perception.server
+        assert reader.torn_reads == 0
+    finally:
+        writer.close()
+        perception.close()
+
+
+def test_writer_reuses_existing_ring_geometry(tmp_path: Path) -> None:
+    ring_path = tmp_path / "telemetry.ring"
+    first = ShmRingWriter(ring_path, slot_count=4, slot_size=512)
+    first.write(b"x")
+    first.close()
+
+    second = ShmRingWriter(ring_path)
+    try:
+        assert (second.slot_count, second.slot_size) == (4, 512)
+        assert second.write(b"y") == 2
+    finally:
+        second.close()
+
+
+def test_reader_waits_for_the_writer_without_touching_the_file(tmp_path: Path) -> None:
+    ring_path = tmp_path / "telemetry.ring"
+    ring_path.write_bytes(b"\0" * 16)
+    store = _SnapshotStore()
+    reader = ShmTelemetryReader(ring_path, store, poll_interval_s=0.001)
+    try:
+        time.sleep(0.01)
+        assert not reader.attached
+        assert ring_path.read_bytes() == b"\0" * 16
+
+        writer = ShmRingWriter(ring_path, slot_count=4, slot_size=512)
+        try:
+            writer.write(encode_frame(_frame(7)))
+            deadline = time.monotonic() + 1.0
+            while reader.frames_read == 0 and time.monotonic() < deadline:
+                time.sleep(0.002)
+            assert (reader.slot_count, reader.slot_size) == (4, 512)
+            assert reader.frames_read == 1
+        finally:
+            writer.close()
+    finally:
+        reader.stop()
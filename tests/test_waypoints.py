@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from bot_core.actions.simulated import SimulatedActionRunner
+from bot_core.engine import BotEngine, EngineConfig
+from bot_core.fsm import TickContext
+from bot_core.perception.simulated import SimulatedPerception
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.states import NavigateState
+from bot_core.waypoints import RouteLeg, TransportEdge, WaypointGraph, load_waypoint_graph
+
+
+def test_graph_prefers_cheap_transport_over_long_walk() -> None:
+    graph = WaypointGraph(
+        {"a": (2, 0), "b": (98, 0)},
+        [TransportEdge("a", "b", cost=1, kind="teleport")],
+    )
+
+    assert graph.plan((0, 0), (99, 0)) == [
+        RouteLeg("walk", (0, 0), (2, 0)),
+        RouteLeg("teleport", (2, 0), (98, 0)),
+        RouteLeg("walk", (98, 0), (99, 0)),
+    ]
+    assert graph.plan((0, 0), (5, 0)) == [RouteLeg("walk", (0, 0), (5, 0))]
+    # A blocked direct leg forces the trip through a waypoint.
+    assert graph.plan((0, 0), (5, 0), blocked={((0, 0), (5, 0))}) == [
+        RouteLeg("walk", (0, 0), (2, 0)),
+        RouteLeg("walk", (2, 0), (5, 0)),
+    ]
+
+
+def test_max_local_leg_limits_grid_legs() -> None:
+    graph = WaypointGraph({"a": (0, 0), "b": (50, 0)}, [], max_local_leg=10)
+
+    assert graph.plan((1, 0), (49, 0)) is None
+
+
+def test_engine_follows_composite_route_across_a_wall(tmp_path: Path) -> None:
+    wall = {(5, y) for y in range(6)}
+    env = GridWorldEnv(width=10, height=6, bot_pos=(0, 0), target_pos=(9, 5), obstacles=wall)
+    env.add_transport((4, 2), (6, 2))
+    graph_path = tmp_path / "waypoints.json"
+    graph_path.write_text(
+        json.dumps(
+            {
+                "waypoints": {"west_door": [4, 2], "east_door": [6, 2]},
+                "edges": [{"from": "west_door", "to": "east_door", "kind": "door"}],
+            }
+        ),
+        encoding="utf-8",
+    )
+    engine = BotEngine.default(
+        perception=SimulatedPerception(env),
+        runner=SimulatedActionRunner(env),
+        config=EngineConfig(log_path=tmp_path / "latest.jsonl", waypoint_graph_path=graph_path),
+    )
+
+    result = engine.run()
+
+    assert result.success is True
+    rows = [json.loads(line) for line in (tmp_path / "latest.jsonl").read_text().splitlines()]
+    assert [row["action"] for row in rows].count("transport") == 1
+
+
+def test_route_is_replaced_so_a_saved_blackboard_stays_intact() -> None:
+    graph = WaypointGraph({"a": (2, 0)}, [], max_local_leg=3)
+    env = GridWorldEnv(width=6, height=1, bot_pos=(0, 0), target_pos=(5, 0))
+    navigate = NavigateState(waypoints=graph)
+    ctx = TickContext(world=env.snapshot(), max_retries=3)
+    navigate.on_tick(ctx)
+    env.state.bot_pos = (2, 0)
+    env.invalidate_snapshot()
+    ctx.world = env.snapshot()
+    saved = dict(ctx.blackboard)
+    route = saved["nav_route"]
+    legs = route.legs
+
+    navigate.on_tick(ctx)
+
+    assert ctx.blackboard["nav_route"] is not route
+    assert route.legs == legs and len(legs) == 2
+
+
+def test_example_config_loads() -> None:
+    graph = load_waypoint_graph(Path("configs/waypoints_example.json"))
+
+    legs = graph.plan((3210, 3220), (3280, 3190))
+    assert legs is not None
+    assert [leg.dst for leg in legs] == [(3225, 3218), (3280, 3190)]
+    assert graph.plan((3206, 3229), (3206, 3228), blocked={((3206, 3229), (3206, 3228))}) == [
+        RouteLeg("stairs", (3206, 3229), (3206, 3228))
+    ]
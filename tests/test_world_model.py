@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import random
+
+from bot_core.simulator.grid_world import GridWorldEnv
+from bot_core.types import BotAction
+from bot_core.world_model import NpcSpatialIndex, chebyshev, manhattan, obstacles_in_rect
+
+
+def test_nearest_k_matches_linear_scan() -> None:
+    rng = random.Random(3)
+    index = NpcSpatialIndex(bucket_size=4)
+    positions = {}
+    for idx in range(300):
+        pos = (rng.randrange(200), rng.randrange(200))
+        positions[f"npc_{idx}"] = pos
+        index.insert(f"npc_{idx}", pos)
+
+    for _ in range(20):
+        probe = (rng.randrange(200), rng.randrange(200))
+        expected = sorted(
+            (manhattan(probe, pos), idx, npc_id)
+            for idx, (npc_id, pos) in enumerate(positions.items())
+        )[:5]
+        assert index.nearest_k(probe, 5) == [(d, npc_id) for d, _, npc_id in expected]
+
+
+def test_within_radius_move_and_remove() -> None:
+    index = NpcSpatialIndex(bucket_size=2, metric="chebyshev")
+    index.insert("a", (0, 0))
+    index.insert("b", (5, 5))
+    index.insert("c", (2, 1))
+
+    assert index.within_radius((1, 1), 1) == [(1, "a"), (1, "c")]
+
+    index.move("b", (1, 2))
+    index.remove("a")
+    assert index.within_radius((1, 1), 1) == [(1, "b"), (1, "c")]
+    assert index.nearest((9, 0)) == (chebyshev((9, 0), (2, 1)), "c")
+
+
+def test_nearest_reachable_prefers_walkable_route() -> None:
+    index = NpcSpatialIndex()
+    index.insert("behind_wall", (2, 0))
+    index.insert("open", (0, 4))
+    wall = {(1, 0), (1, 1), (1, 2), (1, 3), (1, 4), (1, 5)}
+
+    def walkable(pos: tuple[int, int]) -> bool:
+        return 0 <= pos[0] < 6 and 0 <= pos[1] < 6 and pos not in wall
+
+    assert index.nearest((0, 0)) == (2, "behind_wall")
+    assert index.nearest_reachable((0, 0), walkable, max_steps=20) == (3, "open")
+
+
+def test_grid_world_index_tracks_kills() -> None:
+    env = GridWorldEnv(width=5, height=5, bot_pos=(0, 0), target_pos=(4, 4))
+    env.add_scorpion("s1", (1, 0), hp=1)
+    env.add_scorpion("s2", (3, 0), hp=1)
+
+    assert env.step(BotAction("attack")).message == "scorpion_killed"
+    assert "s1" not in env.npc_index
+    assert env.step(BotAction("attack")).message == "not_in_combat_range"
+
+
+def test_snapshots_share_unchanged_tables() -> None:
+    env = GridWorldEnv(width=5, height=5, bot_pos=(0, 0), target_pos=(4, 4), obstacles={(2, 2)})
+    env.add_scorpion("s1", (1, 0), hp=2)
+
+    first = env.snapshot()
+    assert env.snapshot() is first
+
+    env.step(BotAction(kind="move", target=(0, 1)))
+    moved = env.snapshot()
+    assert moved.version > first.version
+    assert moved.obstacles is first.obstacles
+    assert moved.npcs is first.npcs
+
+    env.step(BotAction(kind="move", target=(0, 0)))
+    env.step(BotAction("attack"))
+    attacked = env.snapshot()
+    assert attacked.npcs_version > moved.npcs_version
+    assert attacked.obstacles_version == moved.obstacles_version
+    assert attacked.npcs["s1"].hp == 1
+    assert first.npcs["s1"].hp == 2
+
+    env.add_obstacle((3, 3))
+    assert env.snapshot().obstacles is not attacked.obstacles
+    assert (3, 3) in env.snapshot().obstacles
+
+
+def test_obstacles_in_rect_matches_scan_for_small_and_large_sets() -> None:
+    rng = random.Random(5)
+    dense = {(rng.randrange(1000), rng.randrange(1000)) for _ in range(5000)}
+    sparse = set(list(dense)[:10])
+
+    for obstacles in (dense, sparse):
+        got = obstacles_in_rect(obstacles, (100, 200), 21, 21)
+        expected = {p for p in obstacles if 100 <= p[0] < 121 and 200 <= p[1] < 221}
+        assert sorted(got) == sorted(expected)